@@ -7,7 +7,7 @@ from . import models
 
 @admin.register(models.Suite)
 class SuiteAdmin(admin.ModelAdmin):
-    list_display = ("label", "created_at", "updated_at")
+    list_display = ("label", "max_weight_kg", "created_at", "updated_at")
     search_fields = ("label",)
 
 
@@ -39,3 +39,19 @@ class BookingAdmin(admin.ModelAdmin):
     search_fields = ("pet__name", "suite__label", "pet__owner__name")
     autocomplete_fields = ("pet", "suite")
 
+    def save_model(self, request, obj, form, change):
+        # The ModelForm has already run full_clean() on obj.
+        obj.save(validate=False)
+
+
+@admin.register(models.ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    list_display = ("pet", "suite", "start_date", "end_date", "archived_at")
+    list_filter = ("suite",)
+    search_fields = ("pet__name", "suite__label", "pet__owner__name")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
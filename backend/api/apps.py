@@ -6,3 +6,5 @@ class ApiConfig(AppConfig):
     name = "api"
     verbose_name = "House of Houndz API"
 
+    def ready(self) -> None:
+        from . import intervals, signals  # noqa: F401
@@ -0,0 +1,88 @@
+"""Move old checked-out bookings out of the live table.
+
+Checked-out stays are history: nothing edits them, but left in
+``api_booking`` they inflate every index, unfiltered list and backup.
+:func:`archive_bookings` moves those that ended before a cutoff into
+:class:`~api.models.ArchivedBooking` in small batches. Each batch is a
+short transaction, so writers wait for at most one batch.
+
+Archived rows keep their ids. ``/api/bookings/history/`` reads both tables,
+and exports include them. Delta-sync clients get a tombstone per archived
+booking, written in bulk rather than by per-row delete signals.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from . import caching, events, models
+
+FIELDS = (
+    "id", "pet_id", "suite_id", "start_date", "end_date", "status", "bathed", "notes",
+    "created_at", "updated_at",
+)
+
+
+def default_cutoff() -> date:
+    """Bookings that ended before this day are archived (``ARCHIVE_AFTER_DAYS`` ago)."""
+    return timezone.localdate() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+
+
+def candidates(before: date):
+    return models.Booking.objects.filter(status=models.Booking.Status.CHECKED_OUT, end_date__lt=before)
+
+
+def archive_batch(before: date, batch_size: int) -> int:
+    """Archive up to ``batch_size`` bookings in one transaction; returns how many moved."""
+    using = router.db_for_write(models.Booking)
+    with transaction.atomic(using=using):
+        rows = list(
+            candidates(before)
+            .select_for_update(skip_locked=True)
+            .order_by("end_date", "id")
+            .values(*FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ids = [row["id"] for row in rows]
+        models.ArchivedBooking.objects.using(using).bulk_create(
+            models.ArchivedBooking(**row) for row in rows
+        )
+        models.Tombstone.objects.using(using).bulk_create(
+            models.Tombstone(model="booking", object_id=pk) for pk in ids
+        )
+        # Checked-out stays hold no nights, but drifted grid rows would block the delete.
+        models.SuiteOccupancy.objects.using(using).filter(booking_id__in=ids).delete()
+        # A plain DELETE: per-row signals would write one tombstone and one
+        # change-feed event per booking.
+        connection = connections[using]
+        table = connection.ops.quote_name(models.Booking._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+    return len(rows)
+
+
+def archive_bookings(before: date | None = None, batch_size: int = 500, pause: float = 0.0) -> int:
+    """Archive every checked-out booking that ended before ``before``; returns the count.
+
+    ``pause`` seconds between batches give other writers a turn (SQLite has
+    one writer at a time).
+    """
+    before = before or default_cutoff()
+    moved = 0
+    while True:
+        count = archive_batch(before, batch_size)
+        moved += count
+        if count < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    if moved:
+        caching.invalidate(models.Booking)
+        events.publish_resync()
+    return moved
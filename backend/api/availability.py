@@ -0,0 +1,111 @@
+"""Suite availability backed by the materialized occupancy grid.
+
+:class:`~api.models.SuiteOccupancy` holds one row per suite per night of
+every active booking. Rows are kept current on booking save/delete, so an
+availability lookup is two queries whatever the size of the booking history.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+from . import models
+
+MAX_RANGE_DAYS = 366
+
+
+def nights(start: date, end: date) -> list[date]:
+    """Every date a stay from ``start`` to ``end`` (inclusive) holds its suite."""
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def desired_cells(booking: models.Booking) -> set[tuple[int, date]]:
+    if booking.status not in models.Booking.ACTIVE_STATUSES:
+        return set()
+    return {(booking.suite_id, day) for day in nights(booking.start_date, booking.end_date)}
+
+
+def refresh_booking(booking: models.Booking) -> None:
+    """Bring the grid rows for ``booking`` in line with its current state."""
+    existing = set(
+        models.SuiteOccupancy.objects.filter(booking_id=booking.pk).values_list("suite_id", "date")
+    )
+    desired = desired_cells(booking)
+    if existing - desired:
+        stale = models.SuiteOccupancy.objects.filter(booking_id=booking.pk)
+        if desired:
+            stale = stale.exclude(
+                suite_id=booking.suite_id, date__range=(booking.start_date, booking.end_date)
+            )
+        stale.delete()
+    missing = desired - existing
+    if missing:
+        models.SuiteOccupancy.objects.bulk_create(
+            models.SuiteOccupancy(suite_id=suite_id, booking_id=booking.pk, date=day)
+            for suite_id, day in sorted(missing, key=lambda cell: cell[1])
+        )
+
+
+def add_bookings(bookings: Iterable[models.Booking], batch_size: int = 1000) -> int:
+    """Insert grid rows for freshly created bookings (e.g. after ``bulk_create``)."""
+    rows = [
+        models.SuiteOccupancy(suite_id=suite_id, booking_id=booking.pk, date=day)
+        for booking in bookings
+        for suite_id, day in sorted(desired_cells(booking), key=lambda cell: cell[1])
+    ]
+    models.SuiteOccupancy.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def replace_bookings(bookings: Iterable[models.Booking], batch_size: int = 1000) -> int:
+    """Rewrite grid rows for bookings changed in bulk (``bulk_update`` skips signals)."""
+    bookings = list(bookings)
+    models.SuiteOccupancy.objects.filter(booking_id__in=[booking.pk for booking in bookings]).delete()
+    return add_bookings(bookings, batch_size)
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """Recompute the whole grid from bookings; returns the number of rows written."""
+    models.SuiteOccupancy.objects.all().delete()
+    active = models.Booking.objects.filter(status__in=models.Booking.ACTIVE_STATUSES).only(
+        "id", "suite_id", "start_date", "end_date", "status"
+    )
+    written = 0
+    batch = []
+    for booking in active.iterator(chunk_size=batch_size):
+        batch.append(booking)
+        if len(batch) >= batch_size:
+            written += add_bookings(batch, batch_size)
+            batch = []
+    return written + add_bookings(batch, batch_size)
+
+
+def availability(start: date, end: date) -> dict:
+    """Free suites, per-day occupancy and the first suite free for the whole stay."""
+    suites = list(models.Suite.objects.order_by("label").values("id", "label"))
+    busy_by_day: dict[date, set[int]] = defaultdict(set)
+    cells = models.SuiteOccupancy.objects.filter(date__range=(start, end)).values_list(
+        "date", "suite_id"
+    )
+    for day, suite_id in cells:
+        busy_by_day[day].add(suite_id)
+
+    busy = set().union(*busy_by_day.values())
+    free_suites = [suite for suite in suites if suite["id"] not in busy]
+    return {
+        "start": start,
+        "end": end,
+        "total_suites": len(suites),
+        "free_suites": free_suites,
+        "first_available": free_suites[0] if free_suites else None,
+        "days": [
+            {
+                "date": day,
+                "occupied": len(busy_by_day[day]),
+                "free": len(suites) - len(busy_by_day[day]),
+            }
+            for day in nights(start, end)
+        ],
+    }
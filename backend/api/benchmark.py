@@ -0,0 +1,277 @@
+"""In-process benchmark harness for the API (see ``manage.py bench_api``).
+
+Requests go through Django's test client against the configured database,
+so results include URL routing, middleware, queries and rendering but not
+the WSGI/ASGI server. Every scenario runs inside one transaction that is
+rolled back, so write endpoints can be measured without changing data.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import models
+
+# Streaming endpoints never finish a request, so they cannot be timed this way.
+SKIPPED = {
+    "change-feed": "long-lived event stream",
+    "export": "streams the whole database",
+    "import-list": "needs an upload file",
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    params: dict = field(default_factory=dict)
+    payload: object = None
+    headers: dict = field(default_factory=dict)
+    authenticated: bool = False
+
+
+def _named_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _named_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            if "format" in pattern.pattern.regex.groupindex:
+                continue  # DefaultRouter's ".json" duplicates
+            yield pattern
+
+
+def discover_scenarios() -> tuple[list[Scenario], dict[str, str]]:
+    """One scenario per named route in ``api/urls.py``, plus common variants."""
+    from . import urls
+
+    today = timezone.localdate()
+    scenarios: list[Scenario] = []
+    skipped: dict[str, str] = {}
+    seen = set()
+    for pattern in _named_patterns(urls.urlpatterns):
+        name = pattern.name
+        if name in seen:
+            continue
+        seen.add(name)
+        if name in SKIPPED:
+            skipped[name] = SKIPPED[name]
+            continue
+        if "pk" in pattern.pattern.regex.groupindex:
+            model = pattern.callback.cls.queryset.model
+            pk = model.objects.order_by("pk").values_list("pk", flat=True).first()
+            if pk is None:
+                skipped[name] = f"no {model._meta.verbose_name} rows"
+                continue
+            scenarios.append(Scenario(name, "GET", reverse(f"{name}", args=[pk])))
+            continue
+        actions = getattr(pattern.callback, "actions", None) or {"get": None}
+        if "get" in actions:
+            scenarios.append(Scenario(name, "GET", reverse(name)))
+        elif "post" in actions:
+            scenarios.append(Scenario(name, "POST", reverse(name), authenticated=True))
+        else:
+            skipped[name] = "no GET handler"
+
+    week = {"from": today.isoformat(), "to": (today + timedelta(days=6)).isoformat()}
+    pet_id = models.Pet.objects.values_list("pk", flat=True).first()
+    # A typeahead prefix: the first three letters of an owner's name.
+    prefix = (models.Owner.objects.values_list("name", flat=True).first() or "doe")[:3]
+    for scenario in scenarios:
+        if scenario.name == "availability-list":
+            scenario.params = {"start": week["from"], "end": (today + timedelta(days=13)).isoformat()}
+        elif scenario.name == "booking-history":
+            scenario.params = {"pet": pet_id}
+        elif scenario.name == "booking-suggest":
+            scenario.params = {"pet_id": pet_id, "start_date": week["from"], "end_date": week["to"]}
+        elif scenario.name == "search-list":
+            scenario.params = {"q": prefix}
+    scenarios += [
+        Scenario("booking-list[week]", "GET", reverse("booking-list"), params=week),
+        Scenario("booking-list[page]", "GET", reverse("booking-list"), params={"page_size": 100}),
+        Scenario(
+            "booking-list[flat]", "GET", reverse("booking-list"), params={**week, "expand": ""}
+        ),
+        # Replays the validators from a first request (If-None-Match).
+        Scenario("booking-list[304]", "GET", reverse("booking-list"), params=week, headers={"etag": ""}),
+        Scenario("booking-create", "POST", reverse("booking-list"), authenticated=True),
+    ]
+    return scenarios, skipped
+
+
+def _write_payloads(today) -> dict[str, object]:
+    """Request bodies for write routes, far enough ahead to never clash with real data."""
+    pet_id = models.Pet.objects.values_list("pk", flat=True).first()
+    suite_ids = list(models.Suite.objects.order_by("pk").values_list("pk", flat=True))
+    if pet_id is None or not suite_ids:
+        return {}
+    start = today + timedelta(days=3650)
+
+    def item(index: int) -> dict:
+        first = start + timedelta(days=4 * (index // len(suite_ids)))
+        return {
+            "pet_id": pet_id,
+            "suite_id": suite_ids[index % len(suite_ids)],
+            "start_date": first.isoformat(),
+            "end_date": (first + timedelta(days=2)).isoformat(),
+        }
+
+    requests = [
+        {key: value for key, value in item(index).items() if key != "suite_id"} for index in range(100)
+    ]
+    return {
+        "booking-create": item(0),
+        "booking-bulk": [item(index) for index in range(100)],
+        "booking-assign": {"requests": requests},
+    }
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p90": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p90": cuts[89], "p95": cuts[94], "p99": cuts[98]}
+
+
+class Harness:
+    def __init__(self, iterations: int = 30, warmup: int = 3, accept_encoding: str = "") -> None:
+        self.iterations = iterations
+        self.warmup = warmup
+        # Sent with every request, so ``bytes`` is what goes over the wire.
+        self.accept_encoding = accept_encoding
+        self.client = APIClient()
+        self.staff = APIClient()
+
+    def run(self, only: set[str] | None = None) -> dict:
+        # The test client's requests are addressed to "testserver".
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            return self._run(only)
+
+    def _run(self, only: set[str] | None) -> dict:
+        with transaction.atomic():
+            user = get_user_model().objects.create_user("houndz-benchmark")
+            self.staff.force_authenticate(user)
+            scenarios, skipped = discover_scenarios()
+            payloads = _write_payloads(timezone.localdate())
+            results = {}
+            for scenario in scenarios:
+                if only and scenario.name not in only:
+                    continue
+                if scenario.method != "GET":
+                    if scenario.name not in payloads:
+                        skipped[scenario.name] = "no pets or suites to book"
+                        continue
+                    scenario.payload = payloads[scenario.name]
+                results[scenario.name] = self.measure(scenario)
+            meta = self.meta()
+            transaction.set_rollback(True)
+        return {"meta": meta, "scenarios": results, "skipped": skipped}
+
+    def send(self, scenario: Scenario, headers: dict):
+        client = self.staff if scenario.authenticated else self.client
+        if self.accept_encoding:
+            headers = {"HTTP_ACCEPT_ENCODING": self.accept_encoding, **headers}
+        if scenario.method == "GET":
+            return client.get(scenario.path, scenario.params, **headers)
+        # Each write is undone so every iteration sees the same data.
+        with transaction.atomic():
+            response = client.post(scenario.path, scenario.payload, format="json", **headers)
+            transaction.set_rollback(True)
+        return response
+
+    def measure(self, scenario: Scenario) -> dict:
+        headers = {}
+        if "etag" in scenario.headers:
+            etag = self.send(scenario, {}).get("ETag")
+            headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+
+        timings, query_counts = [], []
+        response = None
+        for index in range(self.warmup + self.iterations):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = self.send(scenario, headers)
+                elapsed = time.perf_counter() - started
+            if index >= self.warmup:
+                timings.append(elapsed * 1000)
+                query_counts.append(len(queries))
+
+        tracemalloc.start()
+        try:
+            self.send(scenario, headers)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "method": scenario.method,
+            "path": scenario.path,
+            "params": scenario.params,
+            "status": response.status_code,
+            "bytes": len(response.content),
+            "encoding": response.get("Content-Encoding", "identity"),
+            "queries": max(query_counts),
+            "latency_ms": {
+                **{key: round(value, 3) for key, value in percentiles(timings).items()},
+                "mean": round(statistics.fmean(timings), 3),
+                "max": round(max(timings), 3),
+            },
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+    def meta(self) -> dict:
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "recorded_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "iterations": self.iterations,
+            "accept_encoding": self.accept_encoding,
+            "rows": {
+                model._meta.model_name: model.objects.count()
+                for model in (models.Suite, models.Owner, models.Pet, models.Booking)
+            },
+        }
+
+
+def compare(baseline: dict, current: dict) -> list[dict]:
+    """Per-scenario change in p50/p95 latency and query count versus ``baseline``."""
+    rows = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        row = {"name": name, "queries": (before["queries"], result["queries"])}
+        for key in ("p50", "p95"):
+            old, new = before["latency_ms"][key], result["latency_ms"][key]
+            row[key] = (old, new, (new - old) / old * 100 if old else 0.0)
+        rows.append(row)
+    return rows
+
+
+def dump(report: dict) -> str:
+    return json.dumps(report, indent=2, sort_keys=True)
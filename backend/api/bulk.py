@@ -0,0 +1,159 @@
+"""Set-based create/update of many bookings at once.
+
+Single-booking writes validate and lock one row at a time. A batch instead
+resolves pets and suites with one query each, checks overlaps against the
+database and against the rest of the batch with one query plus an
+in-memory sweep, and writes everything with ``bulk_create``/``bulk_update``
+inside one guarded transaction. The batch is all-or-nothing.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import router
+from django.utils import timezone
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from . import availability, caching, events, intervals, models, overlap
+
+UPDATE_FIELDS = ("pet", "suite", "start_date", "end_date", "status", "bathed", "notes", "updated_at")
+SCALAR_FIELDS = ("start_date", "end_date", "status", "bathed", "notes")
+DOES_NOT_EXIST = PrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+
+
+class BulkValidationError(Exception):
+    """Per-item errors, one dict per submitted item (empty when the item was fine)."""
+
+    def __init__(self, errors: list[dict]) -> None:
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _add_error(errors: dict, field: str, message: str) -> None:
+    errors.setdefault(field, []).append(message)
+
+
+def _build(items: list[dict], errors: list[dict]) -> list[models.Booking | None]:
+    ids = [item["id"] for item in items if "id" in item]
+    existing = (
+        models.Booking.objects.select_related("pet__owner", "suite").in_bulk(ids) if ids else {}
+    )
+    pets = caching.PETS.lookup(
+        models.Pet.objects.select_related("owner"),
+        {item["pet_id"] for item in items if "pet_id" in item},
+    )
+    suites = caching.SUITES.lookup(
+        models.Suite.objects.all(), {item["suite_id"] for item in items if "suite_id" in item}
+    )
+
+    seen_ids = set()
+    bookings = []
+    for item, item_errors in zip(items, errors):
+        if "id" in item:
+            booking = existing.get(item["id"])
+            if booking is None:
+                _add_error(item_errors, "id", "Booking not found.")
+            elif item["id"] in seen_ids:
+                _add_error(item_errors, "id", "Booking appears more than once in the batch.")
+            seen_ids.add(item["id"])
+        else:
+            booking = models.Booking()
+        if booking is None:
+            bookings.append(None)
+            continue
+
+        for field in SCALAR_FIELDS:
+            if field in item:
+                setattr(booking, field, item[field])
+        for field, related in (("pet_id", pets), ("suite_id", suites)):
+            if field in item:
+                if item[field] in related:
+                    setattr(booking, field.removesuffix("_id"), related[item[field]])
+                else:
+                    _add_error(item_errors, field, DOES_NOT_EXIST.format(pk_value=item[field]))
+        try:
+            booking.full_clean(exclude=["pet", "suite"], validate_overlap=False)
+        except DjangoValidationError as exc:
+            for field, messages in exc.message_dict.items():
+                for message in messages:
+                    _add_error(item_errors, field, message)
+        bookings.append(booking)
+    return bookings
+
+
+def check_overlaps(bookings: list[models.Booking | None], errors: list[dict]) -> None:
+    """Flag items that overlap a stored booking or an earlier item in the batch."""
+    active = [
+        (index, booking)
+        for index, booking in enumerate(bookings)
+        if booking is not None
+        and not errors[index]
+        and booking.status in models.Booking.ACTIVE_STATUSES
+    ]
+    if not active:
+        return
+
+    # Rows in the batch are judged by their new state, never their stored one.
+    batch_ids = [booking.pk for booking in bookings if booking is not None and booking.pk]
+    stored = (
+        intervals.overlapping(
+            models.Booking.objects.all(),
+            min(booking.start_date for _, booking in active),
+            max(booking.end_date for _, booking in active),
+            suites={booking.suite_id for _, booking in active},
+        )
+        .exclude(pk__in=batch_ids)
+        .values_list("suite_id", "start_date", "end_date")
+    )
+
+    by_suite = defaultdict(list)
+    for suite_id, start, end in stored:
+        by_suite[suite_id].append((start, -1, end))
+    for index, booking in active:
+        by_suite[booking.suite_id].append((booking.start_date, index, booking.end_date))
+
+    for stays in by_suite.values():
+        # Stored rows sort before batch items starting the same day.
+        stays.sort()
+        for position, (_, first, first_end) in enumerate(stays):
+            for start, second, _ in stays[position + 1 :]:
+                if start > first_end:
+                    break
+                # Blame the later batch item; stored rows are never flagged.
+                flagged = second if second >= 0 else first
+                if flagged >= 0 and overlap.OVERLAP_MESSAGE not in errors[flagged].get("suite", []):
+                    _add_error(errors[flagged], "suite", overlap.OVERLAP_MESSAGE)
+
+
+def save_bookings(items: list[dict]) -> list[models.Booking]:
+    """Create (items without ``id``) or update bookings; raises :class:`BulkValidationError`."""
+    errors: list[dict] = [{} for _ in items]
+    bookings = _build(items, errors)
+
+    using = router.db_for_write(models.Booking)
+    suite_ids = {booking.suite_id for booking in bookings if booking is not None and booking.suite_id}
+    with overlap.guarded_bulk_write(suite_ids, using):
+        # Overlaps are checked even when other items failed, so every
+        # problem in the batch is reported in one round trip.
+        check_overlaps(bookings, errors)
+        if any(errors):
+            raise BulkValidationError(errors)
+
+        created = [booking for booking in bookings if booking._state.adding]
+        updated = [booking for booking in bookings if not booking._state.adding]
+
+        models.Booking.objects.bulk_create(created)
+        if updated:
+            now = timezone.now()
+            for booking in updated:
+                booking.updated_at = now
+            models.Booking.objects.bulk_update(updated, UPDATE_FIELDS)
+            availability.replace_bookings(updated)
+        availability.add_bookings(created)
+        # bulk_create/bulk_update send no signals, so notify dashboards and caches here.
+        for booking in bookings:
+            events.publish_change(booking, "upsert")
+        caching.invalidate(models.Booking)
+    return bookings
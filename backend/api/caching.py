@@ -0,0 +1,132 @@
+"""Cache for reference data: suite/owner/pet lists, pet and suite lookups.
+
+Entries live in the ``default`` cache (``HOUNDZ_CACHE_URL``) under keys
+that embed a *generation* for each model they were built from. Saving or
+deleting a row bumps its model's generation (see :mod:`api.signals`; bulk
+writers call :func:`invalidate` themselves), which orphans every entry
+built from that model at once. Orphans simply expire.
+
+Generations are bumped right away and again once the transaction
+commits, so a reader that re-cached the old rows in between is retired
+as well. A missing generation (evicted, or a fresh cache) starts from a
+new timestamp, so old entries can never become reachable again.
+
+With the default local-memory backend each worker invalidates only its
+own copy. List payloads are therefore also keyed by the database version
+behind their ETag (``api.views.CachedListMixin``), and primary-key lookups
+skip a per-worker cache entirely. Use a shared backend (Redis) to cache
+lookups when running several workers.
+
+Hits and misses per namespace are exported on ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from . import metrics, models
+
+
+def shared() -> bool:
+    """Whether every worker reads the same cache, and so sees every invalidation."""
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def _generation_key(model: type) -> str:
+    return f"houndz:generation:{model._meta.label_lower}"
+
+
+def _generations(model_classes: Iterable[type]) -> list[int]:
+    keys = [_generation_key(model) for model in model_classes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _bump(model_classes: tuple[type, ...]) -> None:
+    cache.set_many({_generation_key(model): time.time_ns() for model in model_classes}, timeout=None)
+
+
+def invalidate(*model_classes: type) -> None:
+    """Retire every entry built from ``model_classes``, now and after commit."""
+    _bump(model_classes)
+    transaction.on_commit(lambda: _bump(model_classes))
+
+
+class Namespace:
+    """Entries built from ``model_classes``; any change to one of them retires them all."""
+
+    def __init__(self, name: str, model_classes: tuple[type, ...]) -> None:
+        self.name = name
+        self.model_classes = model_classes
+
+    def prefix(self) -> str:
+        stamp = ".".join(str(generation) for generation in _generations(self.model_classes))
+        return f"houndz:{self.name}:{stamp}"
+
+    def key(self, *parts) -> str:
+        digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+        return f"{self.prefix()}:{digest}"
+
+    def get(self, key: str):
+        value = cache.get(key)
+        self._count(value)
+        return value
+
+    async def aget(self, key: str):
+        value = await cache.aget(key)
+        self._count(value)
+        return value
+
+    def set(self, key: str, value, timeout: int | None = None) -> None:
+        cache.set(key, value, settings.CACHE_SECONDS if timeout is None else timeout)
+
+    async def aset(self, key: str, value, timeout: int | None = None) -> None:
+        await cache.aset(key, value, settings.CACHE_SECONDS if timeout is None else timeout)
+
+    def _count(self, value) -> None:
+        hit = value is not None
+        metrics.REGISTRY.record_cache(self.name, int(hit), int(not hit))
+
+    def lookup(self, queryset, ids: Iterable[int]) -> dict:
+        """``queryset.in_bulk(ids)``, querying only for rows missing from the cache.
+
+        Writes resolve their foreign keys here. A per-worker cache never hears
+        of deletes on other workers, and a stale hit would fail the write with
+        an ``IntegrityError`` rather than a validation error, so it is skipped.
+        """
+        if not shared():
+            return queryset.in_bulk(list(ids))
+        prefix = self.prefix()
+        keys = {pk: f"{prefix}:{pk}" for pk in ids}
+        found = cache.get_many(keys.values())
+        instances = {pk: found[key] for pk, key in keys.items() if key in found}
+        missing = [pk for pk in keys if pk not in instances]
+        metrics.REGISTRY.record_cache(self.name, len(instances), len(missing))
+        if missing:
+            fetched = queryset.in_bulk(missing)
+            cache.set_many({keys[pk]: instance for pk, instance in fetched.items()}, settings.CACHE_SECONDS)
+            instances.update(fetched)
+        return instances
+
+
+SUITE_LIST = Namespace("suite-list", (models.Suite,))
+OWNER_LIST = Namespace("owner-list", (models.Owner,))
+PET_LIST = Namespace("pet-list", (models.Pet, models.Owner))
+# Pet lookups carry their owner (select_related), so owner changes retire them too.
+PETS = Namespace("pet", (models.Pet, models.Owner))
+SUITES = Namespace("suite", (models.Suite,))
+OWNERS = Namespace("owner", (models.Owner,))
+CURRENT_BOOKINGS = Namespace(
+    "current-bookings", (models.Booking, models.Pet, models.Owner, models.Suite)
+)
@@ -0,0 +1,121 @@
+"""Conditional GET support (ETag/Last-Modified) and the current-bookings cache.
+
+A list endpoint's version is the newest ``updated_at`` of every model it
+renders, or the newest tombstone for those models when something was
+deleted. Each is an indexed ``MAX()``, so an unchanged poll is answered
+with ``304 Not Modified`` before any rows are fetched or serialized.
+
+Like delta sync, the version only trusts timestamps older than
+:data:`api.sync.CURSOR_OVERLAP`: a transaction may commit after a newer
+one, so validators are withheld while the newest change is that recent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Callable, Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import caching, models, sync
+
+
+def _version_queries(model_classes: Iterable[type]) -> list[tuple]:
+    """``(queryset, timestamp field)`` pairs whose ``MAX()`` values make up the version."""
+    model_classes = list(model_classes)
+    tombstones = models.Tombstone.objects.filter(
+        model__in=[model._meta.model_name for model in model_classes]
+    )
+    return [(model.objects.order_by(), "updated_at") for model in model_classes] + [
+        (tombstones, "deleted_at")
+    ]
+
+
+def _latest(stamps: Iterable[datetime | None]) -> datetime | None:
+    return max((stamp for stamp in stamps if stamp), default=None)
+
+
+def last_modified(model_classes: Iterable[type]) -> datetime | None:
+    return _latest(
+        query.aggregate(latest=Max(field))["latest"]
+        for query, field in _version_queries(model_classes)
+    )
+
+
+async def alast_modified(model_classes: Iterable[type]) -> datetime | None:
+    # One trip to the ORM thread for every MAX() instead of one per aggregate.
+    return await sync_to_async(last_modified)(model_classes)
+
+
+def make_etag(request, version: datetime | None, *extra: str) -> str:
+    """Tag the exact representation: data version, URL (filters, ?expand) and format."""
+    parts = [
+        version.isoformat() if version else "empty",
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+        *extra,
+    ]
+    return quote_etag(hashlib.sha1("|".join(parts).encode()).hexdigest())
+
+
+def settled(version: datetime | None) -> bool:
+    """Whether no transaction can still commit a change older than ``version``."""
+    return not version or timezone.now() - version >= sync.CURSOR_OVERLAP
+
+
+def _check(request, version: datetime | None, extra: tuple) -> tuple:
+    """``(304 response or None, etag, stamp)``; no validators while ``version`` is too recent."""
+    if not settled(version):
+        return None, None, None
+    etag = make_etag(request, version, *extra)
+    # HTTP dates have one-second resolution.
+    stamp = int(version.timestamp()) if version else None
+    return get_conditional_response(request, etag=etag, last_modified=stamp), etag, stamp
+
+
+def _finish(response, etag: str | None, stamp: int | None):
+    if etag and response.status_code == 200:
+        response["ETag"] = etag
+        if stamp is not None:
+            response["Last-Modified"] = http_date(stamp)
+    # Browsers may reuse the copy, but must revalidate it on every poll.
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_response(request, model_classes: Iterable[type], render: Callable, *extra: str):
+    """Return 304 if the client's validators still match, else ``render()`` with validators.
+
+    The version is left on ``request.data_version`` for ``render()`` to key caches by.
+    """
+    request.data_version = last_modified(model_classes)
+    response, etag, stamp = _check(request, request.data_version, extra)
+    return _finish(render() if response is None else response, etag, stamp)
+
+
+async def aconditional_response(
+    request, model_classes: Iterable[type], render: Callable, *extra: str
+):
+    """:func:`conditional_response` for async views; ``render`` is a coroutine function."""
+    request.data_version = await alast_modified(model_classes)
+    response, etag, stamp = _check(request, request.data_version, extra)
+    return _finish(await render() if response is None else response, etag, stamp)
+
+
+def current_bookings_key(request, day) -> str | None:
+    """Cache key for a ``/bookings/current/`` payload, or ``None`` when it must not be cached.
+
+    Keyed, like cached lists, by the version :func:`conditional_response` left on
+    the request, so a worker that missed another worker's write never serves
+    the old payload under the new ETag. Nothing is cached until it settles.
+    """
+    version = getattr(request, "data_version", None)
+    if not settings.CURRENT_BOOKINGS_CACHE_SECONDS or version is None or not settled(version):
+        return None
+    return caching.CURRENT_BOOKINGS.key(request.get_full_path(), day.isoformat(), version.isoformat())
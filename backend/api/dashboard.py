@@ -0,0 +1,108 @@
+"""Daily operations summary behind ``/api/dashboard/``.
+
+Everything the morning dashboard shows comes from four queries, whatever
+the size of the booking history:
+
+1. one aggregate with a conditional count each for arrivals, departures,
+   dogs in house and baths pending, over the bookings that touch the day;
+2. the rows behind the arrival/departure/bath lists (a few dozen at most);
+3. the number of suites;
+4. per-night occupied suites for the forecast, from the occupancy grid.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.db.models import Count, Q
+
+from . import availability, models
+
+FORECAST_DAYS = 7
+ROW_FIELDS = (
+    "id",
+    "pet_id",
+    "pet__name",
+    "pet__owner__name",
+    "suite_id",
+    "suite__label",
+    "start_date",
+    "end_date",
+    "status",
+    "bathed",
+)
+
+
+def _filters(day: date) -> dict[str, Q]:
+    in_house = Q(status=models.Booking.Status.CHECKED_IN)
+    return {
+        "arrivals": Q(start_date=day, status__in=models.Booking.ACTIVE_STATUSES),
+        # Stays that already checked out today still count as departures.
+        "departures": Q(end_date=day),
+        "in_house": in_house,
+        # Checked-in dogs that have not had their bath this stay.
+        "bath_pending": in_house & Q(bathed=False),
+    }
+
+
+def _row(values: dict) -> dict:
+    return {
+        "id": values["id"],
+        "pet": {"id": values["pet_id"], "name": values["pet__name"]},
+        "owner_name": values["pet__owner__name"],
+        "suite": {"id": values["suite_id"], "label": values["suite__label"]},
+        "start_date": values["start_date"],
+        "end_date": values["end_date"],
+        "status": values["status"],
+        "bathed": values["bathed"],
+    }
+
+
+def dashboard(day: date) -> dict:
+    filters = _filters(day)
+    # Every category overlaps ``day``, which the (end_date, start_date) index serves.
+    touching = models.Booking.objects.filter(end_date__gte=day, start_date__lte=day)
+
+    counts = touching.aggregate(
+        **{name: Count("id", filter=condition) for name, condition in filters.items()}
+    )
+
+    lists: dict[str, list[dict]] = {"arrivals": [], "departures": [], "bath_pending": []}
+    # Soonest departures first, so baths due today lead their list.
+    rows = (
+        touching.filter(filters["arrivals"] | filters["departures"] | filters["bath_pending"])
+        .order_by("end_date", "suite__label", "id")
+        .values(*ROW_FIELDS)
+    )
+    for values in rows:
+        row = _row(values)
+        if values["start_date"] == day and values["status"] in models.Booking.ACTIVE_STATUSES:
+            lists["arrivals"].append(row)
+        if values["end_date"] == day:
+            lists["departures"].append(row)
+        if values["status"] == models.Booking.Status.CHECKED_IN and not values["bathed"]:
+            lists["bath_pending"].append(row)
+
+    total_suites = models.Suite.objects.count()
+    last = day + timedelta(days=FORECAST_DAYS - 1)
+    occupied = dict(
+        models.SuiteOccupancy.objects.filter(date__range=(day, last))
+        .values("date")
+        .annotate(occupied=Count("suite_id", distinct=True))
+        .order_by()
+        .values_list("date", "occupied")
+    )
+    return {
+        "date": day,
+        "total_suites": total_suites,
+        "counts": counts,
+        **lists,
+        "forecast": [
+            {
+                "date": night,
+                "occupied": occupied.get(night, 0),
+                "free": total_suites - occupied.get(night, 0),
+            }
+            for night in availability.nights(day, last)
+        ],
+    }
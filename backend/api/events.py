@@ -0,0 +1,181 @@
+"""Change feed that pushes model saves/deletes to connected dashboards.
+
+Every save or delete of a synced model publishes a compact event through
+the configured broker (``settings.CHANGE_FEED_BROKER``). The `/api/events/`
+stream relays those events to browsers as server-sent events.
+
+``LocalBroker`` fans out inside one process, which is enough for a single
+ASGI worker. ``PostgresBroker`` relays through ``LISTEN``/``NOTIFY`` so that
+events written by any worker reach subscribers on every worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from . import sync
+
+logger = logging.getLogger(__name__)
+
+RESYNC_EVENT = {"op": "resync"}
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_pending)
+
+    def offer(self, event: dict) -> None:
+        """Queue ``event``; a subscriber that falls behind is told to resync."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Next event, or ``None`` if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    """In-process fan-out; publish() may be called from any thread."""
+
+    max_pending = 500
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event: dict) -> None:
+        self.fan_out(event)
+
+    def fan_out(self, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down.
+                self._discard(subscription)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        subscription = Subscription(asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._discard(subscription)
+
+    def _discard(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class PostgresBroker(LocalBroker):
+    """Relays events between workers through PostgreSQL ``NOTIFY``.
+
+    Each process keeps one listening connection and fans notifications out
+    to its local subscribers.
+    """
+
+    channel = "houndz_changes"
+    # PostgreSQL rejects NOTIFY payloads of 8000 bytes or more.
+    max_payload_bytes = 7999
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._listener: asyncio.Task | None = None
+
+    def publish(self, event: dict) -> None:
+        payload = json.dumps(event, cls=DjangoJSONEncoder)
+        if len(payload.encode()) > self.max_payload_bytes:
+            # e.g. a booking with long notes; clients fetch it through /api/sync/.
+            payload = json.dumps(RESYNC_EVENT)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, payload])
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        async with super().subscribe() as subscription:
+            yield subscription
+
+    async def _listen(self) -> None:
+        import psycopg
+
+        params = connection.get_connection_params()
+        for key in ("context", "cursor_factory", "prepare_threshold"):
+            params.pop(key, None)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(**params, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {self.channel}")
+                    async for notification in conn.notifies():
+                        self.fan_out(json.loads(notification.payload))
+            except Exception:  # pragma: no cover - depends on a live database
+                logger.exception("Change feed listener lost its connection; retrying")
+                # Anything published while we were disconnected is lost.
+                self.fan_out(RESYNC_EVENT)
+                await asyncio.sleep(5)
+
+
+@lru_cache(maxsize=None)
+def get_broker() -> LocalBroker:
+    return import_string(settings.CHANGE_FEED_BROKER)()
+
+
+def change_event(instance, op: str) -> dict:
+    collection = sync.TOMBSTONE_COLLECTIONS[instance._meta.model_name]
+    event = {"collection": collection, "op": op, "id": instance.pk}
+    if op == "upsert":
+        _, serializer_class = sync.SYNC_COLLECTIONS[collection]
+        event["data"] = serializer_class(instance).data
+    return event
+
+
+def publish_change(instance, op: str) -> None:
+    """Publish a change for ``instance`` once the surrounding transaction commits."""
+    # Deleted instances lose their pk, so delete events are built right away;
+    # upserts are serialized at commit time so they carry the final state.
+    event = change_event(instance, op) if op == "delete" else None
+
+    def send() -> None:
+        try:
+            get_broker().publish(event or change_event(instance, op))
+        except Exception:
+            # Live updates are best effort; clients catch up via /api/sync/.
+            logger.exception("Failed to publish %s change for %r", op, instance)
+
+    transaction.on_commit(send)
+
+
+def publish_resync() -> None:
+    """After a bulk load, tell every dashboard to refetch instead of sending each row."""
+
+    def send() -> None:
+        try:
+            get_broker().publish(RESYNC_EVENT)
+        except Exception:
+            logger.exception("Failed to publish resync event")
+
+    transaction.on_commit(send)
@@ -0,0 +1,70 @@
+"""Query-string filtering for API list endpoints."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from . import models
+
+
+def _parse_ids(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _parse_day(value: str) -> date | None:
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+class BookingFilterBackend(BaseFilterBackend):
+    """Filter bookings by ``?from=&to=&status=&suite=&pet=&owner=``.
+
+    ``from``/``to`` select bookings whose stay overlaps the window, which
+    the ``(end_date, start_date)`` index serves: for recent windows
+    ``end_date >= from`` is the selective side of the range predicate.
+    ``status``, ``suite``, ``pet`` and ``owner`` accept comma-separated values.
+    """
+
+    id_params = {"suite": "suite_id__in", "pet": "pet_id__in", "owner": "pet__owner_id__in"}
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+        filters = {}
+
+        window = {}
+        for param in ("from", "to"):
+            if params.get(param):
+                window[param] = _parse_day(params[param])
+                if window[param] is None:
+                    errors[param] = "Enter a date in YYYY-MM-DD format."
+        if window.get("from") and window.get("to") and window["from"] > window["to"]:
+            errors["to"] = "Must be on or after 'from'."
+        if window.get("from"):
+            filters["end_date__gte"] = window["from"]
+        if window.get("to"):
+            filters["start_date__lte"] = window["to"]
+
+        if params.get("status"):
+            statuses = [item.strip() for item in params["status"].split(",") if item.strip()]
+            unknown = set(statuses) - set(models.Booking.Status.values)
+            if unknown:
+                errors["status"] = f"Unknown status: {', '.join(sorted(unknown))}."
+            filters["status__in"] = statuses
+
+        for param, lookup in self.id_params.items():
+            if params.get(param):
+                try:
+                    filters[lookup] = _parse_ids(params[param])
+                except ValueError:
+                    errors[param] = "Enter a comma-separated list of ids."
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters)
@@ -0,0 +1,172 @@
+"""Interval index over active bookings for overlap and "in house on day D" lookups.
+
+A B-tree on ``(start_date, end_date)`` can only bound one side of an
+overlap test (``start <= to AND end >= from``); the other side is a scan
+that grows with booking history. Migration ``0007`` adds a real interval
+index instead, and the helpers here phrase queries so it is used:
+
+* PostgreSQL: a GiST index on ``daterange(start_date, end_date, '[]')``
+  over active bookings. Per-suite lookups also match the exclusion
+  constraint's ``(suite_id, range)`` GiST index from ``0003``.
+* SQLite: an R*Tree virtual table, ``api_booking_interval``, holding each
+  active booking's suite and first/last day. Triggers on ``api_booking``
+  keep it current, so ``bulk_create``/``update()`` are covered too.
+* Anything else (or SQLite without the R*Tree module): the plain range
+  filters.
+
+Django rebuilds a SQLite table for many schema changes (``_remake_table``),
+which silently drops its triggers. The R*Tree is therefore only used while
+all three triggers exist, ``check --database default`` reports a missing
+trigger or an index that disagrees with the booking table, and
+``rebuild_intervals`` recreates both.
+
+Only ``booked``/``checked-in`` bookings are indexed; both helpers return
+active bookings only.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from importlib import import_module
+from typing import Iterable
+
+from django.core import checks
+from django.db import OperationalError, connections, transaction
+from django.db.models import BooleanField, QuerySet
+from django.db.models.expressions import RawSQL
+
+from . import models
+
+RTREE_TABLE = "api_booking_interval"
+RTREE_TRIGGERS = ("api_booking_interval_insert", "api_booking_interval_update", "api_booking_interval_delete")
+EPOCH = date(1970, 1, 1)
+
+_has_rtree: dict[str, bool] = {}
+
+
+def _rtree_parts(connection) -> set[str]:
+    """Which of the R*Tree table and its triggers exist on a SQLite ``connection``."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s OR (type = 'trigger' AND tbl_name = %s)",
+            [RTREE_TABLE, models.Booking._meta.db_table],
+        )
+        return {name for (name,) in cursor.fetchall()} & {RTREE_TABLE, *RTREE_TRIGGERS}
+
+
+def strategy(using: str) -> str:
+    """``"gist"``, ``"rtree"`` or ``"btree"`` for the database alias ``using``."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        return "gist"
+    if connection.vendor == "sqlite":
+        if using not in _has_rtree:
+            # Without its triggers the table would go stale and miss overlaps.
+            _has_rtree[using] = _rtree_parts(connection) == {RTREE_TABLE, *RTREE_TRIGGERS}
+        if _has_rtree[using]:
+            return "rtree"
+    return "btree"
+
+
+@checks.register(checks.Tags.database)
+def check_rtree(databases=None, **kwargs) -> list[checks.CheckMessage]:
+    """Report a SQLite R*Tree that lost its triggers or no longer matches the bookings."""
+    messages = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != "sqlite":
+            continue
+        parts = _rtree_parts(connection)
+        if RTREE_TABLE not in parts:
+            continue
+        missing = sorted(set(RTREE_TRIGGERS) - parts)
+        if missing:
+            messages.append(
+                checks.Warning(
+                    f"{RTREE_TABLE} is missing its triggers: {', '.join(missing)}.",
+                    hint="A migration rebuilt api_booking. Run `manage.py rebuild_intervals`; "
+                    "until then interval lookups fall back to range scans.",
+                    id="api.W001",
+                    obj=alias,
+                )
+            )
+            continue
+        active = models.Booking.objects.using(alias).filter(status__in=models.Booking.ACTIVE_STATUSES)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {RTREE_TABLE}")
+            (indexed,) = cursor.fetchone()
+        if indexed != active.count():
+            messages.append(
+                checks.Error(
+                    f"{RTREE_TABLE} holds {indexed} bookings but {active.count()} are active.",
+                    hint="Overlap checks read this index. Run `manage.py rebuild_intervals`.",
+                    id="api.E001",
+                    obj=alias,
+                )
+            )
+    return messages
+
+
+def rebuild(using: str = "default") -> int | None:
+    """Recreate the SQLite R*Tree and its triggers from ``api_booking``; returns the rows indexed.
+
+    ``None`` when there is nothing to rebuild (not SQLite, or no R*Tree module).
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return None
+    # The same statements migration 0007 runs.
+    migration = import_module("api.migrations.0007_booking_interval_index")
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for statement in migration.SQLITE_DROP:
+            cursor.execute(statement)
+        try:
+            with transaction.atomic(using=using):
+                cursor.execute(migration.SQLITE_CREATE[0])
+        except OperationalError:
+            pass  # SQLite built without R*Tree
+        else:
+            for statement in migration.SQLITE_CREATE[1:]:
+                cursor.execute(statement)
+    _has_rtree.pop(using, None)
+    if strategy(using) != "rtree":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {RTREE_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def overlapping(
+    queryset: QuerySet, start: date, end: date, suites: Iterable[int] | None = None
+) -> QuerySet:
+    """Active bookings in ``queryset`` holding any night from ``start`` to ``end`` (inclusive)."""
+    queryset = queryset.filter(status__in=models.Booking.ACTIVE_STATUSES)
+    suite_ids = sorted(set(suites)) if suites is not None else None
+    if suite_ids is not None:
+        if not suite_ids:
+            return queryset.none()
+        queryset = queryset.filter(suite_id__in=suite_ids)
+
+    kind = strategy(queryset.db)
+    if kind == "gist":
+        table = models.Booking._meta.db_table
+        return queryset.filter(
+            RawSQL(
+                f"daterange({table}.start_date, {table}.end_date, '[]') && daterange(%s, %s, '[]')",
+                (start, end),
+                output_field=BooleanField(),
+            )
+        )
+    if kind == "rtree":
+        sql = f"SELECT id FROM {RTREE_TABLE} WHERE first_day <= %s AND last_day >= %s"
+        params = [(end - EPOCH).days, (start - EPOCH).days]
+        if suite_ids is not None:
+            sql += " AND suite_min <= %s AND suite_max >= %s"
+            params += [suite_ids[-1], suite_ids[0]]
+        return queryset.filter(pk__in=RawSQL(sql, params))
+    return queryset.filter(start_date__lte=end, end_date__gte=start)
+
+
+def on(queryset: QuerySet, day: date) -> QuerySet:
+    """Active bookings in ``queryset`` holding the night of ``day``."""
+    return overlapping(queryset, day, day)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from api import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move checked-out bookings that ended before a cutoff (default: "
+        "ARCHIVE_AFTER_DAYS ago) into the archive table, in short batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", help="Archive stays that ended before this date (YYYY-MM-DD).")
+        parser.add_argument("--days", type=int, help="Archive stays that ended more than this many days ago.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Bookings moved per transaction.")
+        parser.add_argument("--pause", type=float, default=0.05, help="Seconds to wait between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+
+    def handle(self, *args, **options):
+        if options["before"] and options["days"] is not None:
+            raise CommandError("Use either --before or --days.")
+        if options["before"]:
+            before = parse_date(options["before"])
+            if before is None:
+                raise CommandError("--before must be a date in YYYY-MM-DD format.")
+        elif options["days"] is not None:
+            before = timezone.localdate() - timedelta(days=options["days"])
+        else:
+            before = archive.default_cutoff()
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        if options["dry_run"]:
+            count = archive.candidates(before).count()
+            self.stdout.write(self.style.SUCCESS(f"Would archive {count} booking(s) that ended before {before}."))
+            return
+        moved = archive.archive_bookings(before, options["batch_size"], options["pause"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} booking(s) that ended before {before}."))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles, queries and peak memory for every API route "
+        "against the current database (see generate_kennel_data). Nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--only", nargs="*", help="Scenario names to run (default: all).")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument(
+            "--accept-encoding",
+            default="",
+            help='Accept-Encoding to send, e.g. "br, gzip"; reported bytes are then compressed.',
+        )
+        parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+        parser.add_argument(
+            "--fail-over",
+            type=float,
+            help="With --compare, fail if any p95 grows by more than this percentage "
+            "or any scenario runs more queries.",
+        )
+
+    def handle(self, *args, **options):
+        harness = benchmark.Harness(
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            accept_encoding=options["accept_encoding"],
+        )
+        report = harness.run(set(options["only"] or ()))
+
+        if options["output"]:
+            Path(options["output"]).write_text(benchmark.dump(report) + "\n")
+        self.print_summary(report)
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            self.print_comparison(benchmark.compare(baseline, report), options["fail_over"])
+        elif not options["output"]:
+            self.stdout.write(benchmark.dump(report))
+
+    def print_summary(self, report: dict) -> None:
+        self.stdout.write(f"{'scenario':<24}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'peak KB':>10}")
+        for name, result in report["scenarios"].items():
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{name:<24}{result['status']:>7}{latency['p50']:>10.2f}{latency['p95']:>10.2f}"
+                f"{result['queries']:>9}{result['peak_memory_kb']:>10.1f}"
+            )
+        for name, reason in report["skipped"].items():
+            self.stdout.write(f"{name:<24} skipped: {reason}")
+
+    def print_comparison(self, rows: list[dict], fail_over: float | None) -> None:
+        regressions = []
+        self.stdout.write(f"\n{'scenario':<24}{'p50 Δ%':>9}{'p95 Δ%':>9}{'queries':>12}")
+        for row in rows:
+            old_queries, new_queries = row["queries"]
+            self.stdout.write(
+                f"{row['name']:<24}{row['p50'][2]:>+9.1f}{row['p95'][2]:>+9.1f}"
+                f"{f'{old_queries}->{new_queries}':>12}"
+            )
+            if fail_over is not None and (row["p95"][2] > fail_over or new_queries > old_queries):
+                regressions.append(row["name"])
+        if regressions:
+            raise CommandError(f"Regressions against baseline: {', '.join(regressions)}")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api import scheduling
+from api.management.commands.generate_kennel_data import STAY_LENGTHS
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the suite assignment solver (api.scheduling) packing a batch of "
+        "synthetic booking requests into empty suites. Runs in memory; the "
+        "database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--suites", type=int, default=13)
+        parser.add_argument("--days", type=int, default=365, help="Window the requests start in.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs; the best is kept.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        # A third of the suites are small and a quarter are ground floor.
+        suites = [
+            scheduling.SuiteInfo(
+                n,
+                f"Suite {n:03}",
+                Decimal("15") if n % 3 == 0 else None,
+                frozenset({"No stairs"}) if n % 4 == 0 else frozenset(),
+            )
+            for n in range(options["suites"])
+        ]
+        lengths, weights = zip(*STAY_LENGTHS)
+        today = timezone.localdate()
+        stays = []
+        for _ in range(options["requests"]):
+            start = today + timedelta(days=rng.randrange(options["days"]))
+            stays.append(
+                scheduling.Stay(
+                    start,
+                    start + timedelta(days=rng.choices(lengths, weights)[0]),
+                    Decimal(rng.randrange(4, 40)),
+                    frozenset({"No stairs"}) if rng.random() < 0.1 else frozenset(),
+                )
+            )
+
+        best, results = None, []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            results = scheduling.SuiteIndex(suites).pack(stays)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        assigned = sum(result.suite is not None for result in results)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Packed {len(stays)} requests into {len(suites)} suites in {best * 1000:.1f} ms "
+                f"(best of {options['repeat']}): {assigned} assigned, {len(stays) - assigned} unplaceable."
+            )
+        )
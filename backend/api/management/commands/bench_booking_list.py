@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api import models, readers, serializers
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare BookingSerializer with the values() read path on a synthetic "
+        "booking list. Data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10_000, help="Bookings to render.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per path; best is kept.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["count"])
+                self.compare(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count: int) -> None:
+        suites = models.Suite.objects.bulk_create(
+            models.Suite(label=f"Bench suite {n}") for n in range(20)
+        )
+        owners = models.Owner.objects.bulk_create(
+            models.Owner(name=f"Bench owner {n}", phone="555-0100") for n in range(count // 4 or 1)
+        )
+        pets = models.Pet.objects.bulk_create(
+            models.Pet(owner=owners[n % len(owners)], name=f"Bench pet {n}", weight_kg="18.40")
+            for n in range(count // 2 or 1)
+        )
+        start = date(2020, 1, 1)
+        # Bulk inserts skip overlap validation; stays are laid out back to back per suite.
+        models.Booking.objects.bulk_create(
+            (
+                models.Booking(
+                    pet=pets[n % len(pets)],
+                    suite=suites[n % len(suites)],
+                    start_date=start + timedelta(days=4 * (n // len(suites))),
+                    end_date=start + timedelta(days=4 * (n // len(suites)) + 2),
+                )
+                for n in range(count)
+            ),
+            batch_size=1000,
+        )
+
+    def compare(self, repeat: int) -> None:
+        queryset = models.Booking.objects.select_related("pet", "pet__owner", "suite").order_by(
+            "start_date"
+        )
+        reader = readers.ValuesReader(serializers.BookingSerializer)
+        renderer = JSONRenderer()
+        paths = {
+            "serializer": lambda: renderer.render(
+                serializers.BookingSerializer(queryset.all(), many=True).data
+            ),
+            "values": lambda: renderer.render(reader.render(queryset.all())),
+        }
+
+        results = {}
+        for name, render in paths.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                body = render()
+                timings.append(time.perf_counter() - started)
+            results[name] = (min(timings), body)
+
+        if results["serializer"][1] != results["values"][1]:
+            self.stderr.write(self.style.ERROR("Outputs differ; the values() path is out of date."))
+        for name, (best, body) in results.items():
+            self.stdout.write(f"{name:>10}: {best * 1000:8.1f} ms  ({len(body)} bytes)")
+        speedup = results["serializer"][0] / results["values"][0]
+        self.stdout.write(self.style.SUCCESS(f"values() path is {speedup:.1f}x faster"))
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from api import models
+
+STOCK_ENGINE = "django.db.backends.sqlite3"
+TUNED_ENGINE = "api.sqlite"
+
+
+def _worker(engine, settings_dict, seconds, write_share, seed, ids, results):
+    """One "gunicorn worker": a mix of range reads and read-then-write transactions."""
+    wrapper = import_string(f"{engine}.base.DatabaseWrapper")
+    connections["default"] = wrapper(settings_dict, "default")
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    write_ms = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < write_share:
+                started = time.perf_counter()
+                pk = rng.choice(ids)
+                with transaction.atomic():
+                    # Read, then write: the pattern that cannot wait for the
+                    # lock under a deferred BEGIN.
+                    notes = models.Booking.objects.filter(pk=pk).values_list("notes", flat=True).first()
+                    models.Booking.objects.filter(pk=pk).update(
+                        notes=(notes or "")[:200] + ".", updated_at=timezone.now()
+                    )
+                write_ms.append((time.perf_counter() - started) * 1000)
+                counts["writes"] += 1
+            else:
+                start = today + timedelta(days=rng.randrange(-30, 30))
+                list(
+                    models.Booking.objects.filter(start_date__lte=start + timedelta(days=6), end_date__gte=start)
+                    .values("id", "pet_id", "suite_id", "start_date", "end_date", "status")[:200]
+                )
+                counts["reads"] += 1
+        except OperationalError:
+            counts["errors"] += 1
+    connections["default"].close()
+    results.put({**counts, "write_ms": write_ms})
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare read and write throughput of Django's stock SQLite backend against "
+        "the tuned api.sqlite one, with several worker processes hitting copies of "
+        "the configured database at once. The database itself is not written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent worker processes.")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run.")
+        parser.add_argument("--write-share", type=float, default=0.2, help="Share of operations that write.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        config = settings.DATABASES["default"]
+        if config["ENGINE"] not in {STOCK_ENGINE, TUNED_ENGINE}:
+            raise CommandError("The default database is not SQLite.")
+        ids = list(
+            models.Booking.objects.filter(status=models.Booking.Status.BOOKED).values_list("id", flat=True)[:5000]
+        )
+        if not ids:
+            raise CommandError("No booked stays to write to; see generate_kennel_data.")
+        tuned_options = config["OPTIONS"] if config["ENGINE"] == TUNED_ENGINE else {}
+        if not tuned_options:
+            raise CommandError("Run with HOUNDZ_SQLITE_TUNED on, so the tuned options are configured.")
+
+        self.stdout.write(
+            f"{'backend':<8}{'workers':>8}{'reads/s':>10}{'writes/s':>10}{'write p95 ms':>14}{'errors':>8}"
+        )
+        with tempfile.TemporaryDirectory() as scratch:
+            for name, engine, options_ in (
+                ("stock", STOCK_ENGINE, {}),
+                ("tuned", TUNED_ENGINE, tuned_options),
+            ):
+                path = Path(scratch) / f"{name}.sqlite3"
+                self.copy_database(path, wal=name == "tuned")
+                result = self.run(engine, {**config, "NAME": str(path), "OPTIONS": options_}, ids, options)
+                self.stdout.write(
+                    f"{name:<8}{options['workers']:>8}{result['reads'] / options['seconds']:>10.0f}"
+                    f"{result['writes'] / options['seconds']:>10.0f}{result['write_p95']:>14.1f}"
+                    f"{result['errors']:>8}"
+                )
+
+    def copy_database(self, path: Path, wal: bool) -> None:
+        connection = connections["default"]
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        # The journal mode is stored in the file; give each run its own.
+        target.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        target.close()
+
+    def run(self, engine: str, settings_dict: dict, ids: list[int], options: dict) -> dict:
+        # Forked workers must not share the parent's connection.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=_worker,
+                args=(
+                    engine,
+                    settings_dict,
+                    options["seconds"],
+                    options["write_share"],
+                    options["seed"] + n,
+                    ids,
+                    results,
+                ),
+            )
+            for n in range(options["workers"])
+        ]
+        for worker in workers:
+            worker.start()
+        reports = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        write_ms = sorted(ms for report in reports for ms in report["write_ms"])
+        return {
+            "reads": sum(report["reads"] for report in reports),
+            "writes": sum(report["writes"] for report in reports),
+            "errors": sum(report["errors"] for report in reports),
+            "write_p95": statistics.quantiles(write_ms, n=20)[-1] if len(write_ms) > 1 else 0.0,
+        }
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold starts per settings module: Django setup time, time to "
+        "the first response and resident memory, as medians over fresh interpreters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            default=["houndz.settings.prod", "houndz.settings.api"],
+            help="Settings modules to compare (default: prod and the lean API profile).",
+        )
+        parser.add_argument("--runs", type=int, default=5, help="Cold starts per settings module.")
+        parser.add_argument("--path", default="/api/", help="Path of the first request.")
+        parser.add_argument(
+            "--preload",
+            action="store_true",
+            help="Import the URLconf during setup, as gunicorn's preload_app master does.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+        report = {}
+        for module in options["modules"]:
+            try:
+                report[module] = startup.measure(
+                    module, options["runs"], options["path"], options["preload"]
+                )
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self.stdout.write(
+            f"{'settings':<24}{'status':>7}{'wall ms':>10}{'setup ms':>10}"
+            f"{'first ms':>10}{'RSS MB':>9}{'modules':>9}"
+        )
+        for module, result in report.items():
+            self.stdout.write(
+                f"{module:<24}{result['status']:>7}{result['wall_ms']:>10.0f}{result['setup_ms']:>10.0f}"
+                f"{result['first_response_ms']:>10.0f}{result['rss_mb']:>9.1f}{result['modules']:>9}"
+            )
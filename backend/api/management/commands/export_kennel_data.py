@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import transfer
+
+
+class Command(BaseCommand):
+    help = "Export suites, owners, pets and bookings as CSV or NDJSON that import_kennel_data reads back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-", help="File to write (default: stdout).")
+        parser.add_argument("--format", choices=sorted(transfer.FORMATS), help="Default: from the file name.")
+        parser.add_argument(
+            "--types", default=",".join(transfer.KINDS), help="Comma-separated record types to export."
+        )
+
+    def handle(self, *args, **options):
+        kinds = [kind.strip() for kind in options["types"].split(",") if kind.strip()]
+        unknown = set(kinds) - set(transfer.KINDS)
+        if unknown:
+            raise CommandError(f"Unknown type(s): {', '.join(sorted(unknown))}.")
+        fmt = options["format"] or transfer.detect_format(name=options["path"])
+
+        chunks = transfer.render_records(transfer.export_records(kinds), fmt)
+        if options["path"] == "-":
+            sys.stdout.writelines(chunks)
+            return
+        with open(options["path"], "w", encoding="utf-8", newline="") as handle:
+            handle.writelines(chunks)
+        self.stdout.write(self.style.SUCCESS(f"Exported {', '.join(kinds)} to {options['path']}."))
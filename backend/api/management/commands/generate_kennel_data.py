@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api import availability, caching, models
+
+FIRST_NAMES = (
+    "Alex", "Avery", "Casey", "Charlie", "Dana", "Drew", "Elliot", "Emerson", "Finley", "Harper",
+    "Hayden", "Jamie", "Jordan", "Kendall", "Logan", "Morgan", "Parker", "Peyton", "Quinn", "Reese",
+    "Riley", "Rowan", "Sage", "Sam", "Skyler", "Taylor",
+)
+LAST_NAMES = (
+    "Anderson", "Brooks", "Carter", "Diaz", "Evans", "Foster", "Garcia", "Hughes", "Ito", "Johnson",
+    "Kim", "Lopez", "Martin", "Nguyen", "Okafor", "Patel", "Reyes", "Schmidt", "Singh", "Turner",
+    "Walker", "Young",
+)
+PET_NAMES = (
+    "Bailey", "Bear", "Bella", "Biscuit", "Buddy", "Charlie", "Cooper", "Daisy", "Duke", "Ginger",
+    "Hazel", "Juniper", "Koda", "Lola", "Luna", "Maple", "Max", "Milo", "Nala", "Olive", "Pepper",
+    "Rocky", "Rosie", "Scout", "Sadie", "Teddy", "Winston", "Zeus",
+)
+# breed -> typical weight range in kg
+BREEDS = {
+    "Beagle": (9, 14),
+    "Border Collie": (14, 20),
+    "Boxer": (25, 32),
+    "Dachshund": (7, 14),
+    "French Bulldog": (8, 13),
+    "German Shepherd": (22, 40),
+    "Golden Retriever": (25, 34),
+    "Labrador Retriever": (25, 36),
+    "Mixed": (5, 40),
+    "Poodle": (18, 32),
+    "Shih Tzu": (4, 7),
+}
+SPECIAL_NEEDS = ("Grain-free diet", "Twice-daily meds", "Separation anxiety", "Senior", "No stairs")
+BOOKING_NOTES = ("Early drop-off", "Late pick-up", "Bring own food", "Owner travelling abroad")
+
+# Relative demand by month; summer and the winter holidays are the peaks.
+MONTH_DEMAND = (0.75, 0.6, 0.8, 0.9, 1.0, 1.25, 1.4, 1.35, 0.95, 0.9, 1.1, 1.45)
+# (nights, weight): weekends and long weekends dominate, with a long tail.
+STAY_LENGTHS = ((1, 14), (2, 22), (3, 20), (4, 12), (5, 8), (6, 5), (7, 9), (10, 4), (14, 4), (21, 2))
+MEAN_STAY = sum(n * w for n, w in STAY_LENGTHS) / sum(w for _, w in STAY_LENGTHS)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate years of synthetic kennel history (owners, pets, bookings) with "
+        "seasonal demand, for load testing. Use --suites/--years to reach "
+        "hundreds of thousands of bookings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--suites", type=int, default=40)
+        parser.add_argument("--years", type=float, default=5, help="Years of history before today.")
+        parser.add_argument("--future-days", type=int, default=120, help="Days of upcoming bookings.")
+        parser.add_argument("--owners", type=int, default=3000)
+        parser.add_argument("--occupancy", type=float, default=0.7, help="Average share of suites held.")
+        parser.add_argument("--seed", type=int, default=1, help="Random seed; same seed, same data.")
+        parser.add_argument(
+            "--clear", action="store_true", help="Delete all suites, owners, pets and bookings first."
+        )
+
+    def handle(self, *args, **options):
+        if not 0 < options["occupancy"] < 1:
+            raise CommandError("--occupancy must be between 0 and 1.")
+        rng = random.Random(options["seed"])
+        today = timezone.localdate()
+        first_day = today - timedelta(days=int(options["years"] * 365))
+        last_day = today + timedelta(days=options["future_days"])
+
+        with transaction.atomic():
+            if options["clear"]:
+                self.clear()
+            elif models.Suite.objects.exists() or models.Owner.objects.exists():
+                raise CommandError("The database already has kennel data; pass --clear to replace it.")
+
+            suites = models.Suite.objects.bulk_create(
+                models.Suite(label=f"Suite {number}") for number in range(1, options["suites"] + 1)
+            )
+            pets = self.create_people(rng, options["owners"])
+            self.stdout.write(f"Created {len(suites)} suites, {options['owners']} owners, {len(pets)} pets.")
+
+            # Regulars board far more often than one-off customers.
+            weights = [rng.paretovariate(1.2) for _ in pets]
+            total = self.create_bookings(
+                rng, suites, pets, weights, first_day, last_day, today, options["occupancy"]
+            )
+            # Bulk inserts and raw deletes bypass the signals that retire cached rows.
+            caching.invalidate(models.Suite, models.Owner, models.Pet, models.Booking)
+        self.stdout.write(self.style.SUCCESS(f"Created {total} bookings from {first_day} to {last_day}."))
+
+    def clear(self) -> None:
+        # Raw deletes: per-row delete signals (tombstones, change feed) would
+        # make clearing hundreds of thousands of rows take minutes.
+        with connection.cursor() as cursor:
+            for model in (
+                models.SuiteOccupancy,
+                models.Booking,
+                models.ArchivedBooking,
+                models.Pet,
+                models.Owner,
+                models.Suite,
+                models.Tombstone,
+            ):
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+
+    def create_people(self, rng: random.Random, owner_count: int) -> list[models.Pet]:
+        owners = models.Owner.objects.bulk_create(
+            (
+                models.Owner(
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    phone=f"555-{rng.randint(0, 9999):04d}",
+                    email=f"owner{number}@example.com",
+                )
+                for number in range(owner_count)
+            ),
+            batch_size=1000,
+        )
+        pets = []
+        for owner in owners:
+            for _ in range(rng.choices((1, 2, 3), weights=(60, 30, 10))[0]):
+                breed = rng.choice(tuple(BREEDS))
+                low, high = BREEDS[breed]
+                pets.append(
+                    models.Pet(
+                        owner=owner,
+                        name=rng.choice(PET_NAMES),
+                        breed=breed,
+                        weight_kg=round(rng.uniform(low, high), 1),
+                        special_needs=rng.sample(SPECIAL_NEEDS, k=rng.choices((0, 1, 2), (80, 15, 5))[0]),
+                    )
+                )
+        return models.Pet.objects.bulk_create(pets, batch_size=1000)
+
+    def create_bookings(self, rng, suites, pets, weights, first_day, last_day, today, occupancy) -> int:
+        # Chance that an idle suite is taken on an average day, chosen so a
+        # suite is held `occupancy` of the time: L / (L + 1/p) = occupancy.
+        base_rate = min(1.0, occupancy / (MEAN_STAY * (1 - occupancy)))
+        nights, night_weights = zip(*STAY_LENGTHS)
+        cum_weights = []
+        running = 0.0
+        for weight in weights:
+            running += weight
+            cum_weights.append(running)
+
+        total = 0
+        batch: list[models.Booking] = []
+        for suite in suites:
+            day = first_day
+            while day <= last_day:
+                if rng.random() >= min(1.0, base_rate * demand(day)):
+                    day += timedelta(days=1)
+                    continue
+                length = rng.choices(nights, night_weights)[0]
+                end = day + timedelta(days=length - 1)
+                batch.append(
+                    models.Booking(
+                        pet=rng.choices(pets, cum_weights=cum_weights)[0],
+                        suite=suite,
+                        start_date=day,
+                        end_date=end,
+                        **booking_state(rng, day, end, today),
+                    )
+                )
+                # Suites are cleaned between stays about half the time.
+                day = end + timedelta(days=1 + (rng.random() < 0.5))
+                if len(batch) >= 5000:
+                    total += self.flush(batch)
+                    batch = []
+        return total + self.flush(batch)
+
+    def flush(self, batch: list[models.Booking]) -> int:
+        created = models.Booking.objects.bulk_create(batch, batch_size=1000)
+        # bulk_create skips the signal that maintains the occupancy grid.
+        availability.add_bookings(created)
+        self.stdout.write(f"  ... {len(created)} bookings")
+        return len(created)
+
+
+def demand(day: date) -> float:
+    weight = MONTH_DEMAND[day.month - 1]
+    if day.weekday() >= 4:  # stays starting Fri-Sun
+        weight *= 1.3
+    if (day.month == 12 and day.day >= 18) or (day.month == 1 and day.day <= 2):
+        weight *= 1.5
+    return weight
+
+
+def booking_state(rng: random.Random, start: date, end: date, today: date) -> dict:
+    if end < today:
+        status = models.Booking.Status.CHECKED_OUT
+    elif start <= today:
+        status = models.Booking.Status.CHECKED_IN
+    else:
+        status = models.Booking.Status.BOOKED
+    return {
+        "status": status,
+        "bathed": status == models.Booking.Status.CHECKED_OUT and rng.random() < 0.6,
+        "notes": rng.choice(BOOKING_NOTES) if rng.random() < 0.1 else "",
+    }
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        "Import suites, owners, pets and bookings from a CSV or NDJSON file "
+        "(see api/transfer.py for the record format). Invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, or - for stdin.")
+        parser.add_argument("--format", choices=sorted(transfer.FORMATS), help="Default: from the file name.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Validate everything, save nothing.")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or transfer.detect_format(name=options["path"])
+        if options["path"] == "-":
+            report = self.load(sys.stdin, fmt, options)
+        else:
+            try:
+                handle = open(options["path"], encoding="utf-8-sig", newline="")
+            except OSError as exc:
+                raise CommandError(str(exc)) from exc
+            with handle:
+                report = self.load(handle, fmt, options)
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(f"... and {report.error_count - len(report.errors)} more error(s)")
+        created = ", ".join(f"{count} {kind}(s)" for kind, count in report.as_dict()["created"].items())
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {created}; skipped {report.error_count} row(s)."))
+
+    def load(self, lines, fmt: str, options) -> transfer.ImportReport:
+        importer = transfer.Importer(options["batch_size"])
+        records = transfer.read_records(lines, fmt)
+        if not options["dry_run"]:
+            # Each batch commits on its own, so locks are held one batch at a time.
+            return importer.run(records)
+        with transaction.atomic():
+            report = importer.run(records)
+            transaction.set_rollback(True)
+        return report
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from api import intervals
+
+
+class Command(BaseCommand):
+    help = "Recreate the SQLite booking interval index (R*Tree) and its triggers from active bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        indexed = intervals.rebuild(options["database"])
+        if indexed is None:
+            self.stdout.write("No R*Tree index on this database; nothing to rebuild.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} active booking(s)."))
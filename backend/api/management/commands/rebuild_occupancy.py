@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api import availability
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-day suite occupancy grid from active bookings."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = availability.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} occupancy row(s)."))
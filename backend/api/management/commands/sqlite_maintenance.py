@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh SQLite's query planner statistics (PRAGMA optimize) and fold the "
+        "write-ahead log back into the database file. Run it from cron; other "
+        "backends are left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias.")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            self.stdout.write(self.style.SUCCESS(f"Nothing to do for {connection.vendor}."))
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA optimize")
+            # TRUNCATE also resets the -wal file to zero bytes. It waits out
+            # busy_timeout for readers, and reports busy if they outlast it.
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, log_pages, checkpointed = cursor.fetchone()
+        if log_pages < 0:
+            self.stdout.write(self.style.SUCCESS("Optimized; the database is not in WAL mode."))
+        elif busy:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Optimized; checkpointed {checkpointed} of {log_pages} WAL pages (readers busy)."
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Optimized; checkpointed {checkpointed} WAL pages."))
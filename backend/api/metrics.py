@@ -0,0 +1,312 @@
+"""Per-endpoint request metrics with a Prometheus-style ``/metrics`` view.
+
+:class:`MetricsMiddleware` counts every request and its latency. A sampled
+share of requests (``settings.METRICS_SAMPLE_RATE``) is also instrumented
+for DB queries and DB time (through ``connection.execute_wrapper``) and
+for time spent serializing, and is logged as one ``key=value`` line on
+the ``api.metrics`` logger. Unsampled requests only pay for two clock
+reads and a dict update.
+
+Metrics live in process memory, so each worker reports its own numbers.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    serializer_seconds: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("houndz_request_stats", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: dict[tuple, int] = defaultdict(int)
+            self.latency: dict[tuple, Histogram] = {}
+            self.sampled: dict[tuple, int] = defaultdict(int)
+            self.queries: dict[tuple, int] = defaultdict(int)
+            self.db_seconds: dict[tuple, float] = defaultdict(float)
+            self.serializer_seconds: dict[tuple, float] = defaultdict(float)
+            self.cache: dict[tuple, int] = defaultdict(int)
+
+    def record(
+        self, endpoint: str, action: str, method: str, status: int, seconds: float,
+        stats: RequestStats | None,
+    ) -> None:
+        key = (endpoint, action)
+        with self._lock:
+            self.requests[(endpoint, action, method, str(status))] += 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.latency[key].observe(seconds)
+            if stats is not None:
+                self.sampled[key] += 1
+                self.queries[key] += stats.queries
+                self.db_seconds[key] += stats.db_seconds
+                self.serializer_seconds[key] += stats.serializer_seconds
+
+    def record_cache(self, namespace: str, hits: int, misses: int) -> None:
+        with self._lock:
+            if hits:
+                self.cache[(namespace, "hit")] += hits
+            if misses:
+                self.cache[(namespace, "miss")] += misses
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            _counter(lines, "houndz_requests_total", "Requests handled.",
+                     ("endpoint", "action", "method", "status"), self.requests)
+
+            lines += [
+                "# HELP houndz_request_duration_seconds Request latency.",
+                "# TYPE houndz_request_duration_seconds histogram",
+            ]
+            for key, histogram in sorted(self.latency.items()):
+                labels = _labels(("endpoint", "action"), key)
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'houndz_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"houndz_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"houndz_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+            sampled = ("endpoint", "action")
+            _counter(lines, "houndz_sampled_requests_total",
+                     "Requests instrumented for queries and serializer time.", sampled, self.sampled)
+            _counter(lines, "houndz_db_queries_total", "DB queries run by sampled requests.",
+                     sampled, self.queries)
+            _counter(lines, "houndz_db_seconds_total", "DB time of sampled requests.",
+                     sampled, self.db_seconds)
+            _counter(lines, "houndz_serializer_seconds_total",
+                     "Serialization time of sampled requests.", sampled, self.serializer_seconds)
+            _counter(lines, "houndz_cache_lookups_total", "Reference-data cache lookups (api.caching).",
+                     ("namespace", "result"), self.cache)
+        _pool_metrics(lines, connections.all(initialized_only=True))
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+def _counter(lines: list[str], name: str, help_text: str, label_names: tuple, values: dict) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for key, value in sorted(values.items()):
+        number = f"{value:.6f}" if isinstance(value, float) else str(value)
+        lines.append(f"{name}{{{_labels(label_names, key)}}} {number}")
+
+
+def _gauge(lines: list[str], name: str, help_text: str, label_names: tuple, values: dict) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for key, value in sorted(values.items()):
+        lines.append(f"{name}{{{_labels(label_names, key)}}} {value}")
+
+
+# psycopg_pool statistic -> (metric, help, kind, scale). Counters only appear
+# in get_stats() once non-zero.
+POOL_STATS = {
+    "pool_size": ("houndz_db_pool_connections", "Connections held by the pool.", _gauge, 1),
+    "pool_available": ("houndz_db_pool_idle_connections", "Pooled connections not checked out.", _gauge, 1),
+    "pool_max": ("houndz_db_pool_max_connections", "Pool size limit.", _gauge, 1),
+    "requests_waiting": ("houndz_db_pool_waiting", "Requests waiting for a connection now.", _gauge, 1),
+    "requests_num": ("houndz_db_pool_requests_total", "Connections checked out.", _counter, 1),
+    "requests_queued": ("houndz_db_pool_queued_total", "Checkouts that had to wait.", _counter, 1),
+    "requests_wait_ms": ("houndz_db_pool_wait_seconds_total", "Time spent waiting for a connection.",
+                         _counter, 0.001),
+    "requests_errors": ("houndz_db_pool_timeouts_total", "Checkouts that timed out or failed.", _counter, 1),
+    "connections_num": ("houndz_db_pool_connects_total", "Connections opened by the pool.", _counter, 1),
+    "connections_lost": ("houndz_db_pool_lost_total", "Connections found broken by health checks.",
+                         _counter, 1),
+}
+
+
+def _pool_metrics(lines: list[str], database_connections) -> None:
+    """Per-alias psycopg pool statistics (api.postgres) for this worker."""
+    stats = {}
+    for connection in database_connections:
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            stats[connection.alias] = pool.get_stats()
+    if not stats:
+        return
+    for key, (name, help_text, render, scale) in POOL_STATS.items():
+        values = {(alias,): pool_stats.get(key, 0) * scale for alias, pool_stats in stats.items()}
+        render(lines, name, help_text, ("database",), values)
+
+
+REGISTRY = Registry()
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += time.perf_counter() - started
+
+
+def is_sampled() -> bool:
+    return _current.get() is not None
+
+
+@contextmanager
+def serializer_timer() -> Iterator[None]:
+    """Count the enclosed block, minus any DB time in it, as serializer time."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started, db_before = time.perf_counter(), stats.db_seconds
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.serializer_seconds += elapsed - (stats.db_seconds - db_before)
+
+
+def _resolve(request) -> tuple[str, str]:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched", ""
+    actions = getattr(match.func, "actions", None) or {}
+    return match.view_name, actions.get(request.method.lower(), match.url_name or "")
+
+
+class MetricsMiddleware:
+    # Async-capable so ASGI requests reach async views without a thread hop.
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response) -> None:
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.path == settings.METRICS_PATH:
+            return self.get_response(request)
+
+        stats = _sample()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            if stats is not None:
+                token = _current.set(stats)
+                stack.callback(_current.reset, token)
+                _wrap_connections(stack)
+            response = self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if request.path == settings.METRICS_PATH:
+            return await self.get_response(request)
+
+        stats = _sample()
+        started = time.perf_counter()
+        if stats is None:
+            response = await self.get_response(request)
+        else:
+            token = _current.set(stats)
+            # The async ORM runs queries on the request's sync thread, so the
+            # wrappers are installed (and removed) there.
+            stack = ExitStack()
+            await sync_to_async(_wrap_connections)(stack)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+                _current.reset(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, stats: RequestStats | None, seconds: float) -> None:
+        endpoint, action = _resolve(request)
+        REGISTRY.record(endpoint, action, request.method, response.status_code, seconds, stats)
+        if stats is not None:
+            logger.info(
+                "request endpoint=%s action=%s method=%s status=%s duration_ms=%.1f "
+                "queries=%d db_ms=%.1f serializer_ms=%.1f",
+                endpoint,
+                action or "-",
+                request.method,
+                response.status_code,
+                seconds * 1000,
+                stats.queries,
+                stats.db_seconds * 1000,
+                stats.serializer_seconds * 1000,
+            )
+
+
+def _sample() -> RequestStats | None:
+    rate = settings.METRICS_SAMPLE_RATE
+    return RequestStats() if rate >= 1 or random.random() < rate else None
+
+
+def _wrap_connections(stack: ExitStack) -> None:
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(_record_query))
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse("Unauthorized\n", status=401, content_type=CONTENT_TYPE)
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# PostgreSQL only: other backends enforce the rule in api.overlap.guarded_write.
+# Adding the constraint fails if overlapping active bookings already exist;
+# resolve those first.
+CREATE_CONSTRAINT = """
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE api_booking ADD CONSTRAINT api_booking_no_overlap
+    EXCLUDE USING gist (
+        suite_id WITH =,
+        daterange(start_date, end_date, '[]') WITH &&
+    )
+    WHERE (status IN ('booked', 'checked-in'));
+"""
+
+DROP_CONSTRAINT = "ALTER TABLE api_booking DROP CONSTRAINT IF EXISTS api_booking_no_overlap;"
+
+
+def add_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_CONSTRAINT)
+
+
+def drop_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0002_sync_tombstones"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_constraint, drop_constraint),
+    ]
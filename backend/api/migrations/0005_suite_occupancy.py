@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+ACTIVE_STATUSES = ("booked", "checked-in")
+
+
+def backfill(apps, schema_editor):
+    Booking = apps.get_model("api", "Booking")
+    SuiteOccupancy = apps.get_model("api", "SuiteOccupancy")
+    rows = []
+    for booking in Booking.objects.filter(status__in=ACTIVE_STATUSES).iterator():
+        for offset in range((booking.end_date - booking.start_date).days + 1):
+            rows.append(
+                SuiteOccupancy(
+                    suite_id=booking.suite_id,
+                    booking_id=booking.pk,
+                    date=booking.start_date + timedelta(days=offset),
+                )
+            )
+    SuiteOccupancy.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0004_booking_end_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SuiteOccupancy",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("booking", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="occupancy", to="api.booking")),
+                ("suite", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="api.suite")),
+            ],
+            options={
+                "ordering": ("date", "suite"),
+                "indexes": [models.Index(fields=["date", "suite"], name="api_occupancy_date_idx")],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Interval indexes over active bookings (see api.intervals).
+
+# PostgreSQL: a GiST index on the stay's date range. The exclusion constraint
+# from 0003 already covers (suite_id, range) lookups.
+POSTGRES_CREATE = """
+CREATE INDEX IF NOT EXISTS api_booking_active_span_idx ON api_booking
+    USING gist (daterange(start_date, end_date, '[]'))
+    WHERE (status IN ('booked', 'checked-in'));
+"""
+POSTGRES_DROP = "DROP INDEX IF EXISTS api_booking_active_span_idx;"
+
+# SQLite: an R*Tree of (suite, first day, last day) per active booking, kept
+# in step by triggers so bulk writes and raw updates are covered too. Days
+# are counted from 1970-01-01.
+SQLITE_DAY = "CAST(julianday({}) - 2440587.5 AS INTEGER)"
+
+
+def sqlite_rows(alias, source=""):
+    start, end = (SQLITE_DAY.format(f"{alias}.{column}") for column in ("start_date", "end_date"))
+    return (
+        f"SELECT {alias}.id, {alias}.suite_id, {alias}.suite_id, min({start}, {end}), max({start}, {end}) "
+        f"{source}WHERE {alias}.status IN ('booked', 'checked-in')"
+    )
+
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE api_booking_interval USING rtree_i32(id, suite_min, suite_max, first_day, last_day);",
+    f"""
+    CREATE TRIGGER api_booking_interval_insert AFTER INSERT ON api_booking BEGIN
+        INSERT INTO api_booking_interval {sqlite_rows("NEW")};
+    END;
+    """,
+    f"""
+    CREATE TRIGGER api_booking_interval_update
+    AFTER UPDATE OF suite_id, start_date, end_date, status ON api_booking BEGIN
+        DELETE FROM api_booking_interval WHERE id = OLD.id;
+        INSERT INTO api_booking_interval {sqlite_rows("NEW")};
+    END;
+    """,
+    """
+    CREATE TRIGGER api_booking_interval_delete AFTER DELETE ON api_booking BEGIN
+        DELETE FROM api_booking_interval WHERE id = OLD.id;
+    END;
+    """,
+    f"INSERT INTO api_booking_interval {sqlite_rows('api_booking', 'FROM api_booking ')}",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS api_booking_interval_insert;",
+    "DROP TRIGGER IF EXISTS api_booking_interval_update;",
+    "DROP TRIGGER IF EXISTS api_booking_interval_delete;",
+    "DROP TABLE IF EXISTS api_booking_interval;",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_CREATE)
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(SQLITE_CREATE[0])
+        except OperationalError:
+            return  # SQLite built without R*Tree; api.intervals falls back to plain queries
+        for statement in SQLITE_CREATE[1:]:
+            schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP)
+    elif vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0006_suite_constraints"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0007_booking_interval_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedBooking",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("status", models.CharField(choices=[("booked", "Booked"), ("checked-in", "Checked In"), ("checked-out", "Checked Out")], max_length=12)),
+                ("bathed", models.BooleanField(default=False)),
+                ("notes", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                ("pet", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="archived_bookings", to="api.pet")),
+                ("suite", models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name="archived_bookings", to="api.suite")),
+            ],
+            options={
+                "ordering": ("start_date", "id"),
+                "indexes": [models.Index(fields=["end_date", "start_date"], name="api_archive_end_date_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,111 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Text indexes behind /api/search/ (see api.search).
+
+# PostgreSQL: trigram GIN indexes, which serve ILIKE '%term%' and similarity().
+POSTGRES_CREATE = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS api_owner_name_trgm_idx ON api_owner USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS api_owner_phone_trgm_idx ON api_owner USING gin (phone gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS api_owner_email_trgm_idx ON api_owner USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS api_pet_name_trgm_idx ON api_pet USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS api_pet_breed_trgm_idx ON api_pet USING gin (breed gin_trgm_ops);
+"""
+POSTGRES_DROP = """
+DROP INDEX IF EXISTS api_owner_name_trgm_idx;
+DROP INDEX IF EXISTS api_owner_phone_trgm_idx;
+DROP INDEX IF EXISTS api_owner_email_trgm_idx;
+DROP INDEX IF EXISTS api_pet_name_trgm_idx;
+DROP INDEX IF EXISTS api_pet_breed_trgm_idx;
+"""
+
+# SQLite: one FTS5 table for owners and pets, kept current by triggers. The
+# rowid encodes the row: owner id * 2, or pet id * 2 + 1. Pets are indexed
+# with their owner's name, so "doe" finds the Does' dogs too.
+OWNER_ROW = "SELECT {row}.id * 2, {row}.name, {row}.phone || ' ' || {row}.email"
+PET_ROW = (
+    "SELECT p.id * 2 + 1, p.name, p.breed || ' ' || o.name "
+    "FROM api_pet p JOIN api_owner o ON o.id = p.owner_id WHERE {where}"
+)
+INSERT = "INSERT INTO api_search (rowid, title, detail) "
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE api_search USING fts5("
+    "title, detail, tokenize='unicode61 remove_diacritics 2', prefix='2 3');",
+    f"""
+    CREATE TRIGGER api_search_owner_insert AFTER INSERT ON api_owner BEGIN
+        {INSERT}{OWNER_ROW.format(row="NEW")};
+    END;
+    """,
+    f"""
+    CREATE TRIGGER api_search_owner_update AFTER UPDATE OF name, phone, email ON api_owner BEGIN
+        DELETE FROM api_search WHERE rowid = OLD.id * 2;
+        {INSERT}{OWNER_ROW.format(row="NEW")};
+        DELETE FROM api_search WHERE rowid IN (SELECT id * 2 + 1 FROM api_pet WHERE owner_id = NEW.id);
+        {INSERT}{PET_ROW.format(where="p.owner_id = NEW.id")};
+    END;
+    """,
+    """
+    CREATE TRIGGER api_search_owner_delete AFTER DELETE ON api_owner BEGIN
+        DELETE FROM api_search WHERE rowid = OLD.id * 2;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER api_search_pet_insert AFTER INSERT ON api_pet BEGIN
+        {INSERT}{PET_ROW.format(where="p.id = NEW.id")};
+    END;
+    """,
+    f"""
+    CREATE TRIGGER api_search_pet_update AFTER UPDATE OF name, breed, owner_id ON api_pet BEGIN
+        DELETE FROM api_search WHERE rowid = OLD.id * 2 + 1;
+        {INSERT}{PET_ROW.format(where="p.id = NEW.id")};
+    END;
+    """,
+    """
+    CREATE TRIGGER api_search_pet_delete AFTER DELETE ON api_pet BEGIN
+        DELETE FROM api_search WHERE rowid = OLD.id * 2 + 1;
+    END;
+    """,
+    f"{INSERT}{OWNER_ROW.format(row='api_owner')} FROM api_owner;",
+    f"{INSERT}{PET_ROW.format(where='1')};",
+]
+SQLITE_DROP = [
+    *(
+        f"DROP TRIGGER IF EXISTS api_search_{table}_{event};"
+        for table in ("owner", "pet")
+        for event in ("insert", "update", "delete")
+    ),
+    "DROP TABLE IF EXISTS api_search;",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_CREATE)
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(SQLITE_CREATE[0])
+        except OperationalError:
+            return  # SQLite built without FTS5; api.search falls back to LIKE queries
+        for statement in SQLITE_CREATE[1:]:
+            schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP)
+    elif vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0008_archived_bookings"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
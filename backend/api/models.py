@@ -4,12 +4,13 @@ from datetime import date
 
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Q
+
+from . import intervals, overlap
 
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         abstract = True
@@ -18,6 +19,10 @@ class TimeStampedModel(models.Model):
 class Suite(TimeStampedModel):
     label = models.CharField(max_length=32, unique=True)
     notes = models.TextField(blank=True, default="")
+    # Heaviest dog the suite takes; blank means any size (see api.scheduling).
+    max_weight_kg = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    # Amenities matched against pets' special_needs, e.g. "No stairs".
+    features = models.JSONField(default=list, blank=True)
 
     class Meta:
         ordering = ("label",)
@@ -60,13 +65,8 @@ class BookingQuerySet(models.QuerySet):
     def active(self) -> "BookingQuerySet":
         return self.exclude(status=Booking.Status.CHECKED_OUT)
 
-    def overlapping(self, suite: Suite, start: date, end: date, exclude_id: int | None = None) -> "BookingQuerySet":
-        qs = self.filter(
-            suite=suite,
-            status__in=[Booking.Status.BOOKED, Booking.Status.CHECKED_IN],
-        ).filter(
-            Q(start_date__lte=end) & Q(end_date__gte=start)
-        )
+    def overlapping(self, suite: Suite | int, start: date, end: date, exclude_id: int | None = None) -> "BookingQuerySet":
+        qs = intervals.overlapping(self, start, end, suites=[getattr(suite, "pk", suite)])
         if exclude_id:
             qs = qs.exclude(id=exclude_id)
         return qs
@@ -98,13 +98,17 @@ class Booking(TimeStampedModel):
     bathed = models.BooleanField(default=False)
     notes = models.TextField(blank=True, default="")
 
+    ACTIVE_STATUSES = (Status.BOOKED, Status.CHECKED_IN)
+
     objects = BookingQuerySet.as_manager()
 
     class Meta:
         ordering = ("start_date", "suite__label")
         indexes = [
-            models.Index(fields=("suite", "status")),
-            models.Index(fields=("start_date", "end_date")),
+            models.Index(fields=("suite", "status"), name="api_bookings_suite_status_idx"),
+            models.Index(fields=("start_date", "end_date"), name="api_bookings_date_idx"),
+            # Serves "overlaps [from, to]" windows, where end_date >= from is selective.
+            models.Index(fields=("end_date", "start_date"), name="api_bookings_end_date_idx"),
         ]
 
     def __str__(self) -> str:
@@ -116,21 +120,103 @@ class Booking(TimeStampedModel):
         if self.start_date > self.end_date:
             raise ValidationError({"end_date": "End date must be on or after start date."})
 
-        if not self.suite_id:
+    def full_clean(self, *args, validate_overlap: bool = True, **kwargs) -> None:
+        super().full_clean(*args, **kwargs)
+        if validate_overlap:
+            self.validate_overlap()
+
+    def validate_overlap(self) -> None:
+        if not self.suite_id or self.status not in Booking.ACTIVE_STATUSES:
             return
 
         overlapping = Booking.objects.overlapping(
-            suite=self.suite,
+            suite=self.suite_id,
             start=self.start_date,
             end=self.end_date,
             exclude_id=self.id,
         )
         if overlapping.exists():
-            raise ValidationError(
-                {"suite": "Suite already has a booking during the requested dates."}
-            )
+            raise ValidationError({"suite": overlap.OVERLAP_MESSAGE})
+
+    def save(self, *args, validate: bool = True, **kwargs):
+        """Validate and save; the overlap rule is enforced race-free while writing.
+
+        Pass ``validate=False`` only when the caller has already run
+        ``full_clean(validate_overlap=False)`` (or equivalent) on this instance.
+        """
+        if validate:
+            self.full_clean(validate_overlap=False)
+        with overlap.guarded_write(self):
+            return super().save(*args, **kwargs)
+
+
+class ArchivedBooking(models.Model):
+    """A checked-out booking moved out of the live table by ``archive_bookings``.
+
+    Keeps the booking's id and fields, so history reads the same as live
+    bookings (see :mod:`api.archive`). Rows are never changed once written.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name="archived_bookings")
+    suite = models.ForeignKey(Suite, on_delete=models.PROTECT, related_name="archived_bookings")
+    start_date = models.DateField()
+    end_date = models.DateField()
+    status = models.CharField(max_length=12, choices=Booking.Status.choices)
+    bathed = models.BooleanField(default=False)
+    notes = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("start_date", "id")
+        indexes = [
+            models.Index(fields=("end_date", "start_date"), name="api_archive_end_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.pet_id} in {self.suite_id} [{self.start_date}→{self.end_date}] (archived)"
+
+
+class SuiteOccupancy(models.Model):
+    """One row per night a suite is held by an active booking.
+
+    A materialized per-day grid kept in step with bookings by
+    :mod:`api.availability`, so availability lookups read O(days) rows
+    however much history accumulates.
+    """
+
+    suite = models.ForeignKey(Suite, on_delete=models.CASCADE, related_name="+")
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name="occupancy")
+    date = models.DateField()
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
+    class Meta:
+        ordering = ("date", "suite")
+        indexes = [
+            models.Index(fields=("date", "suite"), name="api_occupancy_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.suite_id} on {self.date} (booking {self.booking_id})"
 
+
+class Tombstone(models.Model):
+    """Marker left behind when a synced row is deleted.
+
+    Delta-sync clients only see rows that still exist, so deletes are
+    recorded here and replayed to them as ``deleted`` ids.
+    """
+
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ("deleted_at",)
+        indexes = [
+            models.Index(fields=("model", "deleted_at"), name="api_tombstone_model_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model}#{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,121 @@
+"""Race-free enforcement of "one active booking per suite per night".
+
+On PostgreSQL the rule is a ``daterange`` GiST exclusion constraint (see
+migration ``0003``), so writes go straight to the database and a violation
+comes back as an ``IntegrityError``. Other backends (SQLite) serialize
+writers per suite with a lock and run the overlap query while holding it.
+Either way callers see the same ``{"suite": ...}`` validation error.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, router, transaction
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+OVERLAP_CONSTRAINT = "api_booking_no_overlap"
+OVERLAP_MESSAGE = "Suite already has a booking during the requested dates."
+EXCLUSION_VIOLATION = "23P01"
+
+_thread_locks: dict[int, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def enforced_by_database(using: str) -> bool:
+    return connections[using].vendor == "postgresql"
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    cause = exc.__cause__
+    if getattr(cause, "sqlstate", None) == EXCLUSION_VIOLATION:
+        return True
+    return OVERLAP_CONSTRAINT in str(exc)
+
+
+def _lock_dir() -> str:
+    path = settings.BOOKING_LOCK_DIR or os.path.join(tempfile.gettempdir(), "houndz-locks")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@contextmanager
+def suite_lock(suite_id: int) -> Iterator[None]:
+    """Hold an exclusive per-suite lock across threads and processes."""
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(suite_id, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(_lock_dir(), f"suite-{suite_id}.lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@contextmanager
+def suite_locks(suite_ids: Iterable[int]) -> Iterator[None]:
+    """Lock several suites at once, in a fixed order to avoid deadlocks."""
+    ids = sorted(set(suite_ids))
+    if not ids:
+        yield
+        return
+    with suite_lock(ids[0]), suite_locks(ids[1:]):
+        yield
+
+
+@contextmanager
+def translate_violation() -> Iterator[None]:
+    try:
+        yield
+    except IntegrityError as exc:
+        if is_overlap_violation(exc):
+            raise ValidationError({"suite": OVERLAP_MESSAGE}) from exc
+        raise
+
+
+@contextmanager
+def guarded_write(booking) -> Iterator[None]:
+    """Wrap the INSERT/UPDATE of ``booking`` so it cannot double-book a suite.
+
+    The write commits before the suite lock is released, unless the caller
+    already holds a transaction open; keep that transaction short.
+    """
+    using = router.db_for_write(type(booking), instance=booking)
+    if enforced_by_database(using):
+        with translate_violation(), transaction.atomic(using=using):
+            yield
+        return
+
+    with suite_lock(booking.suite_id), transaction.atomic(using=using):
+        booking.validate_overlap()
+        yield
+
+
+@contextmanager
+def guarded_bulk_write(suite_ids: Iterable[int], using: str) -> Iterator[None]:
+    """Like :func:`guarded_write` for a batch touching several suites.
+
+    Callers check overlaps themselves inside the block; on SQLite every
+    affected suite stays locked until the batch commits.
+    """
+    if enforced_by_database(using):
+        with translate_violation(), transaction.atomic(using=using):
+            yield
+        return
+
+    with suite_locks(suite_ids), transaction.atomic(using=using):
+        yield
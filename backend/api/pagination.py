@@ -0,0 +1,52 @@
+"""Pagination classes for the API."""
+
+from __future__ import annotations
+
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+class OptInCursorPagination(CursorPagination):
+    """Keyset pagination that only applies when the client asks for it.
+
+    Clients that expect a bare list keep getting one. Sending ``page_size``
+    or ``cursor`` switches to ``{"next", "previous", "results"}`` pages
+    ordered by the view's ``cursor_ordering``.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, "cursor_ordering", None) or ("id",))
+
+
+class RankedPagination(LimitOffsetPagination):
+    """``?limit=&offset=`` pages over ranked results, without a ``COUNT``.
+
+    ``fetch(offset, n)`` returns up to ``n`` results starting at ``offset``.
+    One extra result is requested to tell whether there is a next page, and
+    pages come back as ``{"next", "previous", "results"}`` like cursor pages.
+    """
+
+    default_limit = 10
+    max_limit = 50
+
+    def paginate_ranked(self, fetch, request):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        rows = fetch(self.offset, self.limit + 1)
+        self.count = self.offset + len(rows)
+        return rows[: self.limit]
+
+    def get_paginated_response(self, data):
+        return Response(
+            {"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data}
+        )
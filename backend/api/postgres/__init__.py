@@ -0,0 +1,4 @@
+"""PostgreSQL backend with a per-worker connection pool (``ENGINE = "api.postgres"``).
+
+See :mod:`api.postgres.base`.
+"""
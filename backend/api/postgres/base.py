@@ -0,0 +1,103 @@
+"""Django's PostgreSQL backend with Django 5.1's ``OPTIONS["pool"]``, on 4.2.
+
+With ``"pool": {...}`` (keyword arguments for ``psycopg_pool.ConnectionPool``)
+or ``"pool": True``, each process keeps one pool per database alias.
+Connections are checked out when Django opens one and returned when it
+closes one. Django's own persistent connections must be off
+(``CONN_MAX_AGE = 0``): the pool decides how many connections stay open,
+and for how long. ``CONN_HEALTH_CHECKS`` makes the pool check each
+connection before handing it out.
+
+Pools open on the first query, never at import. With gunicorn's
+``preload_app`` each forked worker therefore builds its own; a pool opened
+in the master would not survive the fork.
+
+Test databases close the pool before they are created, cloned or dropped
+(see :mod:`api.postgres.creation`).
+
+``api.metrics`` reports pool size and wait time from ``pool.get_stats()``.
+"""
+
+from __future__ import annotations
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .creation import DatabaseCreation
+
+_pools: dict = {}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        """The process's pool for this alias, or ``None`` when pooling is off."""
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not options:
+            return None
+        if self.alias not in _pools:
+            if self.settings_dict.get("CONN_MAX_AGE", 0) != 0:
+                raise ImproperlyConfigured("Pooled connections need CONN_MAX_AGE = 0.")
+            try:
+                from psycopg_pool import ConnectionPool
+            except ImportError as exc:
+                raise ImproperlyConfigured(
+                    "OPTIONS['pool'] needs psycopg_pool; install psycopg[pool]."
+                ) from exc
+            kwargs = self.get_connection_params()
+            # Django switches autocommit itself once it has the connection.
+            kwargs["autocommit"] = True
+            pool = ConnectionPool(
+                kwargs=kwargs,
+                open=False,
+                check=ConnectionPool.check_connection if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+                name=self.alias,
+                **({} if options is True else options),
+            )
+            # Threads racing here build spare pools; unopened, they cost nothing.
+            _pools.setdefault(self.alias, pool)
+        return _pools[self.alias]
+
+    def close_pool(self) -> None:
+        pool = _pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        pool.open()
+        connection = pool.getconn()
+        # What the parent does after connecting.
+        level = self.settings_dict["OPTIONS"].get("isolation_level")
+        if level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            try:
+                self.isolation_level = IsolationLevel(level)
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f"Invalid transaction isolation level {level} specified. "
+                    f"Use one of the psycopg.IsolationLevel values."
+                )
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None and self.pool is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
+            # Back in the pool: this wrapper must not touch it again.
+            self.connection = None
+            return
+        return super()._close()
@@ -0,0 +1,26 @@
+"""Test database handling for the pooled backend.
+
+PostgreSQL refuses to drop a database, or to copy it as a template, while
+other sessions are connected to it, and the pool keeps idle connections
+open. Each step therefore closes this process's pool first; the next query
+builds a new one against whatever ``NAME`` then says.
+"""
+
+from __future__ import annotations
+
+from django.db.backends.postgresql import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def create_test_db(self, *args, **kwargs):
+        # A pool opened by checks or setup still points at the real database.
+        self.connection.close_pool()
+        return super().create_test_db(*args, **kwargs)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self.connection.close_pool()
+        return super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        self.connection.close_pool()
+        return super()._destroy_test_db(test_database_name, verbosity)
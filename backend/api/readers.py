@@ -0,0 +1,118 @@
+"""Serializer-free read path for hot list endpoints.
+
+DRF runs its field machinery per object and per nesting level, which
+dominates large booking lists on the Pi. :class:`ValuesReader` walks a
+serializer's readable fields once to build a plan, fetches matching flat
+rows with ``values_list()`` (one joined query), and assembles the same
+nested dicts directly:
+
+* only dates, datetimes and decimals are converted, and the current
+  timezone is resolved once per render instead of once per value;
+* a nested object (a suite, a pet and its owner) is built once per
+  primary key and reused for every row that repeats it.
+
+Output must stay byte-for-byte identical to the serializer; see
+``api/tests/test_readers.py``.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Callable
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from . import metrics
+
+# Fields whose JSON form differs from what the database driver returns.
+CONVERTED_FIELDS = (serializers.DateField, serializers.DateTimeField, serializers.DecimalField)
+
+# A plan node is a list of (output name, column index | (child node, key column)).
+Node = list
+
+
+class ValuesReader:
+    def __init__(self, serializer_class: type[serializers.Serializer]) -> None:
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def _plan(self) -> tuple[Node, list[str], list[serializers.Field]]:
+        lookups: list[str] = []
+        fields: list[serializers.Field] = []
+        node = self._build_plan(self.serializer_class(), "", lookups, fields)
+        return node, lookups, fields
+
+    def _build_plan(self, serializer, prefix: str, lookups: list, fields: list) -> Node:
+        node = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+                raise TypeError(f"{type(field).__name__} {name!r} cannot be read from values()")
+            lookup = prefix + field.source.replace(".", "__")
+            if isinstance(field, serializers.BaseSerializer):
+                child = self._build_plan(field, f"{lookup}__", lookups, fields)
+                # Within one query a related primary key always carries the same
+                # column values, so it identifies the nested object.
+                key = next((index for child_name, index in child if child_name == "id"), None)
+                node.append((name, (child, key)))
+                continue
+            node.append((name, len(lookups)))
+            lookups.append(lookup)
+            fields.append(field)
+        return node
+
+    def render(self, queryset) -> list[dict]:
+        """Rows of ``queryset`` shaped exactly like ``serializer_class(many=True).data``."""
+        return self._assemble(list(queryset.values_list(*self._plan[1])))
+
+    async def arender(self, queryset) -> list[dict]:
+        """:meth:`render` for async views; the rows are fetched with the async ORM."""
+        return self._assemble([row async for row in queryset.values_list(*self._plan[1])])
+
+    def _assemble(self, rows: list[tuple]) -> list[dict]:
+        node, _, fields = self._plan
+        converters = [_converter(field) for field in fields]
+        memo: dict = {}
+        with metrics.serializer_timer():
+            return [self._fill(node, row, converters, memo) for row in rows]
+
+    def _fill(self, node: Node, row: tuple, converters: list, memo: dict) -> dict:
+        out = {}
+        for name, target in node:
+            if isinstance(target, int):
+                value, convert = row[target], converters[target]
+                out[name] = convert(value) if convert is not None and value is not None else value
+                continue
+            child, key = target
+            if key is None:
+                out[name] = self._fill(child, row, converters, memo)
+                continue
+            nested = memo.get((key, row[key]))
+            if nested is None:
+                nested = memo[key, row[key]] = self._fill(child, row, converters, memo)
+            out[name] = nested
+        return out
+
+
+def _converter(field: serializers.Field) -> Callable | None:
+    if not isinstance(field, CONVERTED_FIELDS):
+        return None
+    if (
+        not isinstance(field, serializers.DateTimeField)
+        or getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601
+        or hasattr(field, "timezone")
+    ):
+        return field.to_representation
+
+    # DateTimeField.to_representation, with the timezone looked up once.
+    zone = field.default_timezone()
+
+    def convert(value):
+        if zone is None or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(zone).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
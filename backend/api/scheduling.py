@@ -0,0 +1,269 @@
+"""Automatic suite assignment for booking requests.
+
+Staff used to pick a ``suite_id`` by hand and retry whenever the overlap
+rule rejected it. :func:`suggest` ranks the suites that can take one stay
+and :func:`assign` packs a batch of pending requests at once. Both read
+the active bookings around the requested dates with one query into a
+:class:`SuiteIndex` and then work in memory.
+
+A suite is eligible when it is free for every night of the stay, its
+``max_weight_kg`` (if set) is at least the pet's weight, and it offers every
+required feature: those asked for explicitly plus any of the pet's
+``special_needs`` that some suite lists in its ``features``. Needs that no
+suite advertises (a diet, medication) are care notes, not suite
+requirements.
+
+Among eligible suites the tightest fit wins: the one leaving the fewest
+free nights before and after the stay, so long runs of free nights stay
+intact for long stays. Ties go to the smallest suite that fits, then the
+one with the fewest features, keeping big and specialised suites for the
+dogs that need them.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable
+
+from . import bulk, caching, intervals, models
+
+# Free runs longer than this count the same as an empty calendar.
+GAP_CAP_DAYS = 60
+NO_FREE_SUITE = "No suitable suite is free for these dates."
+
+
+@dataclass(frozen=True)
+class SuiteInfo:
+    id: int
+    label: str
+    max_weight_kg: Decimal | None = None
+    features: frozenset[str] = frozenset()
+
+    def takes(self, stay: Stay) -> bool:
+        """Whether the suite suits the dog, ignoring the calendar."""
+        if self.max_weight_kg is not None and stay.weight_kg is not None:
+            if stay.weight_kg > self.max_weight_kg:
+                return False
+        return stay.features <= self.features
+
+
+@dataclass
+class Stay:
+    start: date
+    end: date
+    weight_kg: Decimal | None = None
+    features: frozenset[str] = frozenset()
+
+    @property
+    def nights(self) -> int:
+        return (self.end - self.start).days + 1
+
+
+@dataclass
+class Assignment:
+    suite: SuiteInfo | None
+    reason: str = ""
+    # Free nights left before/after the stay; None when more than GAP_CAP_DAYS.
+    gaps: tuple[int | None, int | None] = (None, None)
+
+    def as_dict(self) -> dict:
+        if self.suite is None:
+            return {"suite": None, "reason": self.reason}
+        return {
+            "suite": {"id": self.suite.id, "label": self.suite.label},
+            "free_nights_before": self.gaps[0],
+            "free_nights_after": self.gaps[1],
+        }
+
+
+@dataclass
+class _Calendar:
+    # Non-overlapping stays sorted by start, so ends are sorted too.
+    starts: list[date] = field(default_factory=list)
+    ends: list[date] = field(default_factory=list)
+
+
+class SuiteIndex:
+    """Interval index of active stays per suite.
+
+    Checking whether a stay fits a suite, and how much free time it leaves
+    around it, is two bisections; booking it is one list insert.
+    """
+
+    def __init__(self, suites: Iterable[SuiteInfo], stays: Iterable[tuple[int, date, date]] = ()) -> None:
+        # Tie-break order: smallest, then least specialised, then by label.
+        self.suites = sorted(suites, key=_suite_key)
+        self._calendars = {suite.id: _Calendar() for suite in self.suites}
+        for suite_id, start, end in sorted(stays, key=lambda stay: stay[1]):
+            calendar = self._calendars.get(suite_id)
+            if calendar is not None:
+                calendar.starts.append(start)
+                calendar.ends.append(end)
+
+    def gaps(self, suite_id: int, start: date, end: date) -> tuple[int | None, int | None] | None:
+        """Free nights before and after ``start``–``end``, or ``None`` if it overlaps a stay."""
+        calendar = self._calendars[suite_id]
+        # Stays starting on or before `end`; only the last of them can reach `start`.
+        position = bisect_right(calendar.starts, end)
+        if position and calendar.ends[position - 1] >= start:
+            return None
+        before = (start - calendar.ends[position - 1]).days - 1 if position else None
+        after = (calendar.starts[position] - end).days - 1 if position < len(calendar.starts) else None
+        return _cap(before), _cap(after)
+
+    def add(self, suite_id: int, start: date, end: date) -> None:
+        calendar = self._calendars[suite_id]
+        position = bisect_right(calendar.starts, start)
+        calendar.starts.insert(position, start)
+        calendar.ends.insert(position, end)
+
+    def rank(self, stay: Stay) -> list[Assignment]:
+        """Every suite that can take ``stay``, best fit first."""
+        ranked = []
+        for suite in self.suites:
+            if not suite.takes(stay):
+                continue
+            gaps = self.gaps(suite.id, stay.start, stay.end)
+            if gaps is not None:
+                ranked.append(Assignment(suite, gaps=gaps))
+        ranked.sort(key=lambda assignment: _wasted(assignment.gaps))
+        return ranked
+
+    def best(self, stay: Stay) -> Assignment | None:
+        """The first of :meth:`rank`, without ranking every suite."""
+        best, least = None, None
+        for suite in self.suites:
+            if not suite.takes(stay):
+                continue
+            gaps = self.gaps(suite.id, stay.start, stay.end)
+            if gaps is not None and (least is None or _wasted(gaps) < least):
+                best, least = Assignment(suite, gaps=gaps), _wasted(gaps)
+        return best
+
+    def explain(self, stay: Stay) -> str:
+        """Why no suite can take ``stay``."""
+        suites = self.suites
+        if stay.weight_kg is not None:
+            suites = [s for s in suites if s.max_weight_kg is None or s.max_weight_kg >= stay.weight_kg]
+            if not suites:
+                return f"No suite takes a dog over {stay.weight_kg} kg."
+        missing = stay.features - frozenset().union(*(suite.features for suite in suites))
+        if missing:
+            return f"No suite offers: {', '.join(sorted(missing))}."
+        if not any(suite.takes(stay) for suite in suites):
+            return "No single suite meets every requirement."
+        return NO_FREE_SUITE
+
+    def pack(self, stays: list[Stay]) -> list[Assignment]:
+        """Assign many stays at once, returning results in submission order.
+
+        The most constrained stays go first (fewest eligible suites, then the
+        longest), each into its best-fitting suite, and every placement is
+        added to the index before the next one is chosen.
+        """
+        eligible = [sum(suite.takes(stay) for suite in self.suites) for stay in stays]
+        order = sorted(
+            range(len(stays)),
+            key=lambda index: (eligible[index], -stays[index].nights, stays[index].start, index),
+        )
+        results: list[Assignment | None] = [None] * len(stays)
+        for index in order:
+            stay = stays[index]
+            best = self.best(stay)
+            if best is None:
+                results[index] = Assignment(None, self.explain(stay))
+                continue
+            self.add(best.suite.id, stay.start, stay.end)
+            results[index] = best
+        return results
+
+
+def _cap(gap: int | None) -> int | None:
+    return None if gap is None or gap > GAP_CAP_DAYS else gap
+
+
+def _wasted(gaps: tuple[int | None, int | None]) -> int:
+    before, after = gaps
+    return (GAP_CAP_DAYS if before is None else before) + (GAP_CAP_DAYS if after is None else after)
+
+
+def _suite_key(suite: SuiteInfo):
+    size = suite.max_weight_kg if suite.max_weight_kg is not None else Decimal("Infinity")
+    return size, len(suite.features), suite.label
+
+
+# ------------------------------------------------------------------ database
+
+
+def load_suites() -> list[SuiteInfo]:
+    return [
+        SuiteInfo(pk, label, max_weight, frozenset(features or ()))
+        for pk, label, max_weight, features in models.Suite.objects.values_list(
+            "pk", "label", "max_weight_kg", "features"
+        )
+    ]
+
+
+def load_index(suites: list[SuiteInfo], start: date, end: date) -> SuiteIndex:
+    """Index every active stay within ``GAP_CAP_DAYS`` of ``start``–``end``."""
+    margin = timedelta(days=GAP_CAP_DAYS + 1)
+    stays = intervals.overlapping(
+        models.Booking.objects.all(), start - margin, end + margin
+    ).values_list("suite_id", "start_date", "end_date")
+    return SuiteIndex(suites, stays)
+
+
+def build_stays(requests: list[dict], suites: list[SuiteInfo]) -> list[Stay]:
+    """Turn validated requests (``pet_id``, dates, ``features``) into stays.
+
+    Raises :class:`api.bulk.BulkValidationError` if any pet does not exist.
+    """
+    pets = caching.PETS.lookup(
+        models.Pet.objects.select_related("owner"), {request["pet_id"] for request in requests}
+    )
+    errors: list[dict] = [
+        {} if request["pet_id"] in pets
+        else {"pet_id": [bulk.DOES_NOT_EXIST.format(pk_value=request["pet_id"])]}
+        for request in requests
+    ]
+    if any(errors):
+        raise bulk.BulkValidationError(errors)
+
+    offered = frozenset().union(*(suite.features for suite in suites))
+    stays = []
+    for request in requests:
+        pet = pets[request["pet_id"]]
+        needs = frozenset(pet.special_needs or ()) & offered
+        stays.append(
+            Stay(
+                request["start_date"],
+                request["end_date"],
+                pet.weight_kg,
+                needs | frozenset(request.get("features", ())),
+            )
+        )
+    return stays
+
+
+def suggest(request: dict, limit: int = 3) -> dict:
+    """The ``limit`` best suites for one request, or why there are none."""
+    suites = load_suites()
+    (stay,) = build_stays([request], suites)
+    index = load_index(suites, stay.start, stay.end)
+    ranked = index.rank(stay)[:limit]
+    return {
+        "required_features": sorted(stay.features),
+        "suggestions": [assignment.as_dict() for assignment in ranked],
+        "reason": "" if ranked else index.explain(stay),
+    }
+
+
+def assign(requests: list[dict]) -> list[Assignment]:
+    """Pack ``requests`` into suites (see :meth:`SuiteIndex.pack`); nothing is saved."""
+    suites = load_suites()
+    stays = build_stays(requests, suites)
+    index = load_index(suites, min(stay.start for stay in stays), max(stay.end for stay in stays))
+    return index.pack(stays)
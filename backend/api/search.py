@@ -0,0 +1,170 @@
+"""Typeahead search over owners and pets behind ``/api/search/``.
+
+Every word of the query must match, as a word prefix (SQLite) or a
+substring (elsewhere), in an owner's name, phone or email, or in a pet's
+name, breed or owner's name. Migration ``0009`` adds the index each
+backend searches:
+
+* PostgreSQL: ``pg_trgm`` GIN indexes, which serve ``ILIKE '%word%'``.
+  Results rank by trigram ``similarity()`` to the whole query.
+* SQLite: an FTS5 table, ``api_search``, kept current by triggers on
+  ``api_owner`` and ``api_pet``. Results rank by ``bm25()``, with names
+  weighted over the other columns.
+* Anything else (or SQLite without FTS5): ``icontains`` filters, with
+  names starting with the query first.
+
+A pet result carries its owner and its active bookings, so the check-in
+desk can go from a typed name to a stay without another request.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Case, F, FloatField, Func, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+from . import models
+
+FTS_TABLE = "api_search"
+MIN_QUERY_LENGTH = 2
+# bm25() weights for the FTS5 columns (title, detail).
+FTS_WEIGHTS = (10.0, 1.0)
+
+OWNER_COLUMNS = ("name", "phone", "email")
+PET_COLUMNS = ("name", "breed", "owner__name")
+
+_has_fts: dict[str, bool] = {}
+
+
+def strategy(using: str) -> str:
+    """``"trigram"``, ``"fts5"`` or ``"like"`` for the database alias ``using``."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        return "trigram"
+    if connection.vendor == "sqlite":
+        if using not in _has_fts:
+            _has_fts[using] = FTS_TABLE in connection.introspection.table_names()
+        if _has_fts[using]:
+            return "fts5"
+    return "like"
+
+
+def terms(query: str) -> list[str]:
+    """The words of ``query``; empty when it is too short to search."""
+    if len(query.strip()) < MIN_QUERY_LENGTH:
+        return []
+    return re.findall(r"\w+", query.lower())
+
+
+def search(query: str, offset: int = 0, limit: int = 10, using: str = "default") -> list[dict]:
+    """Results ``offset`` to ``offset + limit`` for ``query``, best match first."""
+    words = terms(query)
+    if not words or limit < 1:
+        return []
+    kind = strategy(using)
+    if kind == "fts5":
+        hits = _fts_hits(words, offset, limit, using)
+    else:
+        hits = _orm_hits(query.strip(), words, offset + limit, kind, using)[offset:]
+    return _results(hits, using)
+
+
+def _fts_hits(words: list[str], offset: int, limit: int, using: str) -> list[tuple[str, int]]:
+    # Quoted so that words like "and" or "near" are not read as FTS5 operators.
+    match = " ".join(f'"{word}"*' for word in words)
+    weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+    sql = (
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+        f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid LIMIT %s OFFSET %s"
+    )
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [match, limit, offset])
+        rows = cursor.fetchall()
+    return [("pet" if rowid % 2 else "owner", rowid // 2) for (rowid,) in rows]
+
+
+def _orm_hits(query: str, words: list[str], count: int, kind: str, using: str) -> list[tuple[str, int]]:
+    """The best ``count`` owners and pets for ``query``, merged by score."""
+    scored = []
+    for name, model, columns in (
+        ("owner", models.Owner, OWNER_COLUMNS),
+        ("pet", models.Pet, PET_COLUMNS),
+    ):
+        queryset = model.objects.using(using)
+        for word in words:
+            queryset = _matching(queryset, word, columns, kind)
+        queryset = queryset.annotate(score=_score(query, columns, kind)).order_by("-score", "name", "id")
+        scored += [(score, name, pk) for pk, score in queryset.values_list("id", "score")[:count]]
+    scored.sort(key=lambda hit: -hit[0])
+    return [(name, pk) for _, name, pk in scored[:count]]
+
+
+def _matching(queryset: QuerySet, word: str, columns: tuple[str, ...], kind: str) -> QuerySet:
+    if kind != "trigram":
+        return queryset.filter(Q(*(Q(**{f"{column}__icontains": word}) for column in columns), _connector=Q.OR))
+    # A plain ILIKE, which the trigram indexes serve (Django's icontains wraps
+    # the column in UPPER()).
+    sql = " OR ".join(f"{_column_sql(queryset, column)} ILIKE %s" for column in columns)
+    pattern = "%" + word.replace("\\", "\\\\").replace("_", "\\_") + "%"
+    if any("__" in column for column in columns):
+        queryset = queryset.select_related(*{column.rsplit("__", 1)[0] for column in columns if "__" in column})
+    return queryset.filter(RawSQL(f"({sql})", [pattern] * len(columns), output_field=BooleanField()))
+
+
+def _column_sql(queryset: QuerySet, column: str) -> str:
+    model = queryset.model
+    *path, field = column.split("__")
+    for step in path:
+        model = model._meta.get_field(step).related_model
+    return f'"{model._meta.db_table}"."{model._meta.get_field(field).column}"'
+
+
+def _score(query: str, columns: tuple[str, ...], kind: str):
+    if kind == "trigram":
+        return Greatest(
+            *(Func(F(column), Value(query), function="similarity", output_field=FloatField()) for column in columns)
+        )
+    return Case(When(name__istartswith=query, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+
+
+def _results(hits: list[tuple[str, int]], using: str) -> list[dict]:
+    owner_ids = [pk for kind, pk in hits if kind == "owner"]
+    pet_ids = [pk for kind, pk in hits if kind == "pet"]
+    found = {}
+    if owner_ids:
+        for row in models.Owner.objects.using(using).filter(pk__in=owner_ids).order_by().values("id", *OWNER_COLUMNS):
+            found["owner", row["id"]] = {"type": "owner", **row}
+    if pet_ids:
+        pets = models.Pet.objects.using(using).filter(pk__in=pet_ids).order_by()
+        for row in pets.values("id", "name", "breed", "owner_id", "owner__name"):
+            found["pet", row["id"]] = {
+                "type": "pet",
+                "id": row["id"],
+                "name": row["name"],
+                "breed": row["breed"],
+                "owner": {"id": row["owner_id"], "name": row["owner__name"]},
+                "bookings": [],
+            }
+        bookings = (
+            models.Booking.objects.using(using)
+            .filter(pet_id__in=pet_ids, status__in=models.Booking.ACTIVE_STATUSES)
+            .order_by("start_date", "id")
+            .values("id", "pet_id", "suite_id", "suite__label", "start_date", "end_date", "status")
+        )
+        for row in bookings:
+            if ("pet", row["pet_id"]) not in found:
+                continue
+            found["pet", row["pet_id"]]["bookings"].append(
+                {
+                    "id": row["id"],
+                    "suite": {"id": row["suite_id"], "label": row["suite__label"]},
+                    "start_date": row["start_date"],
+                    "end_date": row["end_date"],
+                    "status": row["status"],
+                }
+            )
+    # Rows deleted since the index was read are skipped.
+    return [found[hit] for hit in hits if hit in found]
@@ -1,28 +1,128 @@
 from __future__ import annotations
 
-from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
-from . import models
+from . import caching, metrics, models
 
 
-class SuiteSerializer(serializers.ModelSerializer):
+def requested_expansions(request) -> set[str] | None:
+    """Relations named in ``?expand=``, or ``None`` if the client did not ask.
+
+    Dotted paths imply their parents: ``pet.owner`` also expands ``pet``.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    if "expand" not in request.query_params:
+        return None
+    expand = set()
+    for item in request.query_params["expand"].split(","):
+        parts = [part for part in item.strip().split(".") if part]
+        for depth in range(1, len(parts) + 1):
+            expand.add(".".join(parts[:depth]))
+    return expand
+
+
+class SelectableFieldsMixin:
+    """Support ``?fields=`` and ``?expand=`` on read requests.
+
+    ``fields`` keeps only the listed top-level fields. Relations listed in
+    ``expandable_fields`` are nested by default; once ``expand`` is given,
+    only the requested ones stay nested and the rest render as primary keys.
+    """
+
+    expandable_fields: tuple[str, ...] = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        path = self._field_path()
+
+        expand = requested_expansions(request)
+        if expand is not None:
+            for name in self.expandable_fields:
+                if name in fields and ".".join([*path, name]) not in expand:
+                    fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+        if not path and self._wants_sparse(request):
+            wanted = {name.strip() for name in request.query_params["fields"].split(",")} - {""}
+            if wanted:
+                fields = {
+                    name: field
+                    for name, field in fields.items()
+                    if name in wanted or field.write_only
+                }
+        return fields
+
+    def to_representation(self, instance):
+        # Time each top-level object (also each item of a top-level list).
+        parent = self.parent
+        is_root = parent is None or (
+            isinstance(parent, serializers.ListSerializer) and parent.parent is None
+        )
+        if is_root and metrics.is_sampled():
+            with metrics.serializer_timer():
+                return super().to_representation(instance)
+        return super().to_representation(instance)
+
+    @staticmethod
+    def _wants_sparse(request) -> bool:
+        return (
+            request is not None
+            and request.method in SAFE_METHODS
+            and "fields" in request.query_params
+        )
+
+    def _field_path(self) -> list[str]:
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.insert(0, node.field_name)
+            node = node.parent
+        return path
+
+
+class SuiteSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Suite
-        fields = ["id", "label", "notes", "created_at", "updated_at"]
+        fields = ["id", "label", "notes", "max_weight_kg", "features", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class OwnerSerializer(serializers.ModelSerializer):
+class OwnerSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Owner
         fields = ["id", "name", "phone", "email", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class PetSerializer(serializers.ModelSerializer):
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolve the primary key through an :class:`api.caching.Namespace` lookup."""
+
+    def __init__(self, namespace: caching.Namespace, **kwargs) -> None:
+        self.namespace = namespace
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instance = self.namespace.lookup(self.get_queryset(), [pk]).get(pk)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
+class PetSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = ("owner",)
+
     owner = OwnerSerializer(read_only=True)
-    owner_id = serializers.PrimaryKeyRelatedField(
+    owner_id = CachedPrimaryKeyRelatedField(
+        caching.OWNERS,
         queryset=models.Owner.objects.all(),
         write_only=True,
         source="owner",
@@ -44,15 +144,19 @@ class PetSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at", "owner"]
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = ("pet", "suite")
+
     pet = PetSerializer(read_only=True)
-    pet_id = serializers.PrimaryKeyRelatedField(
+    pet_id = CachedPrimaryKeyRelatedField(
+        caching.PETS,
         queryset=models.Pet.objects.select_related("owner"),
         write_only=True,
         source="pet",
     )
     suite = SuiteSerializer(read_only=True)
-    suite_id = serializers.PrimaryKeyRelatedField(
+    suite_id = CachedPrimaryKeyRelatedField(
+        caching.SUITES,
         queryset=models.Suite.objects.all(),
         write_only=True,
         source="suite",
@@ -77,6 +181,8 @@ class BookingSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "pet", "suite", "created_at", "updated_at"]
 
     def validate(self, attrs):
+        # pet/suite were already resolved by their PrimaryKeyRelatedFields and
+        # the overlap rule is enforced once, race-free, when the row is written.
         instance = models.Booking(
             pet=attrs.get("pet", getattr(self.instance, "pet", None)),
             suite=attrs.get("suite", getattr(self.instance, "suite", None)),
@@ -87,18 +193,73 @@ class BookingSerializer(serializers.ModelSerializer):
         )
         if self.instance:
             instance.id = self.instance.id
-        instance.full_clean()
+            instance._state.adding = False
+        instance.full_clean(exclude=["pet", "suite"], validate_overlap=False)
         return attrs
 
-    @transaction.atomic
     def create(self, validated_data):
-        booking = models.Booking.objects.create(**validated_data)
+        booking = models.Booking(**validated_data)
+        self._save_validated(booking)
         return booking
 
-    @transaction.atomic
     def update(self, instance, validated_data):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        self._save_validated(instance)
         return instance
 
+    @staticmethod
+    def _save_validated(booking: models.Booking) -> None:
+        # Booking.save() commits inside its own guarded transaction; an outer
+        # transaction here would delay that commit past the SQLite suite lock.
+        try:
+            booking.save(validate=False)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(serializers.as_serializer_error(exc)) from exc
+
+
+class BookingBulkItemSerializer(serializers.Serializer):
+    """One entry of a ``/bookings/bulk/`` batch: a create, or an update if ``id`` is set.
+
+    Only field formats are checked here; :mod:`api.bulk` resolves ids and
+    overlaps for the whole batch at once.
+    """
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    pet_id = serializers.IntegerField(required=False)
+    suite_id = serializers.IntegerField(required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=models.Booking.Status.choices, required=False)
+    bathed = serializers.BooleanField(required=False)
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if "id" not in attrs:
+            missing = {"pet_id", "suite_id", "start_date", "end_date"} - attrs.keys()
+            if missing:
+                raise serializers.ValidationError(
+                    {field: "This field is required." for field in sorted(missing)}
+                )
+        return attrs
+
+
+class SuiteRequestSerializer(serializers.Serializer):
+    """A stay to find a suite for (see :mod:`api.scheduling`)."""
+
+    pet_id = serializers.IntegerField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    features = serializers.ListField(child=serializers.CharField(), required=False)
+
+    def validate(self, attrs):
+        if attrs["start_date"] > attrs["end_date"]:
+            raise serializers.ValidationError({"end_date": "End date must be on or after start date."})
+        return attrs
+
+
+class SuiteAssignmentSerializer(serializers.Serializer):
+    """Body of ``/bookings/assign/``: pending stays and whether to book them."""
+
+    requests = SuiteRequestSerializer(many=True, allow_empty=False, max_length=1000)
+    save = serializers.BooleanField(default=False)
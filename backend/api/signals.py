@@ -0,0 +1,41 @@
+"""Model signal receivers for the API app."""
+
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+
+from . import availability, caching, events, models
+
+SYNCED_MODELS = (models.Suite, models.Owner, models.Pet, models.Booking)
+
+
+def record_tombstone(sender, instance, **kwargs) -> None:
+    models.Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+def refresh_occupancy(sender, instance, raw=False, **kwargs) -> None:
+    if not raw:
+        availability.refresh_booking(instance)
+
+
+def invalidate_caches(sender, instance, **kwargs) -> None:
+    caching.invalidate(sender)
+
+
+def publish_save(sender, instance, **kwargs) -> None:
+    events.publish_change(instance, "upsert")
+
+
+def publish_delete(sender, instance, **kwargs) -> None:
+    events.publish_change(instance, "delete")
+
+
+for _model in SYNCED_MODELS:
+    post_delete.connect(record_tombstone, sender=_model, dispatch_uid=f"tombstone-{_model.__name__}")
+    post_save.connect(publish_save, sender=_model, dispatch_uid=f"feed-save-{_model.__name__}")
+    post_delete.connect(publish_delete, sender=_model, dispatch_uid=f"feed-delete-{_model.__name__}")
+    post_save.connect(invalidate_caches, sender=_model, dispatch_uid=f"cache-save-{_model.__name__}")
+    post_delete.connect(invalidate_caches, sender=_model, dispatch_uid=f"cache-delete-{_model.__name__}")
+
+# Deleting a booking cascades to its occupancy rows, so only saves need handling.
+post_save.connect(refresh_occupancy, sender=models.Booking, dispatch_uid="occupancy-Booking")
@@ -0,0 +1,4 @@
+"""SQLite backend tuned for one Pi serving several workers (``ENGINE = "api.sqlite"``).
+
+See :mod:`api.sqlite.base`.
+"""
@@ -0,0 +1,60 @@
+"""Django's SQLite backend with the connection options from Django 5.1, on 4.2.
+
+Two ``OPTIONS`` keys are understood, with the same meaning as in Django 5.1,
+so settings keep working after an upgrade to the stock backend:
+
+* ``init_command``: ``;``-separated statements run on every new connection.
+  ``houndz.settings.base`` uses it for WAL journaling, ``busy_timeout``,
+  ``synchronous=NORMAL`` and mmap/page-cache sizing.
+* ``transaction_mode``: ``"DEFERRED"``, ``"IMMEDIATE"`` or ``"EXCLUSIVE"``.
+  With ``IMMEDIATE``, ``atomic()`` blocks take the write lock up front, so
+  a second writer waits out ``busy_timeout``. With the default deferred
+  ``BEGIN``, a transaction that reads and then writes fails at once with
+  "database is locked", because SQLite cannot wait on a lock upgrade.
+
+Connections also run ``PRAGMA optimize`` when they close, as SQLite
+recommends. ``manage.py sqlite_maintenance`` checkpoints the WAL.
+"""
+
+from __future__ import annotations
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = {"DEFERRED", "EXCLUSIVE", "IMMEDIATE"}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.init_commands = [
+            command.strip() for command in kwargs.pop("init_command", "").split(";") if command.strip()
+        ]
+        mode = kwargs.pop("transaction_mode", None)
+        if mode is not None and mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"settings.DATABASES[{self.alias!r}]['OPTIONS']['transaction_mode'] must be "
+                f"one of {', '.join(sorted(TRANSACTION_MODES))}, not {mode!r}."
+            )
+        self.transaction_mode = mode.upper() if mode else None
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for command in self.init_commands:
+            conn.execute(command)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f"BEGIN {self.transaction_mode}")
+
+    def _close(self):
+        if self.connection is not None:
+            try:
+                self.connection.execute("PRAGMA optimize")
+            except base.Database.Error:
+                pass  # busy or read-only; the next close tries again
+        super()._close()
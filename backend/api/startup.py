@@ -0,0 +1,119 @@
+"""Worker cold-start measurements behind ``manage.py bench_startup``.
+
+Each run starts a fresh interpreter (``python -m api.startup``) under one
+settings module. It times Django's setup up to a ready WSGI application,
+then the first request through it, and then reads its own resident memory.
+The parent repeats this and reports medians, so settings profiles (e.g.
+``houndz.settings.prod`` vs ``houndz.settings.api``) can be compared on
+the Pi itself.
+
+Only the standard library is imported before the clock starts.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+METRICS = ("wall_ms", "setup_ms", "first_response_ms", "rss_mb", "modules")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak rather than current, in KB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def probe(path: str, preload: bool = False) -> dict:
+    """Boot Django in this process and serve ``path`` once; the numbers for one run.
+
+    ``preload`` also imports the URLconf during setup, as the gunicorn
+    master does before forking when ``preload_app`` is on.
+    """
+    started = time.perf_counter()
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    if preload:
+        from django.urls import get_resolver
+
+        get_resolver().url_patterns
+    ready = time.perf_counter()
+
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")]
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "443",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": hosts[0] if hosts else "localhost",
+        "HTTP_ACCEPT": "application/json",
+        "wsgi.input": open(os.devnull, "rb"),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "https",
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    for _ in response:
+        pass
+    response.close()
+    done = time.perf_counter()
+    return {
+        "status": int(statuses[0].split()[0]),
+        "setup_ms": (ready - started) * 1000,
+        "first_response_ms": (done - ready) * 1000,
+        "rss_mb": _rss_mb(),
+        "modules": len(sys.modules),
+    }
+
+
+def run_once(settings_module: str, path: str, preload: bool = False) -> dict:
+    """One cold start in a child interpreter, including the interpreter's own start-up."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "api.startup", path, *(["--preload"] if preload else [])],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode:
+        raise RuntimeError(f"{settings_module} failed to start:\n{completed.stderr.strip()}")
+    # Settings modules may print (e.g. the dev .env notice); the report is the last line.
+    return {"wall_ms": wall_ms, **json.loads(completed.stdout.strip().splitlines()[-1])}
+
+
+def measure(settings_module: str, runs: int = 5, path: str = "/api/", preload: bool = False) -> dict:
+    """Median start-up numbers for ``settings_module`` over ``runs`` cold starts."""
+    results = [run_once(settings_module, path, preload) for _ in range(runs)]
+    report = {metric: statistics.median(result[metric] for result in results) for metric in METRICS}
+    report["status"] = results[-1]["status"]
+    return report
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    print(json.dumps(probe(args[0] if args else "/api/", preload="--preload" in args)))
@@ -0,0 +1,102 @@
+"""Delta-sync support for the `/api/sync/` endpoint.
+
+Clients keep a server-issued cursor and ask only for rows that changed
+since then. Changes are found through ``TimeStampedModel.updated_at`` and
+deletes through :class:`~api.models.Tombstone` rows.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import models, serializers
+
+# Collection name -> (queryset factory, serializer). Order matters for clients
+# that apply payloads sequentially: owners before pets before bookings.
+SYNC_COLLECTIONS = {
+    "suites": (lambda: models.Suite.objects.all(), serializers.SuiteSerializer),
+    "owners": (lambda: models.Owner.objects.all(), serializers.OwnerSerializer),
+    "pets": (lambda: models.Pet.objects.select_related("owner"), serializers.PetSerializer),
+    "bookings": (
+        lambda: models.Booking.objects.select_related("pet", "pet__owner", "suite").order_by(
+            "start_date", "id"
+        ),
+        serializers.BookingSerializer,
+    ),
+}
+
+# Tombstone.model value -> collection name.
+TOMBSTONE_COLLECTIONS = {
+    "suite": "suites",
+    "owner": "owners",
+    "pet": "pets",
+    "booking": "bookings",
+}
+
+# Rows are stamped with `updated_at` before their transaction commits, so a
+# row can become visible slightly after a cursor that is newer than its
+# timestamp has been issued. Re-reading a short window makes that safe; the
+# client merge is idempotent.
+CURSOR_OVERLAP = timedelta(seconds=2)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(moment: datetime) -> str:
+    return moment.isoformat()
+
+
+def decode_cursor(value: str) -> datetime:
+    try:
+        moment = parse_datetime(value)
+    except ValueError:
+        moment = None
+    if moment is None or timezone.is_naive(moment):
+        raise InvalidCursor(f"Invalid sync cursor: {value!r}")
+    return moment
+
+
+def tombstone_retention() -> timedelta:
+    return timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def build_sync_payload(since: datetime | None, context: dict | None = None) -> dict:
+    """Return every row changed after ``since`` plus the ids deleted since then.
+
+    A missing cursor, or one older than the tombstone retention window,
+    yields a full snapshot (``"full": true``) that replaces client state.
+    """
+    now = timezone.now()
+    full = since is None or since < now - tombstone_retention()
+
+    payload: dict = {"cursor": encode_cursor(now), "full": full}
+    for name, (queryset_factory, serializer_class) in SYNC_COLLECTIONS.items():
+        queryset = queryset_factory()
+        if not full:
+            queryset = queryset.filter(updated_at__gte=since - CURSOR_OVERLAP)
+        payload[name] = serializer_class(queryset, many=True, context=context or {}).data
+
+    deleted: dict[str, list[int]] = {name: [] for name in SYNC_COLLECTIONS}
+    if not full:
+        tombstones = models.Tombstone.objects.filter(
+            deleted_at__gte=since - CURSOR_OVERLAP
+        ).values_list("model", "object_id")
+        for model_name, object_id in tombstones:
+            collection = TOMBSTONE_COLLECTIONS.get(model_name)
+            if collection:
+                deleted[collection].append(object_id)
+    payload["deleted"] = deleted
+    return payload
+
+
+def prune_tombstones(now: datetime | None = None) -> int:
+    """Delete tombstones no client can still need; returns the number removed."""
+    cutoff = (now or timezone.now()) - tombstone_retention()
+    deleted, _ = models.Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
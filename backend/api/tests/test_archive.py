@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import archive, events, models, sync, transfer
+
+CUTOFF = date(2024, 1, 1)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        patcher = mock.patch.object(events, "get_broker")
+        self.broker = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+        Status = models.Booking.Status
+        self.old = [
+            self.book(CUTOFF - timedelta(days=40 + 5 * n), Status.CHECKED_OUT) for n in range(7)
+        ]
+        self.old_but_active = self.book(CUTOFF - timedelta(days=20), Status.BOOKED)
+        self.recent = self.book(CUTOFF + timedelta(days=5), Status.CHECKED_OUT)
+
+    def book(self, start, status):
+        return models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=start,
+            end_date=start + timedelta(days=2),
+            status=status,
+            notes=f"stay {start}",
+        )
+
+    def test_moves_old_checked_out_bookings_in_batches(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = archive.archive_bookings(CUTOFF, batch_size=3)
+        self.assertEqual(moved, 7)
+
+        self.assertEqual(
+            set(models.Booking.objects.values_list("id", flat=True)),
+            {self.old_but_active.id, self.recent.id},
+        )
+        archived = models.ArchivedBooking.objects.get(pk=self.old[0].pk)
+        self.assertEqual(
+            (archived.pet, archived.suite, archived.start_date, archived.notes, archived.created_at),
+            (self.pet, self.suite, self.old[0].start_date, self.old[0].notes, self.old[0].created_at),
+        )
+        # Sync clients learn about the moved rows once, through tombstones and one resync.
+        self.assertEqual(
+            set(models.Tombstone.objects.filter(model="booking").values_list("object_id", flat=True)),
+            {booking.pk for booking in self.old},
+        )
+        self.broker.publish.assert_called_once_with(events.RESYNC_EVENT)
+        payload = sync.build_sync_payload(None)
+        self.assertEqual(len(payload["bookings"]), 2)
+
+    def test_batches_are_bounded(self):
+        # select, archive insert, tombstone insert, grid delete, booking delete + savepoint
+        with self.assertNumQueries(7):
+            self.assertEqual(archive.archive_batch(CUTOFF, batch_size=5), 5)
+
+    @override_settings(ARCHIVE_AFTER_DAYS=10)
+    def test_command(self):
+        out = StringIO()
+        call_command("archive_bookings", "--before", CUTOFF.isoformat(), "--dry-run", stdout=out)
+        self.assertIn("Would archive 7 booking(s)", out.getvalue())
+        self.assertEqual(models.ArchivedBooking.objects.count(), 0)
+
+        call_command("archive_bookings", "--before", CUTOFF.isoformat(), "--pause", "0", stdout=out)
+        self.assertIn("Archived 7 booking(s)", out.getvalue())
+        self.assertEqual(models.ArchivedBooking.objects.count(), 7)
+
+    def test_history_reads_live_and_archived_bookings(self):
+        archive.archive_bookings(CUTOFF)
+        response = self.client.get(reverse("booking-history"), {"pet": self.pet.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 9)
+        self.assertEqual(response.data[0]["id"], self.old[-1].id)
+        self.assertEqual(response.data[0]["suite"]["label"], "Suite 1")
+        self.assertEqual(response.data[-1]["id"], self.recent.id)
+
+        expanded = self.client.get(reverse("booking-history"), {"pet": self.pet.id, "expand": ""})
+        self.assertEqual([row["id"] for row in expanded.data], [row["id"] for row in response.data])
+        self.assertEqual(expanded.data[0]["suite"], self.suite.id)
+
+        self.assertEqual(self.client.get(reverse("booking-history")).status_code, 400)
+
+    def test_export_includes_archived_bookings(self):
+        archive.archive_bookings(CUTOFF)
+        exported = [record["ref"] for record in transfer.export_records(["booking"])]
+        self.assertEqual(len(exported), 9)
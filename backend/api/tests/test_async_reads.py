@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+
+from .. import intervals, metrics, views
+from ..urls import router
+from .test_conditional import ConditionalTestCase
+
+# The API as served with HOUNDZ_ASYNC_VIEWS=true.
+urlpatterns = [path("api/", include([views.async_reads(pattern) for pattern in router.urls]))]
+
+
+class AsyncReadTests(ConditionalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.async_client = AsyncClient()
+
+    async def get(self, url, headers=None):
+        with override_settings(ROOT_URLCONF=__name__):
+            return await self.async_client.get(url, headers=headers)
+
+    async def sync_get(self, url):
+        return await sync_to_async(self.client.get)(url)
+
+    async def test_list_matches_the_sync_view_without_running_it(self):
+        url = "/api/bookings/?from=" + (self.booking.start_date - timedelta(days=1)).isoformat()
+        expected = await self.sync_get(url)
+        with mock.patch.object(views.BookingViewSet, "list", side_effect=AssertionError):
+            response = await self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+        response = await self.get(url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_current_matches_the_sync_view(self):
+        expected = await self.sync_get("/api/bookings/current/")
+        with mock.patch.object(views.BookingViewSet, "current", side_effect=AssertionError):
+            response = await self.get("/api/bookings/current/")
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(len(response.json()), 1)
+
+    async def test_current_is_the_first_request_of_a_worker(self):
+        # A fresh worker has not yet looked for the interval index.
+        with mock.patch.dict(intervals._has_rtree, clear=True):
+            response = await self.get("/api/bookings/current/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    async def test_other_requests_fall_back_to_drf(self):
+        for url in ("/api/bookings/?expand=pet", "/api/bookings/?page_size=1", "/api/bookings/?to=x"):
+            with self.subTest(url=url):
+                expected = await self.sync_get(url)
+                response = await self.get(url)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+
+    @override_settings(METRICS_SAMPLE_RATE=1.0)
+    async def test_metrics_count_queries_run_by_the_async_orm(self):
+        metrics.REGISTRY.reset()
+        self.addCleanup(metrics.REGISTRY.reset)
+        with self.assertLogs("api.metrics", level="INFO"):
+            await self.get("/api/bookings/")
+        self.assertIn(
+            'houndz_db_queries_total{endpoint="booking-list",action="list"} 6',
+            metrics.REGISTRY.render(),
+        )
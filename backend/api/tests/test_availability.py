@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import availability, models
+
+
+class OccupancyGridTests(TestCase):
+    def setUp(self):
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        self.other_suite = models.Suite.objects.create(label="Suite 2")
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        self.booking = models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 3),
+        )
+
+    def cells(self):
+        return list(
+            models.SuiteOccupancy.objects.filter(booking=self.booking).values_list("suite_id", "date")
+        )
+
+    def test_saving_a_booking_fills_one_row_per_night(self):
+        self.assertEqual(
+            self.cells(),
+            [(self.suite.id, date(2024, 1, day)) for day in (1, 2, 3)],
+        )
+
+    def test_moving_and_shortening_rewrites_rows(self):
+        self.booking.suite = self.other_suite
+        self.booking.end_date = date(2024, 1, 2)
+        self.booking.save()
+        self.assertEqual(
+            self.cells(),
+            [(self.other_suite.id, date(2024, 1, day)) for day in (1, 2)],
+        )
+
+    def test_checkout_and_delete_release_the_suite(self):
+        self.booking.status = models.Booking.Status.CHECKED_OUT
+        self.booking.save()
+        self.assertEqual(self.cells(), [])
+
+        self.booking.status = models.Booking.Status.BOOKED
+        self.booking.save()
+        self.booking.delete()
+        self.assertFalse(models.SuiteOccupancy.objects.exists())
+
+    def test_unchanged_dates_do_not_rewrite_rows(self):
+        self.booking.bathed = True
+        with self.assertNumQueries(1):
+            availability.refresh_booking(self.booking)
+
+    def test_rebuild_matches_incremental_grid(self):
+        before = sorted(models.SuiteOccupancy.objects.values_list("suite_id", "booking_id", "date"))
+        self.assertEqual(availability.rebuild(), 3)
+        after = sorted(models.SuiteOccupancy.objects.values_list("suite_id", "booking_id", "date"))
+        self.assertEqual(before, after)
+
+
+class AvailabilityEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("availability-list")
+        self.suites = [models.Suite.objects.create(label=f"Suite {n}") for n in (1, 2, 3)]
+        owner = models.Owner.objects.create(name="Jane Doe")
+        pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        models.Booking.objects.create(
+            pet=pet, suite=self.suites[0], start_date=date(2024, 1, 1), end_date=date(2024, 1, 2)
+        )
+        models.Booking.objects.create(
+            pet=pet, suite=self.suites[1], start_date=date(2024, 1, 2), end_date=date(2024, 1, 3)
+        )
+
+    def test_reports_free_suites_and_daily_counts(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"start": "2024-01-01", "end": "2024-01-03"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([suite["label"] for suite in response.data["free_suites"]], ["Suite 3"])
+        self.assertEqual(response.data["first_available"]["id"], self.suites[2].id)
+        self.assertEqual(
+            [(day["occupied"], day["free"]) for day in response.data["days"]],
+            [(1, 2), (2, 1), (1, 2)],
+        )
+
+    def test_single_day_lookup(self):
+        response = self.client.get(self.url, {"start": "2024-01-03"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [suite["label"] for suite in response.data["free_suites"]], ["Suite 1", "Suite 3"]
+        )
+
+    def test_rejects_bad_ranges(self):
+        response = self.client.get(self.url, {"start": "2024-01-05", "end": "2024-01-01"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("end", response.data)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("start", response.data)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from .. import archive, benchmark, models
+
+
+def generate(**options):
+    call_command(
+        "generate_kennel_data",
+        suites=3,
+        years=0.5,
+        future_days=30,
+        owners=20,
+        stdout=StringIO(),
+        **options,
+    )
+
+
+class GenerateKennelDataTests(TestCase):
+    def test_history_never_double_books_a_suite(self):
+        generate()
+        bookings = list(models.Booking.objects.order_by("suite_id", "start_date"))
+        self.assertGreater(len(bookings), 10)
+        for previous, booking in zip(bookings, bookings[1:]):
+            if previous.suite_id == booking.suite_id:
+                self.assertGreater(booking.start_date, previous.end_date)
+
+        active_nights = sum(
+            (booking.end_date - booking.start_date).days + 1
+            for booking in bookings
+            if booking.status in models.Booking.ACTIVE_STATUSES
+        )
+        self.assertEqual(models.SuiteOccupancy.objects.count(), active_nights)
+
+    def test_same_seed_same_data(self):
+        generate(seed=7)
+        first = list(models.Booking.objects.values_list("start_date", "end_date", "status"))
+        # Archived bookings reference the pets and suites being cleared.
+        self.assertGreater(archive.archive_bookings(timezone.localdate()), 0)
+        generate(seed=7, clear=True)
+        self.assertFalse(models.ArchivedBooking.objects.exists())
+        second = list(models.Booking.objects.values_list("start_date", "end_date", "status"))
+        self.assertEqual(first, second)
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_reports_every_route_without_writing(self):
+        generate()
+        bookings = models.Booking.objects.count()
+        report = benchmark.Harness(iterations=2, warmup=0).run()
+
+        self.assertEqual(report["skipped"], benchmark.SKIPPED)
+        for name in ("suite-list", "booking-detail", "booking-current", "availability-list", "sync-list"):
+            result = report["scenarios"][name]
+            self.assertEqual(result["status"], 200, name)
+            self.assertEqual(set(result["latency_ms"]), {"p50", "p90", "p95", "p99", "mean", "max"})
+        self.assertEqual(report["scenarios"]["booking-bulk"]["status"], 201)
+        self.assertEqual(report["meta"]["rows"]["booking"], bookings)
+
+        self.assertEqual(models.Booking.objects.count(), bookings)
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_compare_flags_changes(self):
+        baseline = {"scenarios": {"x": {"queries": 2, "latency_ms": {"p50": 10.0, "p95": 20.0}}}}
+        current = {"scenarios": {"x": {"queries": 3, "latency_ms": {"p50": 15.0, "p95": 20.0}}}}
+        [row] = benchmark.compare(baseline, current)
+        self.assertEqual(row["queries"], (2, 3))
+        self.assertEqual(row["p50"][2], 50.0)
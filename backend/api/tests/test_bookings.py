@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import threading
 from datetime import date, timedelta
 
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
 
-from .. import models
+from .. import models, overlap
 
 
 class BookingModelTests(TestCase):
@@ -65,6 +68,69 @@ class BookingModelTests(TestCase):
         # Should not raise ValidationError
         second.full_clean()
 
+    def test_save_rejects_overlap_with_suite_error(self):
+        models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+        )
+
+        with self.assertRaises(ValidationError) as ctx:
+            models.Booking.objects.create(
+                pet=self.pet,
+                suite=self.suite,
+                start_date=date(2024, 1, 5),
+                end_date=date(2024, 1, 8),
+            )
+        self.assertIn("suite", ctx.exception.message_dict)
+
+    def test_checked_out_bookings_do_not_hold_the_suite(self):
+        models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+            status=models.Booking.Status.CHECKED_OUT,
+        )
+
+        models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 1, 3),
+            end_date=date(2024, 1, 7),
+        )
+
+
+class SuiteLockTests(TestCase):
+    def test_lock_is_exclusive_per_suite(self):
+        held = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def holder():
+            with overlap.suite_lock(1):
+                held.set()
+                release.wait(5)
+                order.append("holder")
+
+        def waiter():
+            with overlap.suite_lock(1):
+                order.append("waiter")
+
+        first = threading.Thread(target=holder)
+        first.start()
+        held.wait(5)
+        second = threading.Thread(target=waiter)
+        second.start()
+        with overlap.suite_lock(2):
+            order.append("other suite")
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(order, ["other suite", "holder", "waiter"])
+
 
 class BookingCurrentEndpointTests(TestCase):
     def setUp(self):
@@ -96,3 +162,59 @@ class BookingCurrentEndpointTests(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["status"], models.Booking.Status.CHECKED_IN)
 
+
+class BookingWriteQueryCountTests(TestCase):
+    """Pin the booking write path so validation is not silently repeated."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user("staff"))
+        self.suite = models.Suite.objects.create(label="Suite 3")
+        owner = models.Owner.objects.create(name="Ann Lee")
+        self.pet = models.Pet.objects.create(owner=owner, name="Scout")
+        # On PostgreSQL the exclusion constraint replaces the overlap query.
+        self.overlap_queries = 0 if overlap.enforced_by_database(connection.alias) else 1
+
+    def test_create_runs_each_check_once(self):
+        payload = {
+            "pet_id": self.pet.id,
+            "suite_id": self.suite.id,
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-04",
+        }
+        # pet lookup, suite lookup, savepoint, [overlap], insert,
+        # occupancy lookup, occupancy insert, release savepoint
+        with self.assertNumQueries(7 + self.overlap_queries):
+            response = self.client.post(reverse("booking-list"), payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_update_runs_each_check_once(self):
+        booking = models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 4),
+        )
+        url = reverse("booking-detail", args=[booking.id])
+        # fetch booking, savepoint, [overlap], update,
+        # occupancy lookup, occupancy insert, release savepoint
+        with self.assertNumQueries(6 + self.overlap_queries):
+            response = self.client.patch(url, {"end_date": "2024-03-06"}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_overlap_is_reported_as_suite_error(self):
+        models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 4),
+        )
+        payload = {
+            "pet_id": self.pet.id,
+            "suite_id": self.suite.id,
+            "start_date": "2024-03-03",
+            "end_date": "2024-03-05",
+        }
+        response = self.client.post(reverse("booking-list"), payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("suite", response.data)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import events, models, overlap
+
+
+class BulkBookingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user("staff"))
+        self.url = reverse("booking-bulk")
+        self.suites = [models.Suite.objects.create(label=f"Suite {n}") for n in range(1, 11)]
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        patcher = mock.patch.object(events, "get_broker")
+        self.broker = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def item(self, suite, start, nights=2, **extra):
+        return {
+            "pet_id": self.pet.id,
+            "suite_id": suite.id,
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=nights)).isoformat(),
+            **extra,
+        }
+
+    def test_creates_a_batch_in_constant_queries(self):
+        payload = [
+            self.item(self.suites[index % 10], date(2024, 12, 1) + timedelta(days=3 * (index // 10)))
+            for index in range(100)
+        ]
+        # pets, suites, savepoint, [overlap], insert, occupancy insert, release savepoint
+        expected = 6 + (0 if overlap.enforced_by_database("default") else 1)
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(expected):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(models.Booking.objects.count(), 100)
+        self.assertEqual(models.SuiteOccupancy.objects.count(), 300)
+        self.assertEqual(response.data[0]["pet"]["name"], "Buddy")
+        self.assertEqual(self.broker.publish.call_count, 100)
+
+    def test_updates_existing_bookings(self):
+        booking = models.Booking.objects.create(
+            pet=self.pet, suite=self.suites[0], start_date=date(2024, 12, 1), end_date=date(2024, 12, 3)
+        )
+        payload = [
+            {"id": booking.id, "suite_id": self.suites[1].id, "status": "checked-in"},
+            self.item(self.suites[0], date(2024, 12, 1)),
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        booking.refresh_from_db()
+        self.assertEqual((booking.suite_id, booking.status), (self.suites[1].id, "checked-in"))
+        self.assertEqual(
+            set(models.SuiteOccupancy.objects.filter(booking=booking).values_list("suite_id", flat=True)),
+            {self.suites[1].id},
+        )
+
+    def test_reports_overlaps_per_item_and_writes_nothing(self):
+        models.Booking.objects.create(
+            pet=self.pet, suite=self.suites[0], start_date=date(2024, 12, 1), end_date=date(2024, 12, 3)
+        )
+        payload = [
+            self.item(self.suites[1], date(2024, 12, 1)),
+            self.item(self.suites[0], date(2024, 12, 3)),  # clashes with the stored booking
+            self.item(self.suites[1], date(2024, 12, 2)),  # clashes with item 0
+            self.item(self.suites[2], date(2024, 12, 5), nights=-1),
+            {**self.item(self.suites[2], date(2024, 12, 9)), "pet_id": 999},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(response.data[1], {"suite": [overlap.OVERLAP_MESSAGE]})
+        self.assertEqual(response.data[2], {"suite": [overlap.OVERLAP_MESSAGE]})
+        self.assertIn("end_date", response.data[3])
+        self.assertIn("pet_id", response.data[4])
+        self.assertEqual(models.Booking.objects.count(), 1)
+
+    def test_rejects_incomplete_creates(self):
+        response = self.client.post(self.url, [{"pet_id": self.pet.id}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data[0]), {"suite_id", "start_date", "end_date"})
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import tempfile
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from houndz.settings.base import cache_config
+
+from .. import caching, metrics, models
+
+
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        metrics.REGISTRY.reset()
+        self.addCleanup(metrics.REGISTRY.reset)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user("staff"))
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+
+    def age_rows(self):
+        # Lists are only cached once their newest change has settled.
+        for model in (models.Suite, models.Owner, models.Pet):
+            model.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def use_shared_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(CACHES={"default": cache_config(f"file://{directory.name}")}))
+
+    def test_suite_list_is_served_from_cache_until_a_suite_changes(self):
+        self.age_rows()
+        url = reverse("suite-list")
+        self.client.get(url)
+        # Only the conditional-GET version lookups (suite + tombstone) remain.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual([row["label"] for row in response.data], ["Suite 1"])
+
+        models.Suite.objects.create(label="Suite 2")
+        response = self.client.get(url)
+        self.assertEqual([row["label"] for row in response.data], ["Suite 1", "Suite 2"])
+
+    def test_lists_follow_writes_made_by_other_workers(self):
+        self.age_rows()
+        url = reverse("suite-list")
+        self.client.get(url)
+        # A queryset update sends no signals, like a write in another worker
+        # whose local cache this one never hears about.
+        models.Suite.objects.update(label="Suite A", updated_at=timezone.now() - timedelta(minutes=30))
+        first = self.client.get(url)
+        self.assertEqual(first.data[0]["label"], "Suite A")
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+
+    def test_owner_changes_retire_cached_pets(self):
+        self.client.get(reverse("pet-list"))
+        self.pet.owner.name = "Jane Smith"
+        self.pet.owner.save()
+        response = self.client.get(reverse("pet-list"))
+        self.assertEqual(response.data[0]["owner"]["name"], "Jane Smith")
+
+    def test_booking_writes_resolve_pets_and_suites_from_cache(self):
+        self.use_shared_cache()
+
+        def create(day):
+            payload = {
+                "pet_id": self.pet.id,
+                "suite_id": self.suite.id,
+                "start_date": date(2024, 3, day).isoformat(),
+                "end_date": date(2024, 3, day + 1).isoformat(),
+            }
+            return self.client.post(reverse("booking-list"), payload, format="json")
+
+        self.assertEqual(create(1).status_code, 201)
+        with CaptureQueriesContext(connection) as queries:
+            response = create(10)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["pet"]["owner"]["name"], "Jane Doe")
+        # Saving the first booking left the pet and suite lookups cached.
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('FROM "api_pet"', sql)
+        self.assertNotIn('FROM "api_suite"', sql)
+        self.assertIn(
+            'houndz_cache_lookups_total{namespace="pet",result="hit"} 1', metrics.REGISTRY.render()
+        )
+
+    def test_per_worker_caches_are_not_used_for_lookups(self):
+        caching.PETS.lookup(models.Pet.objects.all(), [self.pet.id])
+        models.Pet.objects.filter(pk=self.pet.id).delete()
+        self.assertEqual(caching.PETS.lookup(models.Pet.objects.all(), [self.pet.id]), {})
+
+    def test_deleted_rows_are_not_resolved_from_cache(self):
+        self.use_shared_cache()
+        caching.PETS.lookup(models.Pet.objects.all(), [self.pet.id])
+        pet_id = self.pet.id
+        self.pet.delete()
+        self.assertEqual(caching.PETS.lookup(models.Pet.objects.all(), [pet_id]), {})
+
+    def test_bulk_writers_invalidate_explicitly(self):
+        key = caching.SUITE_LIST.key("all")
+        caching.SUITE_LIST.set(key, ["stale"])
+        models.Suite.objects.bulk_create([models.Suite(label="Suite 2")])
+        self.assertEqual(caching.SUITE_LIST.get(caching.SUITE_LIST.key("all")), ["stale"])
+        caching.invalidate(models.Suite)
+        self.assertIsNone(caching.SUITE_LIST.get(caching.SUITE_LIST.key("all")))
+
+
+class CacheConfigTests(SimpleTestCase):
+    def test_parses_supported_urls(self):
+        self.assertEqual(cache_config("locmem://")["LOCATION"], "houndz")
+        self.assertEqual(cache_config("file:///var/cache/houndz")["LOCATION"], "/var/cache/houndz")
+        redis = cache_config("redis://localhost:6379/1")
+        self.assertEqual(redis["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(redis["LOCATION"], "redis://localhost:6379/1")
+        with self.assertRaises(ImproperlyConfigured):
+            cache_config("memcached://localhost")
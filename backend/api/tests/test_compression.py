@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import gzip
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import compression, models
+
+
+class AcceptEncodingTests(SimpleTestCase):
+    def test_honours_quality_values(self):
+        self.assertEqual(compression.accepted_encodings("gzip, deflate;q=0.5, br;q=0"), {"gzip", "deflate"})
+        self.assertIsNone(compression.choose_encoding("identity"))
+        self.assertEqual(compression.choose_encoding("br;q=0, gzip"), "gzip")
+        self.assertEqual(compression.choose_encoding("gzip, br", streaming=True), "gzip")
+
+
+@skipUnless(settings.COMPRESSION_ENABLED, "HOUNDZ_COMPRESSION is off")
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        models.Suite.objects.bulk_create(models.Suite(label=f"Suite {n}", notes="Quiet") for n in range(40))
+        models.Suite.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.url = reverse("suite-list")
+
+    def get(self, encoding="", **headers):
+        return self.client.get(self.url, HTTP_ACCEPT="application/json", HTTP_ACCEPT_ENCODING=encoding, **headers)
+
+    def test_gzips_large_json_for_clients_that_accept_it(self):
+        plain = self.get()
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        response = self.get("gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(int(response["Content-Length"]), len(plain.content))
+
+    @skipUnless(compression.brotli, "needs the brotli package")
+    def test_prefers_brotli(self):
+        response = self.get("gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(compression.brotli.decompress(response.content), self.get().content)
+
+    def test_compressed_polls_still_revalidate(self):
+        response = self.get("gzip")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertEqual(self.get("gzip", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_leaves_small_and_html_responses_alone(self):
+        suite = models.Suite.objects.first()
+        small = self.client.get(reverse("suite-detail", args=[suite.pk]), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(small.has_header("Content-Encoding"))
+        html = self.client.get(self.url, HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(html.has_header("Content-Encoding"))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .. import models
+
+
+class ConditionalTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        today = timezone.localdate()
+        self.booking = models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=today - timedelta(days=1),
+            end_date=today + timedelta(days=1),
+            status=models.Booking.Status.CHECKED_IN,
+        )
+        self.age_rows(timedelta(hours=1))
+
+    def age_rows(self, age):
+        # Validators are only issued once the newest change has settled.
+        for model in (models.Suite, models.Owner, models.Pet, models.Booking):
+            model.objects.update(updated_at=timezone.now() - age)
+
+
+class ConditionalListTests(ConditionalTestCase):
+    def test_unchanged_list_returns_304_without_serializing(self):
+        url = reverse("booking-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # One MAX() per rendered model plus one for tombstones; no row fetch.
+        with self.assertNumQueries(5):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_query_string(self):
+        url = reverse("suite-list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changes_and_deletes_invalidate_the_etag(self):
+        url = reverse("pet-list")
+        etag = self.client.get(url)["ETag"]
+
+        self.pet.owner.name = "Jane Smith"
+        self.pet.owner.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # A change this recent is not trusted for validation yet.
+        self.assertNotIn("ETag", response)
+
+        self.age_rows(timedelta(minutes=30))
+        etag = self.client.get(url)["ETag"]
+        models.Tombstone.objects.create(model="pet", object_id=999)
+        models.Tombstone.objects.update(deleted_at=timezone.now() - timedelta(minutes=10))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        url = reverse("owner-list")
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(CURRENT_BOOKINGS_CACHE_SECONDS=60)
+class CurrentBookingsCacheTests(ConditionalTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        super().setUp()
+        self.url = reverse("booking-current")
+
+    def test_cached_payload_skips_the_booking_query(self):
+        first = self.client.get(self.url)
+        self.assertEqual([row["id"] for row in first.data], [self.booking.id])
+        with self.assertNumQueries(5):
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+
+    def test_follows_writes_made_by_other_workers(self):
+        self.client.get(self.url)
+        # No signals, as for a write in a worker with its own local cache.
+        models.Booking.objects.update(
+            status=models.Booking.Status.CHECKED_OUT, updated_at=timezone.now() - timedelta(minutes=30)
+        )
+        self.assertEqual(self.client.get(self.url).data, [])
+
+    def test_saves_invalidate_after_commit(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.status = models.Booking.Status.CHECKED_OUT
+            self.booking.save()
+        self.assertEqual(self.client.get(self.url).data, [])
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import models
+
+DAY = date(2024, 7, 10)
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        self.suites = [models.Suite.objects.create(label=f"Suite {n}") for n in range(1, 5)]
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pets = [models.Pet.objects.create(owner=owner, name=name) for name in ("A", "B", "C", "D")]
+
+        def book(index, start, end, status, bathed=False):
+            return models.Booking.objects.create(
+                pet=self.pets[index],
+                suite=self.suites[index],
+                start_date=DAY + timedelta(days=start),
+                end_date=DAY + timedelta(days=end),
+                status=status,
+                bathed=bathed,
+            )
+
+        Status = models.Booking.Status
+        self.arriving = book(0, 0, 3, Status.BOOKED)
+        self.leaving = book(1, -2, 0, Status.CHECKED_IN)
+        self.staying = book(2, -1, 4, Status.CHECKED_IN, bathed=True)
+        self.left = book(3, -5, -1, Status.CHECKED_OUT)
+        self.future = book(3, 2, 8, Status.BOOKED)
+
+    def test_summarizes_the_day_in_bounded_queries(self):
+        # 5 conditional-GET version lookups + counts, rows, suites, forecast.
+        with self.assertNumQueries(9):
+            response = self.client.get(reverse("dashboard-list"), {"date": DAY.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        self.assertEqual(
+            data["counts"], {"arrivals": 1, "departures": 1, "in_house": 2, "bath_pending": 1}
+        )
+        self.assertEqual([row["id"] for row in data["arrivals"]], [self.arriving.id])
+        self.assertEqual([row["id"] for row in data["departures"]], [self.leaving.id])
+        self.assertEqual([row["id"] for row in data["bath_pending"]], [self.leaving.id])
+        self.assertEqual(data["departures"][0]["pet"]["name"], "B")
+        self.assertEqual(data["departures"][0]["owner_name"], "Jane Doe")
+        self.assertEqual(data["departures"][0]["suite"]["label"], "Suite 2")
+
+        forecast = data["forecast"]
+        self.assertEqual(len(forecast), 7)
+        self.assertEqual(forecast[0], {"date": "2024-07-10", "occupied": 3, "free": 1})
+        self.assertEqual([night["occupied"] for night in forecast], [3, 2, 3, 3, 2, 1, 1])
+
+    def test_query_count_does_not_grow_with_history(self):
+        for year in range(2015, 2024):
+            models.Booking.objects.create(
+                pet=self.pets[0],
+                suite=self.suites[0],
+                start_date=date(year, 7, 8),
+                end_date=date(year, 7, 12),
+                status=models.Booking.Status.CHECKED_OUT,
+            )
+        with self.assertNumQueries(9):
+            self.client.get(reverse("dashboard-list"), {"date": DAY.isoformat()})
+
+    def test_rejects_bad_dates(self):
+        response = self.client.get(reverse("dashboard-list"), {"date": "2024-13-01"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("date", response.json())
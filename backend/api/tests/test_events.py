@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from .. import events, models
+
+
+class LocalBrokerTests(TestCase):
+    def test_fans_out_to_subscribers(self):
+        broker = events.LocalBroker()
+
+        async def scenario():
+            async with broker.subscribe() as first, broker.subscribe() as second:
+                broker.publish({"op": "upsert", "id": 1})
+                return await first.get(timeout=1), await second.get(timeout=1)
+
+        self.assertEqual(async_to_sync(scenario)(), ({"op": "upsert", "id": 1},) * 2)
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        broker = events.LocalBroker()
+        broker.max_pending = 2
+
+        async def scenario():
+            async with broker.subscribe() as subscription:
+                for index in range(3):
+                    broker.publish({"op": "upsert", "id": index})
+                return await subscription.get(timeout=1), await subscription.get(timeout=0.01)
+
+        self.assertEqual(async_to_sync(scenario)(), (events.RESYNC_EVENT, None))
+
+
+class PostgresBrokerTests(TestCase):
+    def notified(self, event: dict) -> dict:
+        with mock.patch.object(events, "connection") as connection:
+            events.PostgresBroker().publish(event)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        [(_, (channel, payload))] = [call.args for call in cursor.execute.call_args_list]
+        self.assertEqual(channel, events.PostgresBroker.channel)
+        return json.loads(payload)
+
+    def test_notifies_the_event(self):
+        event = {"collection": "bookings", "op": "upsert", "id": 1, "data": {"notes": "Hi"}}
+        self.assertEqual(self.notified(event), event)
+
+    def test_oversized_events_become_a_resync(self):
+        event = {"collection": "bookings", "op": "upsert", "id": 1, "data": {"notes": "é" * 4000}}
+        self.assertEqual(self.notified(event), events.RESYNC_EVENT)
+
+
+class ChangePublishingTests(TestCase):
+    def setUp(self):
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        self.broker = mock.Mock()
+        patcher = mock.patch.object(events, "get_broker", return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_save_publishes_serialized_row_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = models.Booking.objects.create(
+                pet=self.pet,
+                suite=self.suite,
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 1, 5),
+            )
+            self.broker.publish.assert_not_called()
+
+        event = self.broker.publish.call_args.args[0]
+        self.assertEqual(event["collection"], "bookings")
+        self.assertEqual(event["op"], "upsert")
+        self.assertEqual(event["data"]["id"], booking.id)
+        self.assertEqual(event["data"]["pet"]["name"], "Buddy")
+
+    def test_delete_publishes_id(self):
+        suite_id = self.suite.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.suite.delete()
+
+        self.broker.publish.assert_called_once_with(
+            {"collection": "suites", "op": "delete", "id": suite_id}
+        )
+
+
+class ChangeFeedEndpointTests(TestCase):
+    def test_refuses_to_stream_from_a_sync_worker(self):
+        response = self.client.get(reverse("change-feed"))
+        self.assertEqual(response.status_code, 503)
+
+    @override_settings(CHANGE_FEED_MAX_SECONDS=1, CHANGE_FEED_HEARTBEAT_SECONDS=1)
+    def test_streams_published_events(self):
+        broker = events.LocalBroker()
+
+        async def scenario():
+            with mock.patch.object(events, "get_broker", return_value=broker):
+                response = await AsyncClient().get(reverse("change-feed"))
+            chunks = aiter(response.streaming_content)
+            preamble = await anext(chunks)
+            broker.publish({"collection": "suites", "op": "delete", "id": 7})
+            chunk = await anext(chunks)
+            # Drain to the max age so the stream unsubscribes inside this
+            # loop, not when async_to_sync finalizes leftover generators.
+            async for _ in chunks:
+                pass
+            return response, preamble, chunk
+
+        response, preamble, chunk = async_to_sync(scenario)()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(preamble.startswith(b"retry:"))
+        _, data = chunk.decode().strip().split("\n")
+        self.assertEqual(json.loads(data.removeprefix("data: "))["id"], 7)
+
+    @override_settings(CHANGE_FEED_MAX_SECONDS=0)
+    def test_stream_ends_at_max_age_and_unsubscribes(self):
+        broker = events.LocalBroker()
+
+        async def scenario():
+            with mock.patch.object(events, "get_broker", return_value=broker):
+                response = await AsyncClient().get(reverse("change-feed"))
+            return [chunk async for chunk in response.streaming_content]
+
+        self.assertEqual(async_to_sync(scenario)(), [b"retry: 5000\n\n"])
+        self.assertFalse(broker._subscribers)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+
+from .. import fastjson, models, serializers
+
+
+class FastJSONRendererTests(TestCase):
+    def assertSameAsDRF(self, data, media_type=None, context=None):
+        expected = renderers.JSONRenderer().render(data, media_type, context)
+        self.assertEqual(fastjson.JSONRenderer().render(data, media_type, context), expected)
+
+    def test_matches_drf_byte_for_byte(self):
+        owner = models.Owner.objects.create(name="Zoë\u2028Line")
+        pet = models.Pet.objects.create(owner=owner, name="Buddy", weight_kg=Decimal("12.50"))
+        suite = models.Suite.objects.create(label="Suite 1")
+        models.Booking.objects.create(pet=pet, suite=suite, start_date=date(2024, 5, 1), end_date=date(2024, 5, 4))
+
+        self.assertSameAsDRF(serializers.PetSerializer(models.Pet.objects.all(), many=True).data)
+        self.assertSameAsDRF(serializers.BookingSerializer(models.Booking.objects.all(), many=True).data)
+        self.assertSameAsDRF(
+            {
+                "weight": Decimal("12.50"),
+                "at": datetime(2024, 5, 1, 8, 30, 15, 250000, tzinfo=timezone.utc),
+                "local": datetime(2024, 5, 1, 8, 30, tzinfo=timezone(timedelta(hours=2))),
+                "day": date(2024, 5, 1),
+                "length": timedelta(hours=36),
+                "id": uuid.UUID(int=1),
+                "label": gettext_lazy("Suite"),
+                1: models.Suite.objects.values_list("label", flat=True),
+            }
+        )
+
+    def test_integers_orjson_refuses_fall_back_to_drf(self):
+        self.assertSameAsDRF({"ids": [2**64, -(2**63) - 1], "label": "Suite\u2028 1"})
+        with self.assertRaises(TypeError):
+            fastjson.dumps({"suite": object()})
+
+    def test_indented_output_falls_back_to_drf(self):
+        data = {"pets": [{"name": "Buddy"}]}
+        self.assertSameAsDRF(data, "application/json; indent=2")
+        self.assertSameAsDRF(data, None, {"indent": 4})
+
+    def test_api_responses_use_it(self):
+        models.Suite.objects.create(label="Suite 1")
+        response = self.client.get(reverse("suite-list"), HTTP_ACCEPT="application/json")
+        self.assertIsInstance(response.accepted_renderer, fastjson.JSONRenderer)
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body: bytes):
+        return fastjson.JSONParser().parse(BytesIO(body), "application/json", {"encoding": "utf-8"})
+
+    def test_parses_utf8_json(self):
+        self.assertEqual(self.parse('{"name": "Zoë", "weight_kg": 12.5}'.encode()), {"name": "Zoë", "weight_kg": 12.5})
+
+    def test_rejects_malformed_and_non_finite_input(self):
+        for body in (b'{"name": ', b'{"weight_kg": NaN}'):
+            with self.subTest(body=body), self.assertRaisesMessage(ParseError, "JSON parse error"):
+                self.parse(body)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from .. import intervals, models
+
+DAY = date(2024, 3, 1)
+
+
+class IntervalIndexTests(TestCase):
+    def setUp(self):
+        self.suites = [models.Suite.objects.create(label=f"Suite {n}") for n in range(1, 5)]
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=owner, name="Buddy")
+
+    def book(self, suite, start, nights, status=models.Booking.Status.BOOKED):
+        return models.Booking(
+            pet=self.pet,
+            suite=suite,
+            start_date=DAY + timedelta(days=start),
+            end_date=DAY + timedelta(days=start + nights),
+            status=status,
+        )
+
+    def ids(self, queryset) -> set[int]:
+        return set(queryset.values_list("id", flat=True))
+
+    def plain(self, start, end, suites=None) -> set[int]:
+        queryset = models.Booking.objects.filter(
+            status__in=models.Booking.ACTIVE_STATUSES, start_date__lte=end, end_date__gte=start
+        )
+        if suites is not None:
+            queryset = queryset.filter(suite_id__in=suites)
+        return self.ids(queryset)
+
+    def test_uses_the_backend_index(self):
+        expected = {"postgresql": "gist", "sqlite": "rtree"}.get(connection.vendor, "btree")
+        self.assertEqual(intervals.strategy("default"), expected)
+
+    def test_matches_plain_range_filters(self):
+        rng = random.Random(3)
+        statuses = [*models.Booking.Status.values]
+        # Overlaps are fine here: bulk_create skips validation.
+        models.Booking.objects.bulk_create(
+            self.book(rng.choice(self.suites), rng.randrange(200), rng.randrange(10), rng.choice(statuses))
+            for _ in range(400)
+        )
+        for _ in range(50):
+            start = DAY + timedelta(days=rng.randrange(-10, 220))
+            end = start + timedelta(days=rng.randrange(5))
+            suites = {suite.id for suite in rng.sample(self.suites, 2)}
+            everywhere = intervals.overlapping(models.Booking.objects.all(), start, end)
+            self.assertEqual(self.ids(everywhere), self.plain(start, end))
+            some = intervals.overlapping(models.Booking.objects.all(), start, end, suites)
+            self.assertEqual(self.ids(some), self.plain(start, end, suites))
+            self.assertEqual(self.ids(intervals.on(models.Booking.objects.all(), start)), self.plain(start, start))
+
+    def test_follows_updates_and_deletes(self):
+        booking = self.book(self.suites[0], 0, 3)
+        booking.save()
+        queryset = models.Booking.objects.all()
+        self.assertEqual(self.ids(intervals.on(queryset, DAY + timedelta(days=3))), {booking.id})
+
+        booking.start_date, booking.end_date = DAY + timedelta(days=10), DAY + timedelta(days=12)
+        booking.save()
+        self.assertEqual(self.ids(intervals.on(queryset, DAY)), set())
+        self.assertEqual(self.ids(intervals.on(queryset, DAY + timedelta(days=11))), {booking.id})
+
+        models.Booking.objects.filter(pk=booking.pk).update(status=models.Booking.Status.CHECKED_OUT)
+        self.assertEqual(self.ids(intervals.on(queryset, DAY + timedelta(days=11))), set())
+        models.Booking.objects.filter(pk=booking.pk).update(status=models.Booking.Status.CHECKED_IN)
+        self.assertEqual(self.ids(intervals.on(queryset, DAY + timedelta(days=11))), {booking.id})
+
+        booking.delete()
+        self.assertEqual(self.ids(intervals.on(queryset, DAY + timedelta(days=11))), set())
+
+    @skipUnless(connection.vendor == "sqlite", "the R*Tree is SQLite-only")
+    def test_lost_triggers_fall_back_until_rebuilt(self):
+        if intervals.strategy("default") != "rtree":
+            self.skipTest("SQLite built without R*Tree")
+        # What a table rebuild by a later migration does to the triggers.
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER api_booking_interval_insert")
+        booking = models.Booking.objects.bulk_create([self.book(self.suites[0], 0, 3)])[0]
+
+        with mock.patch.dict(intervals._has_rtree, clear=True):
+            self.assertEqual(intervals.strategy("default"), "btree")
+            [warning] = intervals.check_rtree(databases=["default"])
+            self.assertEqual(warning.id, "api.W001")
+            self.assertEqual(self.ids(intervals.on(models.Booking.objects.all(), DAY)), {booking.id})
+
+            call_command("rebuild_intervals", stdout=StringIO())
+            self.assertEqual(intervals.strategy("default"), "rtree")
+            self.assertEqual(intervals.check_rtree(databases=["default"]), [])
+            self.assertEqual(self.ids(intervals.on(models.Booking.objects.all(), DAY)), {booking.id})
+
+    @skipUnless(connection.vendor == "sqlite", "the R*Tree is SQLite-only")
+    def test_check_reports_a_stale_index(self):
+        if intervals.strategy("default") != "rtree":
+            self.skipTest("SQLite built without R*Tree")
+        models.Booking.objects.bulk_create([self.book(self.suites[0], 0, 3)])
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {intervals.RTREE_TABLE}")
+        [error] = intervals.check_rtree(databases=["default"])
+        self.assertEqual(error.id, "api.E001")
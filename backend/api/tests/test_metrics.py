@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import metrics, models
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_TOKEN="")
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        self.addCleanup(metrics.REGISTRY.reset)
+        suite = models.Suite.objects.create(label="Suite 1")
+        owner = models.Owner.objects.create(name="Jane Doe")
+        pet = models.Pet.objects.create(owner=owner, name="Buddy")
+        models.Booking.objects.create(
+            pet=pet, suite=suite, start_date=date(2024, 1, 1), end_date=date(2024, 1, 5)
+        )
+
+    def test_records_requests_queries_and_serializer_time_per_view(self):
+        with self.assertLogs("api.metrics", level="INFO") as logs:
+            self.client.get(reverse("booking-list"))
+            self.client.get(reverse("suite-list"), {"fields": "id"})
+        self.assertIn("endpoint=booking-list action=list method=GET status=200", logs.output[0])
+
+        body = self.client.get("/metrics").content.decode()
+        self.assertIn(
+            'houndz_requests_total{endpoint="booking-list",action="list",method="GET",status="200"} 1',
+            body,
+        )
+        self.assertIn(
+            'houndz_request_duration_seconds_count{endpoint="suite-list",action="list"} 1', body
+        )
+        # 5 conditional-GET version lookups + the list itself.
+        self.assertIn('houndz_db_queries_total{endpoint="booking-list",action="list"} 6', body)
+        serializer_line = next(
+            line for line in body.splitlines()
+            if line.startswith('houndz_serializer_seconds_total{endpoint="suite-list"')
+        )
+        self.assertGreater(float(serializer_line.split()[-1]), 0)
+
+    @override_settings(METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_only_counted(self):
+        self.client.get(reverse("booking-list"))
+        body = self.client.get("/metrics").content.decode()
+        self.assertIn('houndz_requests_total{endpoint="booking-list"', body)
+        self.assertNotIn('houndz_db_queries_total{endpoint="booking-list"', body)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_protects_the_endpoint(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from unittest import mock, skipUnless
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from .. import metrics
+
+SETTINGS = {
+    "ENGINE": "api.postgres",
+    "NAME": "houndz",
+    "USER": "houndz",
+    "PASSWORD": "",
+    "HOST": "localhost",
+    "PORT": "",
+    "ATOMIC_REQUESTS": False,
+    "AUTOCOMMIT": True,
+    "CONN_MAX_AGE": 0,
+    "CONN_HEALTH_CHECKS": True,
+    "TIME_ZONE": None,
+    "TEST": {},
+}
+
+
+@skipUnless(find_spec("psycopg") and find_spec("psycopg_pool"), "needs psycopg and psycopg_pool")
+class ConnectionPoolTests(SimpleTestCase):
+    def wrapper(self, **overrides):
+        from ..postgres.base import DatabaseWrapper
+
+        wrapper = DatabaseWrapper({**SETTINGS, **overrides}, "pooled")
+        self.addCleanup(wrapper.close_pool)
+        return wrapper
+
+    def test_builds_an_unopened_pool_from_options(self):
+        wrapper = self.wrapper(OPTIONS={"pool": {"min_size": 0, "max_size": 3, "timeout": 2}})
+        pool = wrapper.pool
+        self.assertIs(wrapper.pool, pool)
+        self.assertEqual((pool.min_size, pool.max_size, pool.timeout), (0, 3, 2))
+        self.assertTrue(pool.closed)
+        self.assertEqual(pool.kwargs["dbname"], "houndz")
+        self.assertTrue(pool.kwargs["autocommit"])
+        self.assertNotIn("pool", pool.kwargs)
+        self.assertNotIn("pool", wrapper.get_connection_params())
+
+        lines = []
+        metrics._pool_metrics(lines, [wrapper])
+        self.assertIn('houndz_db_pool_max_connections{database="pooled"} 3', lines)
+        self.assertIn('houndz_db_pool_wait_seconds_total{database="pooled"} 0.000000', lines)
+
+    def test_needs_conn_max_age_zero(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.wrapper(OPTIONS={"pool": True}, CONN_MAX_AGE=600).pool
+
+    def test_pooling_is_optional(self):
+        self.assertIsNone(self.wrapper(OPTIONS={}).pool)
+
+    def test_closes_the_pool_before_dropping_the_test_database(self):
+        from django.db.backends.postgresql import creation
+
+        wrapper = self.wrapper(OPTIONS={"pool": True})
+        pool = wrapper.pool
+        with mock.patch.object(creation.DatabaseCreation, "_destroy_test_db") as destroy:
+            destroy.side_effect = lambda *args: self.assertTrue(pool.closed)
+            wrapper.creation._destroy_test_db("test_houndz", 0)
+        destroy.assert_called_once_with("test_houndz", 0)
+        self.assertIsNot(wrapper.pool, pool)
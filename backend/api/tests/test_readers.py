@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .. import models, readers, serializers
+
+
+class BookingValuesReaderTests(TestCase):
+    def setUp(self):
+        owner = models.Owner.objects.create(name="Zoë Åberg", phone="555-0100", email="z@example.com")
+        pets = [
+            models.Pet.objects.create(owner=owner, name="Buddy", weight_kg=Decimal("12.5")),
+            models.Pet.objects.create(
+                owner=owner, name="Rex", breed="Collie", special_needs=["meds", {"diet": "raw"}]
+            ),
+        ]
+        suites = [models.Suite.objects.create(label=f"Suite {n}", notes="quiet") for n in (1, 2)]
+        for index, (pet, suite) in enumerate(zip(pets, suites)):
+            models.Booking.objects.create(
+                pet=pet,
+                suite=suite,
+                start_date=date(2024, 1, 1 + index),
+                end_date=date(2024, 1, 5 + index),
+                status=models.Booking.Status.CHECKED_IN if index else models.Booking.Status.BOOKED,
+                bathed=bool(index),
+                notes="Needs \"extra\" walks\n",
+            )
+        self.queryset = models.Booking.objects.select_related("pet", "pet__owner", "suite").order_by("id")
+        self.reader = readers.ValuesReader(serializers.BookingSerializer)
+
+    def assert_same_json(self):
+        expected = JSONRenderer().render(serializers.BookingSerializer(self.queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(self.reader.render(self.queryset)), expected)
+
+    def test_matches_serializer_byte_for_byte(self):
+        self.assert_same_json()
+
+    @override_settings(TIME_ZONE="UTC")
+    def test_matches_serializer_in_utc(self):
+        self.assert_same_json()
+
+    def test_list_endpoint_renders_the_serializer_shape(self):
+        response = APIClient().get(reverse("booking-list"))
+        expected = serializers.BookingSerializer(
+            models.Booking.objects.select_related("pet", "pet__owner", "suite").order_by("start_date"),
+            many=True,
+        ).data
+        self.assertEqual(response.content, JSONRenderer().render(expected))
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import events, models, scheduling
+
+DAY = date(2024, 8, 1)
+
+
+def day(offset: int) -> date:
+    return DAY + timedelta(days=offset)
+
+
+class SuiteIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.small = scheduling.SuiteInfo(1, "A", Decimal("15"))
+        self.large = scheduling.SuiteInfo(2, "B", None, frozenset({"No stairs"}))
+
+    def test_gaps_and_overlaps(self):
+        index = scheduling.SuiteIndex([self.small], [(1, day(0), day(2)), (1, day(8), day(9))])
+        self.assertEqual(index.gaps(1, day(4), day(5)), (1, 2))
+        self.assertEqual(index.gaps(1, day(3), day(7)), (0, 0))
+        self.assertIsNone(index.gaps(1, day(2), day(4)))  # shares the night of day 2
+        self.assertIsNone(index.gaps(1, day(-5), day(20)))
+        self.assertEqual(index.gaps(1, day(11), day(12)), (1, None))
+
+    def test_prefers_the_tightest_fit(self):
+        # A short stay that exactly fills A's gap leaves B free for long stays.
+        index = scheduling.SuiteIndex(
+            [self.small, self.large], [(1, day(0), day(2)), (1, day(8), day(9))]
+        )
+        ranked = index.rank(scheduling.Stay(day(3), day(7)))
+        self.assertEqual([assignment.suite.id for assignment in ranked], [1, 2])
+        self.assertEqual(ranked[0].gaps, (0, 0))
+
+    def test_respects_weight_and_features(self):
+        index = scheduling.SuiteIndex([self.small, self.large])
+        heavy = scheduling.Stay(day(0), day(1), Decimal("30"))
+        self.assertEqual([a.suite.id for a in index.rank(heavy)], [2])
+        ground_floor = scheduling.Stay(day(0), day(1), features=frozenset({"No stairs"}))
+        self.assertEqual([a.suite.id for a in index.rank(ground_floor)], [2])
+        # Among equally free suites, the smallest one that fits wins.
+        self.assertEqual(index.rank(scheduling.Stay(day(0), day(1)))[0].suite.id, 1)
+
+    def test_explains_unplaceable_stays(self):
+        index = scheduling.SuiteIndex([self.small], [(1, day(0), day(5))])
+        self.assertEqual(
+            index.explain(scheduling.Stay(day(0), day(1), Decimal("40"))),
+            "No suite takes a dog over 40 kg.",
+        )
+        self.assertEqual(
+            index.explain(scheduling.Stay(day(0), day(1), features=frozenset({"Pool"}))),
+            "No suite offers: Pool.",
+        )
+        self.assertEqual(index.explain(scheduling.Stay(day(0), day(1))), scheduling.NO_FREE_SUITE)
+
+    def test_pack_never_double_books(self):
+        rng = random.Random(7)
+        suites = [scheduling.SuiteInfo(n, f"Suite {n:02}") for n in range(13)]
+        stays = []
+        for _ in range(1000):
+            start = day(rng.randrange(730))
+            stays.append(scheduling.Stay(start, start + timedelta(days=rng.choice((1, 2, 3, 7, 14)))))
+        results = scheduling.SuiteIndex(suites).pack(stays)
+
+        self.assertEqual(len(results), len(stays))
+        nights = set()
+        for stay, result in zip(stays, results):
+            if result.suite is None:
+                self.assertEqual(result.reason, scheduling.NO_FREE_SUITE)
+                continue
+            for offset in range(stay.nights):
+                cell = (result.suite.id, stay.start + timedelta(days=offset))
+                self.assertNotIn(cell, nights)
+                nights.add(cell)
+        self.assertGreater(sum(result.suite is not None for result in results), 900)
+
+    def test_pack_places_constrained_and_long_stays_first(self):
+        suites = [self.small, self.large]
+        stays = [
+            scheduling.Stay(day(0), day(1)),
+            scheduling.Stay(day(0), day(1), Decimal("30")),
+        ]
+        results = scheduling.SuiteIndex(suites).pack(stays)
+        self.assertEqual([result.suite.id for result in results], [1, 2])
+
+
+class SuiteAssignmentApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user("staff"))
+        self.small = models.Suite.objects.create(label="Suite 1", max_weight_kg=Decimal("15"))
+        self.large = models.Suite.objects.create(label="Suite 2", features=["No stairs"])
+        owner = models.Owner.objects.create(name="Jane Doe")
+        self.pup = models.Pet.objects.create(owner=owner, name="Pip", weight_kg=Decimal("6"))
+        self.senior = models.Pet.objects.create(
+            owner=owner, name="Rex", weight_kg=Decimal("12"), special_needs=["No stairs", "Soft food"]
+        )
+        models.Booking.objects.create(
+            pet=self.pup, suite=self.small, start_date=day(0), end_date=day(2)
+        )
+        patcher = mock.patch.object(events, "get_broker")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_suggest_ranks_free_suites(self):
+        # suites, pet, bookings around the dates
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse("booking-suggest"),
+                {"pet_id": self.pup.id, "start_date": day(3).isoformat(), "end_date": day(5).isoformat()},
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [row["suite"]["label"] for row in response.data["suggestions"]], ["Suite 1", "Suite 2"]
+        )
+        self.assertEqual(response.data["suggestions"][0]["free_nights_before"], 0)
+
+    def test_suggest_applies_pet_needs_that_suites_offer(self):
+        response = self.client.get(
+            reverse("booking-suggest"),
+            {"pet_id": self.senior.id, "start_date": day(3).isoformat(), "end_date": day(5).isoformat()},
+        )
+        # "Soft food" is a care note: no suite lists it as a feature.
+        self.assertEqual(response.data["required_features"], ["No stairs"])
+        self.assertEqual([row["suite"]["label"] for row in response.data["suggestions"]], ["Suite 2"])
+
+    def test_suggest_explains_when_nothing_fits(self):
+        response = self.client.get(
+            reverse("booking-suggest"),
+            {
+                "pet_id": self.pup.id,
+                "start_date": day(0).isoformat(),
+                "end_date": day(1).isoformat(),
+                "features": ["Pool"],
+            },
+        )
+        self.assertEqual(response.data["suggestions"], [])
+        self.assertEqual(response.data["reason"], "No suite offers: Pool.")
+
+    def test_suggest_validates_input(self):
+        response = self.client.get(
+            reverse("booking-suggest"),
+            {"pet_id": 999, "start_date": day(3).isoformat(), "end_date": day(1).isoformat()},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("end_date", response.data)
+        response = self.client.get(
+            reverse("booking-suggest"),
+            {"pet_id": 999, "start_date": day(3).isoformat(), "end_date": day(4).isoformat()},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("pet_id", response.data)
+
+    def test_assign_plans_without_saving(self):
+        payload = {
+            "requests": [
+                {"pet_id": self.pup.id, "start_date": day(0).isoformat(), "end_date": day(1).isoformat()},
+                {"pet_id": self.pup.id, "start_date": day(0).isoformat(), "end_date": day(1).isoformat()},
+            ]
+        }
+        response = self.client.post(reverse("booking-assign"), payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["assignments"][0]["suite"]["label"], "Suite 2")
+        self.assertEqual(response.data["assignments"][1], {"suite": None, "reason": scheduling.NO_FREE_SUITE})
+        self.assertEqual(models.Booking.objects.count(), 1)
+
+    def test_assign_saves_the_stays_that_fit(self):
+        payload = {
+            "save": True,
+            "requests": [
+                {"pet_id": self.senior.id, "start_date": day(3).isoformat(), "end_date": day(9).isoformat()},
+                {"pet_id": self.pup.id, "start_date": day(3).isoformat(), "end_date": day(4).isoformat()},
+            ],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("booking-assign"), payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        saved = models.Booking.objects.in_bulk(
+            [row["booking_id"] for row in response.data["assignments"]]
+        )
+        self.assertEqual(
+            sorted((booking.pet_id, booking.suite_id) for booking in saved.values()),
+            sorted([(self.senior.id, self.large.id), (self.pup.id, self.small.id)]),
+        )
+        self.assertEqual(models.SuiteOccupancy.objects.count(), 3 + 7 + 2)
+
+    def test_assign_reports_unknown_pets_per_request(self):
+        payload = {
+            "requests": [
+                {"pet_id": self.pup.id, "start_date": day(3).isoformat(), "end_date": day(4).isoformat()},
+                {"pet_id": 999, "start_date": day(3).isoformat(), "end_date": day(4).isoformat()},
+            ]
+        }
+        response = self.client.post(reverse("booking-assign"), payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["requests"][0], {})
+        self.assertIn("pet_id", response.data["requests"][1])
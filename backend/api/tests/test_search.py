@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import models, search
+
+DAY = date(2024, 5, 1)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        self.jane = models.Owner.objects.create(name="Jane Doe", phone="555-0101", email="jane@example.com")
+        self.john = models.Owner.objects.create(name="John Smith", phone="555-0202")
+        self.buddy = models.Pet.objects.create(owner=self.jane, name="Buddy", breed="Beagle")
+        self.rex = models.Pet.objects.create(owner=self.john, name="Rex", breed="Doberman")
+        self.stay = models.Booking.objects.create(
+            pet=self.buddy, suite=self.suite, start_date=DAY, end_date=DAY + timedelta(days=3)
+        )
+        models.Booking.objects.create(
+            pet=self.buddy,
+            suite=self.suite,
+            start_date=DAY - timedelta(days=10),
+            end_date=DAY - timedelta(days=8),
+            status=models.Booking.Status.CHECKED_OUT,
+        )
+
+    def hits(self, query, **kwargs):
+        return [(row["type"], row["id"]) for row in search.search(query, **kwargs)]
+
+    def test_uses_the_backend_index(self):
+        expected = {"postgresql": "trigram", "sqlite": "fts5"}.get(connection.vendor, "like")
+        self.assertEqual(search.strategy("default"), expected)
+
+    def test_matches_every_word_across_fields(self):
+        self.assertEqual(self.hits("jane"), [("owner", self.jane.id), ("pet", self.buddy.id)])
+        self.assertEqual(self.hits("beag"), [("pet", self.buddy.id)])
+        self.assertEqual(self.hits("0202"), [("owner", self.john.id)])
+        self.assertEqual(self.hits("jane exam"), [("owner", self.jane.id)])
+        self.assertEqual(self.hits("rex smith"), [("pet", self.rex.id)])
+        self.assertEqual(self.hits("zz"), [])
+        self.assertEqual(self.hits("j"), [])
+
+    def test_names_rank_first(self):
+        # "Doberman" is Rex's breed; "Doe" is Jane's name, and Buddy's owner.
+        self.assertEqual(self.hits("do")[0], ("owner", self.jane.id))
+
+    def test_follows_writes(self):
+        self.jane.name = "Janet Roe"
+        self.jane.save()
+        self.assertEqual(self.hits("roe"), [("owner", self.jane.id), ("pet", self.buddy.id)])
+        self.assertEqual(self.hits("doe"), [])
+
+        models.Pet.objects.filter(pk=self.rex.pk).update(owner=self.jane)
+        self.assertIn(("pet", self.rex.id), self.hits("janet"))
+        self.rex.delete()
+        self.assertEqual(self.hits("rex"), [])
+
+    def test_fallback_without_an_index(self):
+        with mock.patch.object(search, "strategy", return_value="like"):
+            self.assertEqual(self.hits("jane"), [("owner", self.jane.id), ("pet", self.buddy.id)])
+            self.assertEqual(self.hits("rex smith"), [("pet", self.rex.id)])
+
+    def test_endpoint_pages_results(self):
+        search.strategy("default")  # memoized introspection
+        # search, owners, pets, bookings
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("search-list"), {"q": "jane", "limit": 1})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["results"], [
+            {"type": "owner", "id": self.jane.id, "name": "Jane Doe", "phone": "555-0101", "email": "jane@example.com"}
+        ])
+        self.assertIsNone(data["previous"])
+
+        data = self.client.get(data["next"]).json()
+        self.assertIsNone(data["next"])
+        self.assertIsNotNone(data["previous"])
+        pet = data["results"][0]
+        self.assertEqual((pet["type"], pet["id"], pet["owner"]["name"]), ("pet", self.buddy.id, "Jane Doe"))
+        # Only the active stay.
+        self.assertEqual([booking["id"] for booking in pet["bookings"]], [self.stay.id])
+        self.assertEqual(pet["bookings"][0]["suite"]["label"], "Suite 1")
+
+        response = self.client.get(reverse("search-list"))
+        self.assertEqual(response.json(), {"next": None, "previous": None, "results": []})
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TransactionTestCase
+
+from ..sqlite.base import DatabaseWrapper
+
+TUNED = connection.settings_dict["ENGINE"] == "api.sqlite"
+
+
+@skipUnless(TUNED, "needs the tuned SQLite backend")
+class TunedSQLiteTests(SimpleTestCase):
+    def setUp(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.path = Path(scratch.name) / "db.sqlite3"
+
+    def open(self, **options) -> DatabaseWrapper:
+        settings_dict = {
+            **connection.settings_dict,
+            "NAME": str(self.path),
+            "OPTIONS": {**connection.settings_dict["OPTIONS"], **options},
+        }
+        wrapper = DatabaseWrapper(settings_dict, "scratch")
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_applies_init_commands(self):
+        wrapper = self.open()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)  # NORMAL
+        self.assertGreater(self.pragma(wrapper, "busy_timeout"), 0)
+
+    def test_transactions_take_the_write_lock_up_front(self):
+        first = self.open()
+        second = self.open(init_command="PRAGMA busy_timeout=10")
+        first._start_transaction_under_autocommit()
+        self.addCleanup(first.connection.execute, "ROLLBACK")
+        # The first transaction has not written yet, but already holds the lock.
+        with self.assertRaisesMessage(OperationalError, "locked"), second.cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE")
+
+    def test_deferred_mode_keeps_plain_begin(self):
+        first = self.open(transaction_mode="DEFERRED")
+        second = self.open(init_command="PRAGMA busy_timeout=10")
+        first._start_transaction_under_autocommit()
+        self.addCleanup(first.connection.execute, "ROLLBACK")
+        with second.cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("ROLLBACK")
+
+    def test_rejects_unknown_transaction_modes(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.open(transaction_mode="EAGER")
+
+
+class MaintenanceCommandTests(TransactionTestCase):
+    # Not TestCase: ANALYZE cannot run inside its wrapping transaction.
+    def test_runs_on_the_default_database(self):
+        out = StringIO()
+        call_command("sqlite_maintenance", stdout=out)
+        expected = "Optimized" if connection.vendor == "sqlite" else "Nothing to do"
+        self.assertIn(expected, out.getvalue())
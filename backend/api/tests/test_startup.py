@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+import os
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .. import models
+
+ENV = {"DJANGO_SECRET_KEY": "startup-test", "DJANGO_ALLOWED_HOSTS": "localhost", "DISABLE_DOTENV": "1"}
+
+
+class ApiProfileTests(TestCase):
+    @override_settings(ROOT_URLCONF="houndz.urls_api")
+    def test_api_urls_leave_out_the_admin(self):
+        models.Suite.objects.create(label="Suite 1")
+        self.assertEqual(self.client.get("/api/suites/").status_code, 200)
+        self.assertEqual(self.client.get("/api/health/").content, b"ok")
+        self.assertEqual(self.client.get("/admin/").status_code, 404)
+
+    def test_bench_startup_boots_the_lean_profile(self):
+        out = StringIO()
+        with mock.patch.dict(os.environ, ENV):
+            call_command("bench_startup", "houndz.settings.api", "--runs", "1", "--json", stdout=out)
+        report = json.loads(out.getvalue())["houndz.settings.api"]
+        self.assertEqual(report["status"], 200)
+        self.assertGreater(report["setup_ms"], 0)
+        self.assertGreater(report["rss_mb"], 0)
+        self.assertLess(report["setup_ms"], report["wall_ms"])
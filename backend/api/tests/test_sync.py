@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .. import models, sync
+
+
+class SyncEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("sync-list")
+        self.suite = models.Suite.objects.create(label="Suite 1")
+        self.owner = models.Owner.objects.create(name="Jane Doe")
+        self.pet = models.Pet.objects.create(owner=self.owner, name="Buddy")
+        self.booking = models.Booking.objects.create(
+            pet=self.pet,
+            suite=self.suite,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+        )
+        # Pretend everything was written well before the client's cursor.
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (models.Suite, models.Owner, models.Pet, models.Booking):
+            model.objects.update(updated_at=an_hour_ago)
+        self.cursor = sync.encode_cursor(an_hour_ago + timedelta(minutes=5))
+
+    def test_without_cursor_returns_full_snapshot(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["full"])
+        self.assertEqual(len(response.data["bookings"]), 1)
+        self.assertEqual(response.data["bookings"][0]["pet"]["owner"]["name"], "Jane Doe")
+        self.assertIn("cursor", response.data)
+
+    def test_with_cursor_returns_only_changed_rows(self):
+        response = self.client.get(self.url, {"since": self.cursor})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["full"])
+        for name in ("suites", "owners", "pets", "bookings"):
+            self.assertEqual(response.data[name], [])
+
+        self.booking.bathed = True
+        self.booking.save()
+
+        response = self.client.get(self.url, {"since": self.cursor})
+        self.assertEqual([row["id"] for row in response.data["bookings"]], [self.booking.id])
+        self.assertEqual(response.data["suites"], [])
+
+    def test_deletes_are_reported_as_tombstones(self):
+        booking_id = self.booking.id
+        self.booking.delete()
+
+        response = self.client.get(self.url, {"since": self.cursor})
+        self.assertEqual(response.data["deleted"]["bookings"], [booking_id])
+        self.assertEqual(response.data["bookings"], [])
+
+    def test_cursor_older_than_retention_forces_full_snapshot(self):
+        stale = timezone.now() - timedelta(days=365)
+        response = self.client.get(self.url, {"since": sync.encode_cursor(stale)})
+        self.assertTrue(response.data["full"])
+        self.assertEqual(len(response.data["suites"]), 1)
+
+    def test_rejects_malformed_cursor(self):
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("since", response.data)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import events, models, overlap, transfer
+
+
+def ndjson(*records) -> bytes:
+    return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+class TransferTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user("staff"))
+        patcher = mock.patch.object(events, "get_broker")
+        self.broker = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def post(self, body: bytes, content_type="application/x-ndjson"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("import-list"), body, content_type=content_type)
+
+    def test_imports_csv_with_references(self):
+        body = (
+            "type,ref,label,name,breed,weight_kg,special_needs,owner_ref,pet_ref,suite,start_date,end_date,bathed,features\n"
+            "suite,,Suite 1,,,,,,,,,,,No stairs;Heated floor\n"
+            "owner,o1,,Jane Doe,,,,,,,,,,\n"
+            "pet,p1,,Buddy,Beagle,12.5,Senior;No stairs,o1,,,,,,\n"
+            "booking,,,,,,,,p1,Suite 1,2024-12-01,2024-12-03,yes,\n"
+        ).encode()
+        response = self.post(body, "text/csv")
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["created"], {"suite": 1, "owner": 1, "pet": 1, "booking": 1})
+        pet = models.Pet.objects.get()
+        self.assertEqual(pet.special_needs, ["Senior", "No stairs"])
+        self.assertEqual(models.Suite.objects.get().features, ["No stairs", "Heated floor"])
+        booking = models.Booking.objects.get()
+        self.assertEqual((booking.pet, booking.suite.label, booking.bathed), (pet, "Suite 1", True))
+        self.assertEqual(models.SuiteOccupancy.objects.count(), 3)
+        self.broker.publish.assert_called_once_with(events.RESYNC_EVENT)
+
+    def test_reports_bad_rows_and_keeps_good_ones(self):
+        suite = models.Suite.objects.create(label="Suite 1")
+        body = ndjson(
+            {"type": "owner", "ref": "o1", "name": "Jane Doe"},
+            {"type": "pet", "ref": "p1", "owner_ref": "o1", "name": "Buddy"},
+            {"type": "pet", "owner_ref": "missing", "name": "Ghost"},
+            {"type": "booking", "pet_ref": "p1", "suite_id": suite.id,
+             "start_date": "2024-12-01", "end_date": "2024-12-03"},
+            {"type": "booking", "pet_ref": "p1", "suite": "Suite 1",
+             "start_date": "2024-12-02", "end_date": "2024-12-04"},
+            {"type": "booking", "pet_ref": "p1", "suite": "Suite 9",
+             "start_date": "2024-12-02", "end_date": "2024-12-01"},
+        ) + b"{not json\n"
+        response = self.post(body)
+
+        self.assertEqual(response.data["created"], {"suite": 0, "owner": 1, "pet": 1, "booking": 1})
+        errors = {error["line"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {3, 5, 6, 7})
+        self.assertIn("owner_ref", errors[3])
+        self.assertIn("suite", errors[5])
+        self.assertIn("suite", errors[6])
+        self.assertIn("__all__", errors[7])
+
+    def test_batch_lost_to_the_constraint_is_forgotten(self):
+        records = (
+            (1, {"type": "suite", "label": "Suite 1"}),
+            (2, {"type": "owner", "ref": "o1", "name": "Jane Doe"}),
+            (3, {"type": "pet", "ref": "p1", "owner_ref": "o1", "name": "Buddy"}),
+            (4, {"type": "booking", "pet_ref": "p1", "suite": "Suite 1",
+                 "start_date": "2024-12-01", "end_date": "2024-12-03"}),
+            (5, {"type": "pet", "owner_ref": "o1", "name": "Rex"}),
+            (6, {"type": "booking", "pet_ref": "p1", "suite": "Suite 1",
+                 "start_date": "2024-12-05", "end_date": "2024-12-06"}),
+        )
+        # What translate_violation raises when the exclusion constraint fires.
+        violation = ValidationError({"suite": overlap.OVERLAP_MESSAGE})
+        with mock.patch.object(transfer.availability, "add_bookings", side_effect=[violation, None]):
+            report = transfer.Importer(batch_size=4).run(records)
+
+        self.assertEqual(sum(report.created.values()), 0)
+        errors = {error["line"]: error["errors"] for error in report.errors}
+        self.assertEqual(set(errors), {1, 5, 6})
+        self.assertIn("owner_ref", errors[5])
+        self.assertEqual(set(errors[6]), {"pet_ref", "suite"})
+        self.assertFalse(models.Owner.objects.exists())
+
+    def test_requires_authentication(self):
+        response = APIClient().post(reverse("import-list"), b"", content_type="application/x-ndjson")
+        self.assertIn(response.status_code, (401, 403))
+        response = APIClient().get(reverse("export"), {"format": "csv"})
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_export_round_trips_through_import(self):
+        suite = models.Suite.objects.create(label="Suite 1")
+        owner = models.Owner.objects.create(name="Jane Doe", email="jane@example.com")
+        pet = models.Pet.objects.create(owner=owner, name="Buddy", special_needs=["Senior"])
+        models.Booking.objects.create(
+            pet=pet, suite=suite, start_date=date(2024, 12, 1), end_date=date(2024, 12, 3), notes="Hi"
+        )
+
+        for fmt, content_type in (("csv", "text/csv"), ("ndjson", "application/x-ndjson")):
+            with self.subTest(fmt=fmt):
+                response = self.client.get(reverse("export"), {"format": fmt})
+                self.assertEqual(response["Content-Type"], content_type)
+                body = b"".join(response.streaming_content)
+                models.Booking.objects.all().delete()
+                models.Pet.objects.all().delete()
+                models.Owner.objects.all().delete()
+
+                result = self.post(body, content_type)
+                # The suite already exists and is matched by label.
+                self.assertEqual(result.data["created"], {"suite": 0, "owner": 1, "pet": 1, "booking": 1})
+                booking = models.Booking.objects.select_related("pet__owner").get()
+                self.assertEqual(booking.pet.owner.email, "jane@example.com")
+                self.assertEqual(booking.pet.special_needs, ["Senior"])
+                self.assertEqual((booking.suite, booking.notes), (suite, "Hi"))
+
+    def test_export_rejects_unknown_types(self):
+        self.assertEqual(self.client.get(reverse("export"), {"types": "cats"}).status_code, 400)
+
+    def test_commands_round_trip_and_dry_run(self):
+        owner = models.Owner.objects.create(name="Jane Doe")
+        models.Pet.objects.create(owner=owner, name="Buddy")
+        exported = StringIO()
+        with mock.patch("sys.stdout", exported):
+            call_command("export_kennel_data", "--format", "ndjson")
+        models.Pet.objects.all().delete()
+        models.Owner.objects.all().delete()
+
+        with mock.patch("sys.stdin", StringIO(exported.getvalue())):
+            call_command("import_kennel_data", "-", "--dry-run", stdout=StringIO())
+        self.assertFalse(models.Pet.objects.exists())
+
+        output = StringIO()
+        with mock.patch("sys.stdin", StringIO(exported.getvalue())):
+            call_command("import_kennel_data", "-", stdout=output)
+        self.assertEqual(models.Pet.objects.get().owner.name, "Jane Doe")
+        self.assertIn("1 pet(s)", output.getvalue())
+
+
+class ImportCommandTransactionTests(TransactionTestCase):
+    def test_batches_commit_one_at_a_time(self):
+        body = ndjson(*({"type": "owner", "name": f"Owner {n}"} for n in range(3))).decode()
+        flush = transfer.Importer.flush
+        calls = []
+
+        def crash_on_third_batch(importer, batch):
+            calls.append(batch)
+            if len(calls) == 3:
+                raise RuntimeError("power cut")
+            flush(importer, batch)
+
+        with mock.patch.object(transfer.Importer, "flush", crash_on_third_batch), mock.patch(
+            "sys.stdin", StringIO(body)
+        ), self.assertRaises(RuntimeError):
+            call_command("import_kennel_data", "-", "--format", "ndjson", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(models.Owner.objects.count(), 2)
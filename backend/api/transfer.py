@@ -0,0 +1,345 @@
+"""Streaming import/export of suites, owners, pets and bookings.
+
+Both formats carry one record per row/line with a ``type`` of ``suite``,
+``owner``, ``pet`` or ``booking``:
+
+* ``owner`` and ``pet`` records may carry a ``ref`` (any string, e.g. the
+  id in the old spreadsheet). Pets point at owners with ``owner_ref`` (or
+  ``owner_id`` for rows already in the database); bookings point at pets
+  with ``pet_ref``/``pet_id`` and at suites by ``suite`` label.
+* References must appear earlier in the stream or in the same batch.
+* CSV cells left empty are treated as absent; ``special_needs`` and
+  ``features`` are ``;``-separated in CSV and lists in NDJSON.
+
+Imports are read line by line and written in batches, each in one guarded
+transaction (see :func:`api.overlap.guarded_bulk_write`) using
+``bulk_create``. Overlaps are checked set-wise per batch. Invalid rows are
+reported and skipped. Exports stream ``values().iterator()`` rows, so
+memory stays flat whatever the table size.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router
+
+from . import availability, bulk, caching, events, models, overlap
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+KINDS = ("suite", "owner", "pet", "booking")
+EXPORT_COLUMNS = (
+    "type", "ref", "label", "max_weight_kg", "features", "name", "phone", "email", "breed", "weight_kg", "special_needs",
+    "owner_ref", "pet_ref", "suite", "start_date", "end_date", "status", "bathed", "notes",
+)
+FIELDS = {
+    "suite": ("label", "notes", "max_weight_kg", "features"),
+    "owner": ("name", "phone", "email"),
+    "pet": ("name", "breed", "weight_kg", "special_needs"),
+    "booking": ("start_date", "end_date", "status", "bathed", "notes"),
+}
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n"}
+MAX_REPORTED_ERRORS = 100
+EXPORT_CHUNK_SIZE = 2000
+# Lists, ";"-separated in CSV.
+LIST_COLUMNS = ("special_needs", "features")
+
+
+def detect_format(content_type: str = "", name: str = "") -> str:
+    """``"csv"`` for CSV content types or ``.csv`` files, otherwise ``"ndjson"``."""
+    return "csv" if "csv" in content_type or name.lower().endswith(".csv") else "ndjson"
+
+
+# --------------------------------------------------------------------- import
+
+
+def read_records(lines: Iterable[str], fmt: str) -> Iterator[tuple[int, dict]]:
+    """Yield ``(line number, record)``; unparseable lines yield a record with ``_error``."""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            record = {key.strip(): value for key, value in row.items() if key and value not in ("", None)}
+            for column in LIST_COLUMNS:
+                if isinstance(record.get(column), str):
+                    record[column] = [item.strip() for item in record[column].split(";") if item.strip()]
+            yield reader.line_num, record
+        return
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, {"_error": f"Invalid JSON: {exc}"}
+            continue
+        yield number, record if isinstance(record, dict) else {"_error": "Expected a JSON object."}
+
+
+@dataclass
+class ImportReport:
+    created: Counter = field(default_factory=Counter)
+    errors: list[dict] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line: int, errors: dict) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "created": {kind: self.created[kind] for kind in KINDS},
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+def _error_dict(exc: ValidationError) -> dict:
+    return exc.message_dict if hasattr(exc, "error_dict") else {"__all__": exc.messages}
+
+
+class Importer:
+    def __init__(self, batch_size: int = 1000) -> None:
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self.owner_refs: dict[str, int] = {}
+        self.pet_refs: dict[str, int] = {}
+        self.suite_ids = dict(models.Suite.objects.values_list("label", "id"))
+        self.using = router.db_for_write(models.Booking)
+
+    def run(self, records: Iterable[tuple[int, dict]]) -> ImportReport:
+        batch: list[tuple[int, dict]] = []
+        for line, record in records:
+            batch.append((line, record))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        if sum(self.report.created.values()):
+            events.publish_resync()
+            caching.invalidate(models.Suite, models.Owner, models.Pet, models.Booking)
+        return self.report
+
+    def flush(self, batch: list[tuple[int, dict]]) -> None:
+        by_kind: dict[str, list[tuple[int, dict]]] = {kind: [] for kind in KINDS}
+        for line, record in batch:
+            if "_error" in record:
+                self.report.add_error(line, {"__all__": [record["_error"]]})
+            elif record.get("type") not in by_kind:
+                self.report.add_error(line, {"type": [f"Must be one of: {', '.join(KINDS)}."]})
+            else:
+                by_kind[record["type"]].append((line, record))
+
+        # Lock every existing suite the batch books into for the whole batch.
+        suite_ids = {self.suite_ids.get(record.get("suite")) for _, record in by_kind["booking"]}
+        suite_ids |= self._existing_ids(models.Suite, by_kind["booking"], "suite_id")
+        suite_ids.discard(None)
+        created = Counter()
+        known = dict(self.suite_ids), dict(self.owner_refs), dict(self.pet_refs)
+        try:
+            with overlap.guarded_bulk_write(suite_ids, self.using):
+                created["suite"] = self.import_suites(by_kind["suite"])
+                created["owner"] = self.import_owners(by_kind["owner"])
+                created["pet"] = self.import_pets(by_kind["pet"])
+                created["booking"] = self.import_bookings(by_kind["booking"])
+        except ValidationError as exc:
+            # A concurrent write won a suite (PostgreSQL constraint); the batch rolled
+            # back, so later batches must not resolve refs to its rows.
+            self.suite_ids, self.owner_refs, self.pet_refs = known
+            self.report.add_error(batch[0][0], _error_dict(exc))
+            return
+        self.report.created.update(created)
+
+    def _build(self, model, line: int, record: dict, exclude=(), **related):
+        values = {name: record[name] for name in FIELDS[model._meta.model_name] if name in record}
+        if isinstance(values.get("bathed"), str):
+            flag = values["bathed"].strip().lower()
+            # Anything unrecognized is left for full_clean() to reject.
+            values["bathed"] = True if flag in TRUE_VALUES else False if flag in FALSE_VALUES else flag
+        instance = model(**values, **related)
+        try:
+            options = {"validate_overlap": False} if model is models.Booking else {}
+            instance.full_clean(exclude=list(exclude), validate_unique=False, **options)
+        except ValidationError as exc:
+            self.report.add_error(line, _error_dict(exc))
+            return None
+        return instance
+
+    def import_suites(self, rows) -> int:
+        new = {}
+        for line, record in rows:
+            if record.get("label") in self.suite_ids or record.get("label") in new:
+                continue  # suites are matched by label, so re-imports are harmless
+            suite = self._build(models.Suite, line, record)
+            if suite is not None:
+                new[suite.label] = suite
+        for suite in models.Suite.objects.bulk_create(new.values()):
+            self.suite_ids[suite.label] = suite.pk
+        return len(new)
+
+    def _register(self, refs: dict, rows_and_objects) -> None:
+        for record, instance in rows_and_objects:
+            if "ref" in record:
+                refs[str(record["ref"])] = instance.pk
+
+    def _existing_ids(self, model, rows, key: str) -> set:
+        ids = set()
+        for _, record in rows:
+            try:
+                ids.add(int(record[key]))
+            except (KeyError, TypeError, ValueError):
+                pass
+        return set(model.objects.filter(pk__in=ids).values_list("pk", flat=True)) if ids else set()
+
+    def _resolve(self, record: dict, name: str, refs: dict, existing: set) -> int | None:
+        if f"{name}_ref" in record:
+            return refs.get(str(record[f"{name}_ref"]))
+        try:
+            pk = int(record[f"{name}_id"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return pk if pk in existing else None
+
+    def _check_ref(self, line: int, record: dict, refs: dict) -> bool:
+        if "ref" in record and str(record["ref"]) in refs:
+            self.report.add_error(line, {"ref": [f"Duplicate ref {record['ref']!r}."]})
+            return False
+        return True
+
+    def import_owners(self, rows) -> int:
+        built = []
+        for line, record in rows:
+            if self._check_ref(line, record, self.owner_refs):
+                owner = self._build(models.Owner, line, record)
+                if owner is not None:
+                    built.append((record, owner))
+        models.Owner.objects.bulk_create([owner for _, owner in built])
+        self._register(self.owner_refs, built)
+        return len(built)
+
+    def import_pets(self, rows) -> int:
+        existing = self._existing_ids(models.Owner, rows, "owner_id")
+        built = []
+        for line, record in rows:
+            if not self._check_ref(line, record, self.pet_refs):
+                continue
+            owner_id = self._resolve(record, "owner", self.owner_refs, existing)
+            if owner_id is None:
+                self.report.add_error(line, {"owner_ref": ["Unknown owner."]})
+                continue
+            pet = self._build(models.Pet, line, record, exclude=["owner"], owner_id=owner_id)
+            if pet is not None:
+                built.append((record, pet))
+        models.Pet.objects.bulk_create([pet for _, pet in built])
+        self._register(self.pet_refs, built)
+        return len(built)
+
+    def import_bookings(self, rows) -> int:
+        existing_pets = self._existing_ids(models.Pet, rows, "pet_id")
+        existing_suites = self._existing_ids(models.Suite, rows, "suite_id")
+        lines, bookings = [], []
+        for line, record in rows:
+            pet_id = self._resolve(record, "pet", self.pet_refs, existing_pets)
+            suite_id = self.suite_ids.get(record.get("suite"))
+            if suite_id is None and "suite" not in record:
+                suite_id = self._resolve(record, "suite", {}, existing_suites)
+            errors = {}
+            if pet_id is None:
+                errors["pet_ref"] = ["Unknown pet."]
+            if suite_id is None:
+                errors["suite"] = ["Unknown suite."]
+            if errors:
+                self.report.add_error(line, errors)
+                continue
+            booking = self._build(
+                models.Booking, line, record, exclude=["pet", "suite"], pet_id=pet_id, suite_id=suite_id
+            )
+            if booking is not None:
+                lines.append(line)
+                bookings.append(booking)
+
+        errors: list[dict] = [{} for _ in bookings]
+        bulk.check_overlaps(bookings, errors)
+        accepted = []
+        for line, booking, booking_errors in zip(lines, bookings, errors):
+            if booking_errors:
+                self.report.add_error(line, booking_errors)
+            else:
+                accepted.append(booking)
+        created = models.Booking.objects.bulk_create(accepted)
+        availability.add_bookings(created)
+        return len(created)
+
+
+# --------------------------------------------------------------------- export
+
+
+def export_records(kinds: Iterable[str] = KINDS) -> Iterator[dict]:
+    """Every requested row as an import-compatible record, streamed from the database."""
+    kinds = set(kinds)
+    if "suite" in kinds:
+        suites = models.Suite.objects.order_by("pk").values("label", "notes", "max_weight_kg", "features")
+        for row in suites.iterator(EXPORT_CHUNK_SIZE):
+            yield {"type": "suite", **row}
+    if "owner" in kinds:
+        owners = models.Owner.objects.order_by("pk").values("pk", "name", "phone", "email")
+        for row in owners.iterator(EXPORT_CHUNK_SIZE):
+            yield {"type": "owner", "ref": str(row.pop("pk")), **row}
+    if "pet" in kinds:
+        pets = models.Pet.objects.order_by("pk").values(
+            "pk", "owner_id", "name", "breed", "weight_kg", "special_needs"
+        )
+        for row in pets.iterator(EXPORT_CHUNK_SIZE):
+            yield {"type": "pet", "ref": str(row.pop("pk")), "owner_ref": str(row.pop("owner_id")), **row}
+    if "booking" in kinds:
+        columns = ("pk", "pet_id", "suite__label", "start_date", "end_date", "status", "bathed", "notes")
+        # Archived stays (api.archive) are exported as ordinary checked-out bookings.
+        bookings = chain(
+            models.ArchivedBooking.objects.order_by("pk").values(*columns).iterator(EXPORT_CHUNK_SIZE),
+            models.Booking.objects.order_by("pk").values(*columns).iterator(EXPORT_CHUNK_SIZE),
+        )
+        for row in bookings:
+            yield {
+                "type": "booking",
+                "ref": str(row.pop("pk")),
+                "pet_ref": str(row.pop("pet_id")),
+                "suite": row.pop("suite__label"),
+                **row,
+            }
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def render_records(records: Iterable[dict], fmt: str) -> Iterator[str]:
+    if fmt == "ndjson":
+        for record in records:
+            yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+        return
+
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    yield writer.writeheader()
+    for record in records:
+        for column in LIST_COLUMNS:
+            if column in record:
+                record[column] = ";".join(str(item) for item in record[column])
+        if "bathed" in record:
+            record["bathed"] = "true" if record["bathed"] else "false"
+        for column in ("weight_kg", "max_weight_kg"):
+            if record.get(column) is None:
+                record.pop(column, None)
+        yield writer.writerow(record)
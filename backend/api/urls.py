@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
@@ -12,7 +13,18 @@ router.register("suites", views.SuiteViewSet, basename="suite")
 router.register("owners", views.OwnerViewSet, basename="owner")
 router.register("pets", views.PetViewSet, basename="pet")
 router.register("bookings", views.BookingViewSet, basename="booking")
+router.register("availability", views.AvailabilityViewSet, basename="availability")
+router.register("dashboard", views.DashboardViewSet, basename="dashboard")
+router.register("search", views.SearchViewSet, basename="search")
+router.register("sync", views.SyncViewSet, basename="sync")
+router.register("import", views.ImportViewSet, basename="import")
+
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS:
+    router_urls = [views.async_reads(pattern) for pattern in router_urls]
 
 urlpatterns = [
-    path("", include(router.urls)),
+    path("events/", views.change_feed, name="change-feed"),
+    path("export/", views.ExportView.as_view(), name="export"),
+    path("", include(router_urls)),
 ]
@@ -1,44 +1,565 @@
 from __future__ import annotations
 
+import codecs
+import json
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.urls import URLPattern
 from django.utils import timezone
-from rest_framework import viewsets
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import BaseParser, MultiPartParser
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
+from rest_framework.views import APIView
+
+from . import (
+    availability,
+    bulk,
+    caching,
+    conditional,
+    dashboard,
+    events,
+    fastjson,
+    filters,
+    intervals,
+    models,
+    pagination,
+    readers,
+    scheduling,
+    search,
+    serializers,
+    sync,
+    transfer,
+)
+
+
+class ExpandableQuerysetMixin:
+    """Only join the relations a ``?expand=`` request will actually render."""
+
+    # expand path -> select_related lookup
+    expandable_relations: dict[str, str] = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        expand = serializers.requested_expansions(self.request)
+        if expand is None:
+            return queryset
+        related = [lookup for path, lookup in self.expandable_relations.items() if path in expand]
+        queryset = queryset.select_related(None)
+        # select_related() with no arguments would follow every foreign key.
+        return queryset.select_related(*related) if related else queryset
+
+
+class ConditionalListMixin:
+    """Answer unchanged list polls with ``304 Not Modified`` (see :mod:`api.conditional`)."""
+
+    # Every model whose rows appear in the list payload, nested ones included.
+    conditional_models: tuple[type, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        render = partial(super().list, request, *args, **kwargs)
+        return conditional.conditional_response(request, self.conditional_models, render)
+
+
+class ValuesListMixin:
+    """Render plain (unpaginated, unprojected) lists with a :class:`~api.readers.ValuesReader`."""
 
-from . import models, serializers
+    values_reader: readers.ValuesReader
 
+    def can_read_values(self, request) -> bool:
+        params = request.query_params
+        return "fields" not in params and "expand" not in params
 
-class SuiteViewSet(viewsets.ModelViewSet):
+    def list(self, request, *args, **kwargs):
+        if not self.can_read_values(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.values_reader.render(queryset))
+
+
+class CachedListMixin:
+    """Keep rendered list payloads in the reference-data cache (see :mod:`api.caching`).
+
+    Goes after :class:`ConditionalListMixin`. Entries are keyed by the database
+    version it computed for the ETag, so a worker whose own cache missed another
+    worker's write can never serve the old body under the new ETag.
+    """
+
+    list_cache: caching.Namespace
+
+    def list(self, request, *args, **kwargs):
+        version = getattr(request, "data_version", None)
+        # Like ETags, nothing is cached while an older change may still commit.
+        if version is None or not conditional.settled(version):
+            return super().list(request, *args, **kwargs)
+        # The absolute URI covers ?fields=/?expand= and the links in paginated pages.
+        key = self.list_cache.key(request.build_absolute_uri(), version.isoformat())
+        data = self.list_cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            self.list_cache.set(key, response.data)
+        return response
+
+
+class SuiteViewSet(ConditionalListMixin, CachedListMixin, viewsets.ModelViewSet):
     queryset = models.Suite.objects.all()
     serializer_class = serializers.SuiteSerializer
+    cursor_ordering = ("label", "id")
+    conditional_models = (models.Suite,)
+    list_cache = caching.SUITE_LIST
 
 
-class OwnerViewSet(viewsets.ModelViewSet):
+class OwnerViewSet(ConditionalListMixin, CachedListMixin, viewsets.ModelViewSet):
     queryset = models.Owner.objects.all()
     serializer_class = serializers.OwnerSerializer
+    cursor_ordering = ("name", "id")
+    conditional_models = (models.Owner,)
+    list_cache = caching.OWNER_LIST
 
 
-class PetViewSet(viewsets.ModelViewSet):
+class PetViewSet(
+    ConditionalListMixin, CachedListMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = models.Pet.objects.select_related("owner").all()
     serializer_class = serializers.PetSerializer
+    cursor_ordering = ("name", "id")
+    expandable_relations = {"owner": "owner"}
+    conditional_models = (models.Pet, models.Owner)
+    list_cache = caching.PET_LIST
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(
+    ConditionalListMixin, ValuesListMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = (
         models.Booking.objects.select_related("pet", "pet__owner", "suite")
         .all()
         .order_by("start_date")
     )
     serializer_class = serializers.BookingSerializer
+    values_reader = readers.ValuesReader(serializers.BookingSerializer)
+    filter_backends = [filters.BookingFilterBackend]
+    cursor_ordering = ("start_date", "id")
+    expandable_relations = {"pet": "pet", "pet.owner": "pet__owner", "suite": "suite"}
+    conditional_models = (models.Booking, models.Pet, models.Owner, models.Suite)
+    max_bulk_items = 500
 
     @action(detail=False, methods=["get"], url_path="current")
     def current(self, request, *args, **kwargs):
         today = timezone.localdate()
-        current_bookings = self.filter_queryset(self.get_queryset()).filter(
-            status=models.Booking.Status.CHECKED_IN,
-            start_date__lte=today,
-            end_date__gte=today,
+        return conditional.conditional_response(
+            request,
+            self.conditional_models,
+            partial(self._render_current, request, today),
+            # The payload changes at midnight even if no row does.
+            today.isoformat(),
+        )
+
+    def _current_queryset(self, today):
+        # Served by the interval index (see api.intervals), not a date-range scan.
+        return intervals.on(self.filter_queryset(self.get_queryset()), today).filter(
+            status=models.Booking.Status.CHECKED_IN
+        )
+
+    def _render_current(self, request, today):
+        key = conditional.current_bookings_key(request, today)
+        data = caching.CURRENT_BOOKINGS.get(key) if key else None
+        if data is None:
+            current_bookings = self._current_queryset(today)
+            if self.can_read_values(request):
+                data = self.values_reader.render(current_bookings)
+            else:
+                data = self.get_serializer(current_bookings, many=True).data
+            if key:
+                caching.CURRENT_BOOKINGS.set(key, data, settings.CURRENT_BOOKINGS_CACHE_SECONDS)
+        return Response(data)
+
+    def can_read_async(self, request) -> bool:
+        """Whether :meth:`alist`/:meth:`acurrent` would answer exactly like the sync view."""
+        paginator = self.paginator
+        params = request.query_params
+        return (
+            request.method == "GET"
+            # Reads skip authentication, so only while they are open to everyone.
+            and set(self.permission_classes) <= {AllowAny, IsAuthenticatedOrReadOnly}
+            and self.can_read_values(request)
+            and not {"format", paginator.cursor_query_param, paginator.page_size_query_param}
+            & params.keys()
+            and "html" not in request.META.get("HTTP_ACCEPT", "")
+        )
+
+    async def alist(self, request):
+        """Async :meth:`list` using the async ORM (see :func:`async_reads`)."""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        async def render():
+            return json_response(await self.values_reader.arender(queryset))
+
+        return await conditional.aconditional_response(request, self.conditional_models, render)
+
+    async def acurrent(self, request):
+        """Async :meth:`current` using the async ORM (see :func:`async_reads`)."""
+        today = timezone.localdate()
+        # The interval helpers may introspect the schema on a worker's first call.
+        current_bookings = await sync_to_async(self._current_queryset)(today)
+
+        async def render():
+            key = None
+            if settings.CURRENT_BOOKINGS_CACHE_SECONDS:
+                key = await sync_to_async(conditional.current_bookings_key)(request, today)
+            data = await caching.CURRENT_BOOKINGS.aget(key) if key else None
+            if data is None:
+                data = await self.values_reader.arender(current_bookings)
+                if key:
+                    await caching.CURRENT_BOOKINGS.aset(
+                        key, data, settings.CURRENT_BOOKINGS_CACHE_SECONDS
+                    )
+            return json_response(data)
+
+        return await conditional.aconditional_response(
+            request, self.conditional_models, render, today.isoformat()
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        """Create/update up to ``max_bulk_items`` bookings in one all-or-nothing batch.
+
+        Errors come back as a list aligned with the submitted items.
+        """
+        items = serializers.BookingBulkItemSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=self.max_bulk_items
+        )
+        items.is_valid(raise_exception=True)
+        try:
+            bookings = bulk.save_bookings(items.validated_data)
+        except bulk.BulkValidationError as exc:
+            raise ValidationError(exc.errors) from exc
+        except DjangoValidationError as exc:
+            # A concurrent write won the race for a suite (PostgreSQL constraint).
+            raise ValidationError(as_serializer_error(exc)) from exc
+        serializer = self.get_serializer(bookings, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"], url_path="history")
+    def history(self, request, *args, **kwargs):
+        """Live and archived bookings (see :mod:`api.archive`) matching the list filters.
+
+        Needs ``?pet=``, ``?owner=``, ``?suite=`` or a ``?from=``/``?to=``
+        window, so a request cannot read the whole archive at once.
+        """
+        if not {"pet", "owner", "suite", "from", "to"} & {
+            param for param, value in request.query_params.items() if value
+        }:
+            raise ValidationError({"detail": "Filter history by pet, owner, suite or from/to."})
+        live = self.filter_queryset(self.get_queryset())
+        archived = self.filter_queryset(
+            models.ArchivedBooking.objects.select_related("pet", "pet__owner", "suite")
+        )
+        if self.can_read_values(request):
+            rows = self.values_reader.render(archived) + self.values_reader.render(live)
+        else:
+            rows = list(self.get_serializer([*archived, *live], many=True).data)
+        rows.sort(key=lambda row: (row.get("start_date") or "", row.get("id") or 0))
+        return Response(rows)
+
+    @action(detail=False, methods=["get"], url_path="suggest")
+    def suggest(self, request, *args, **kwargs):
+        """Best-fitting free suites for ``?pet_id=&start_date=&end_date=`` (see :mod:`api.scheduling`).
+
+        Repeat ``features=`` to require suite features beyond the pet's own needs.
+        """
+        query = serializers.SuiteRequestSerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        try:
+            return Response(scheduling.suggest(query.validated_data))
+        except bulk.BulkValidationError as exc:
+            raise ValidationError(exc.errors[0]) from exc
+
+    @action(detail=False, methods=["post"], url_path="assign")
+    def assign(self, request, *args, **kwargs):
+        """Pick suites for a batch of stays; with ``"save": true`` also book the ones that fit.
+
+        Results are aligned with ``requests``. Stays no suite can take come
+        back with ``suite: null`` and a reason and are never booked.
+        """
+        body = serializers.SuiteAssignmentSerializer(data=request.data)
+        body.is_valid(raise_exception=True)
+        requests = body.validated_data["requests"]
+        try:
+            assignments = scheduling.assign(requests)
+        except bulk.BulkValidationError as exc:
+            raise ValidationError({"requests": exc.errors}) from exc
+        results = [assignment.as_dict() for assignment in assignments]
+        if not body.validated_data["save"]:
+            return Response({"assignments": results})
+
+        placed = [index for index, assignment in enumerate(assignments) if assignment.suite]
+        items = [
+            {
+                "pet_id": requests[index]["pet_id"],
+                "suite_id": assignments[index].suite.id,
+                "start_date": requests[index]["start_date"],
+                "end_date": requests[index]["end_date"],
+            }
+            for index in placed
+        ]
+        try:
+            bookings = bulk.save_bookings(items) if items else []
+        except bulk.BulkValidationError as exc:
+            # Another write took a suite between planning and saving.
+            errors = [{} for _ in requests]
+            for index, item_errors in zip(placed, exc.errors):
+                errors[index] = item_errors
+            raise ValidationError({"requests": errors}) from exc
+        except DjangoValidationError as exc:
+            raise ValidationError(as_serializer_error(exc)) from exc
+        for index, booking in zip(placed, bookings):
+            results[index]["booking_id"] = booking.pk
+        return Response({"assignments": results}, status=status.HTTP_201_CREATED)
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """Changes to suites, owners, pets and bookings since a sync cursor."""
+
+    def list(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        try:
+            since_at = sync.decode_cursor(since) if since else None
+        except sync.InvalidCursor as exc:
+            raise ValidationError({"since": str(exc)}) from exc
+        return Response(sync.build_sync_payload(since_at, context={"request": request}))
+
+
+class AvailabilityViewSet(viewsets.ViewSet):
+    """Free suites and per-day occupancy for ``?start=&end=`` (inclusive)."""
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        errors = {}
+        days = {}
+        for param in ("start", "end"):
+            value = params.get(param) or (params.get("start") if param == "end" else None)
+            try:
+                days[param] = parse_date(value) if value else None
+            except ValueError:
+                days[param] = None
+            if days[param] is None:
+                errors[param] = "Enter a date in YYYY-MM-DD format."
+        if not errors:
+            span = (days["end"] - days["start"]).days
+            if span < 0:
+                errors["end"] = "Must be on or after 'start'."
+            elif span >= availability.MAX_RANGE_DAYS:
+                errors["end"] = f"Ranges are limited to {availability.MAX_RANGE_DAYS} days."
+        if errors:
+            raise ValidationError(errors)
+        return Response(availability.availability(days["start"], days["end"]))
+
+
+class DashboardViewSet(viewsets.ViewSet):
+    """Arrivals, departures, dogs in house, baths pending and a 7-night forecast for ``?date=``."""
+
+    conditional_models = (models.Booking, models.Pet, models.Owner, models.Suite)
+
+    def list(self, request, *args, **kwargs):
+        value = request.query_params.get("date")
+        try:
+            day = parse_date(value) if value else timezone.localdate()
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({"date": "Enter a date in YYYY-MM-DD format."})
+        return conditional.conditional_response(
+            request,
+            self.conditional_models,
+            lambda: Response(dashboard.dashboard(day)),
+            # Without ?date= the payload changes at midnight even if no row does.
+            day.isoformat(),
+        )
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """Owners and pets matching ``?q=``, best first, in ``?limit=&offset=`` pages (see :mod:`api.search`)."""
+
+    pagination_class = pagination.RankedPagination
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "")
+        paginator = self.pagination_class()
+        results = paginator.paginate_ranked(
+            lambda offset, limit: search.search(query, offset, limit), request
+        )
+        return paginator.get_paginated_response(results)
+
+
+class StreamParser(BaseParser):
+    """Hand CSV request bodies to the importer unread, so they stream line by line."""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class NDJSONStreamParser(StreamParser):
+    media_type = "application/x-ndjson"
+
+
+class ImportViewSet(viewsets.ViewSet):
+    """Load suites, owners, pets and bookings from CSV or NDJSON (see :mod:`api.transfer`).
+
+    Send the file as the request body (``text/csv`` / ``application/x-ndjson``)
+    or as the ``file`` field of a multipart upload. Valid rows are saved and
+    invalid ones reported by line number.
+    """
+
+    parser_classes = [StreamParser, NDJSONStreamParser, MultiPartParser]
+    # Covers connection timeouts on a Pi; larger loads belong in `import_kennel_data`.
+    batch_size = 1000
+
+    def create(self, request, *args, **kwargs):
+        upload = request.data.get("file") if hasattr(request.data, "get") else request.data
+        if not hasattr(upload, "read"):
+            raise ValidationError({"file": "Upload a CSV or NDJSON file."})
+        fmt = transfer.detect_format(
+            getattr(upload, "content_type", None) or request.content_type,
+            getattr(upload, "name", None) or "",
+        )
+        records = transfer.read_records(codecs.iterdecode(upload, "utf-8-sig"), fmt)
+        try:
+            report = transfer.Importer(self.batch_size).run(records)
+        except UnicodeDecodeError as exc:
+            raise ValidationError({"file": "Files must be UTF-8 encoded."}) from exc
+        return Response(report.as_dict())
+
+
+def json_response(data) -> HttpResponse:
+    """What DRF's ``Response(data)`` renders to for a JSON client."""
+    response = HttpResponse(fastjson.dumps(data), content_type="application/json")
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+# Router URL name -> async BookingViewSet handler.
+ASYNC_READS = {"booking-list": "alist", "booking-current": "acurrent"}
+
+
+def async_reads(pattern: URLPattern) -> URLPattern:
+    """Give a router URL an async fast path for plain JSON reads (``HOUNDZ_ASYNC_VIEWS``).
+
+    Under ASGI a DRF view runs in a worker thread; the async handlers wait
+    on the database without holding one, so a uvicorn worker can serve many
+    tablets at once. Anything the async handler cannot answer identically
+    (writes, ``?fields=``/``?expand=``, pagination, the browsable API,
+    invalid filters) is passed to the DRF view unchanged.
+    """
+    handler = ASYNC_READS.get(pattern.name)
+    # Format-suffix variants (bookings.json) capture a ``format`` group.
+    if handler is None or pattern.pattern.regex.groupindex:
+        return pattern
+    fallback = pattern.callback
+    run_fallback = sync_to_async(fallback)
+
+    async def view(request, *args, **kwargs):
+        viewset = BookingViewSet(
+            request=Request(request), args=args, kwargs=kwargs, format_kwarg=None
+        )
+        viewset.action = fallback.actions.get(request.method.lower())
+        if viewset.can_read_async(viewset.request):
+            try:
+                return await getattr(viewset, handler)(request)
+            except ValidationError:
+                pass  # DRF renders the 400
+        return await run_fallback(request, *args, **kwargs)
+
+    view.actions = fallback.actions
+    view.csrf_exempt = True  # as DRF views are; SessionAuthentication enforces CSRF
+    return URLPattern(pattern.pattern, view, pattern.default_args, pattern.name)
+
+
+class ExportNegotiation(BaseContentNegotiation):
+    """Always JSON for errors: ``?format=`` names the export format, not a renderer."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class ExportView(APIView):
+    """Stream every suite, owner, pet and booking as ``?format=ndjson`` (default) or ``csv``.
+
+    ``?types=owner,pet`` limits the export; the output can be fed back to
+    the import endpoint or the ``import_kennel_data`` command. Exports hold
+    owners' contact details, so unlike the other reads they need a login.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [fastjson.JSONRenderer]
+    content_negotiation_class = ExportNegotiation
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("format") or "ndjson"
+        kinds = [kind for kind in request.query_params.get("types", "").split(",") if kind] or transfer.KINDS
+        unknown = set(kinds) - set(transfer.KINDS)
+        if fmt not in transfer.FORMATS or unknown:
+            return HttpResponseBadRequest(
+                f"Use format=ndjson|csv and types from: {', '.join(transfer.KINDS)}."
+            )
+        records = transfer.export_records(kinds)
+        response = StreamingHttpResponse(
+            transfer.render_records(records, fmt), content_type=transfer.FORMATS[fmt]
         )
-        serializer = self.get_serializer(current_bookings, many=True)
-        return Response(serializer.data)
+        response["Content-Disposition"] = f'attachment; filename="houndz-export.{fmt}"'
+        return response
+
+
+async def change_feed(request):
+    """Server-sent event stream of model changes (requires an ASGI server).
+
+    Each stream ends after ``CHANGE_FEED_MAX_SECONDS``; browsers reconnect on
+    their own and catch up through `/api/sync/`. This bounds how long a
+    stream can outlive a client that disconnected without us noticing.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Streaming would pin a sync worker; clients fall back to polling.
+        return JsonResponse({"detail": "Change feed requires an ASGI server."}, status=503)
+
+    broker = events.get_broker()
+    heartbeat = settings.CHANGE_FEED_HEARTBEAT_SECONDS
+    deadline = time.monotonic() + settings.CHANGE_FEED_MAX_SECONDS
+
+    async def stream():
+        async with broker.subscribe() as subscription:
+            yield "retry: 5000\n\n"
+            while time.monotonic() < deadline:
+                event = await subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: change\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
 
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
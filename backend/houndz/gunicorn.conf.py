@@ -1,12 +1,74 @@
+"""Gunicorn settings, sized for a Raspberry Pi-class host by default.
+
+ASGI (recommended, required for the live change feed)::
+
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker HOUNDZ_ASYNC_VIEWS=true \
+        gunicorn -c houndz/gunicorn.conf.py houndz.asgi:application
+
+WSGI::
+
+    gunicorn -c houndz/gunicorn.conf.py houndz.wsgi:application
+
+See docs/deployment.md ("Workers and Memory") for the measurements behind
+the defaults.
+"""
+
 import multiprocessing
 import os
 
+# Resident memory of one booted Django worker, rounded up (see docs/deployment.md).
+WORKER_MEMORY_MB = int(os.environ.get("GUNICORN_WORKER_MEMORY_MB", "80"))
+
+
+def _memory_mb():
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def default_workers(cpus, memory_mb, asgi):
+    # Uvicorn workers wait on Postgres without blocking, so one per core keeps
+    # every core busy; sync workers sit idle during each query and need more.
+    count = cpus if asgi else cpus * 2 + 1
+    if memory_mb:
+        # Leave half the RAM to Postgres, nginx and the page cache.
+        count = min(count, memory_mb // 2 // WORKER_MEMORY_MB)
+    return max(count, 1)
+
+
 bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
-workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+workers = int(
+    os.environ.get(
+        "GUNICORN_WORKERS",
+        default_workers(multiprocessing.cpu_count(), _memory_mb(), "uvicorn" in worker_class),
+    )
+)
 accesslog = "-"
 errorlog = "-"
 loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
 timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
 graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
-worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
 preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() in {"1", "true", "yes"}
+# Recycle workers now and then so slow leaks cannot grow past the memory budget.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+# Worker heartbeats go to RAM, not the SD card.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def when_ready(server):
+    # With preload_app the master has already set Django up; importing the
+    # URLconf (and so every view) here as well means forked workers share
+    # those pages and skip the import on their first request.
+    if preload_app:
+        from django.urls import get_resolver
+
+        get_resolver().url_patterns
@@ -0,0 +1,43 @@
+"""Lean profile for API-only workers (``DJANGO_SETTINGS_MODULE=houndz.settings.api``).
+
+Tablets only talk to ``/api/``, so these workers skip the admin, messages,
+static files, templates and the browsable API. Everything else matches
+``houndz.settings.prod``. Sessions and auth stay: writes are authenticated
+with the staff session cookie set by the admin login. Keep at least one
+worker on ``houndz.settings.prod`` for ``/admin/`` and ``/static/`` (see
+docs/deployment.md, "API-only Workers").
+"""
+
+from __future__ import annotations
+
+from .prod import *  # noqa: F401,F403
+from .prod import MIDDLEWARE, REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "corsheaders",
+    "rest_framework",
+    "api",
+]
+
+# DRF enforces CSRF itself for session-authenticated writes, so the CSRF
+# middleware only served the admin, like messages and frame options.
+UNUSED_MIDDLEWARE = {
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+}
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in UNUSED_MIDDLEWARE]
+
+ROOT_URLCONF = "houndz.urls_api"
+
+# Error pages fall back to Django's built-in ones.
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["api.fastjson.JSONRenderer"],
+}
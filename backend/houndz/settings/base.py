@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Iterable
 
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 
 SETTINGS_DIR = Path(__file__).resolve().parent
@@ -26,6 +27,33 @@ def env_bool(key: str, default: bool = False) -> bool:
     return value.lower() in {"1", "true", "yes", "on"}
 
 
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def cache_config(url: str) -> dict:
+    """A CACHES entry from ``locmem://``, ``file:///path``, ``redis://host:6379/0`` or ``dummy://``."""
+    scheme, _, location = url.partition("://")
+    if scheme not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(f"Unsupported cache URL {url!r}.")
+    config = {"BACKEND": CACHE_BACKENDS[scheme]}
+    if scheme.startswith("redis"):
+        config["LOCATION"] = url
+    elif scheme == "file":
+        config["LOCATION"] = location
+    elif scheme == "locmem":
+        config["LOCATION"] = location or "houndz"
+    if scheme in {"locmem", "file"}:
+        # Django's default of 300 entries would churn through per-pet lookups.
+        config["OPTIONS"] = {"MAX_ENTRIES": int(os.environ.get("HOUNDZ_CACHE_MAX_ENTRIES", "10000"))}
+    return config
+
+
 SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "insecure-development-key")
 
 DEBUG = env_bool("DJANGO_DEBUG", False)
@@ -48,6 +76,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.metrics.MetricsMiddleware",
+    "api.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -90,6 +120,56 @@ DATABASES = {
     )
 }
 
+# With HOUNDZ_DB_POOL=true, PostgreSQL goes through api.postgres: each worker
+# checks connections out of a small psycopg pool rather than holding one
+# persistent connection for 10 minutes. A worker opens at most
+# HOUNDZ_DB_POOL_MAX_SIZE connections, closes ones idle for
+# HOUNDZ_DB_POOL_MAX_IDLE seconds (keeping MIN_SIZE), and waits up to
+# HOUNDZ_DB_POOL_TIMEOUT seconds for a free one before the request fails.
+# Opt-in until it has been load-tested against a real deployment.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql" and env_bool("HOUNDZ_DB_POOL", False):
+    DATABASES["default"].update(ENGINE="api.postgres", CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=True)
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("HOUNDZ_DB_POOL_MIN_SIZE", "0")),
+            "max_size": int(os.environ.get("HOUNDZ_DB_POOL_MAX_SIZE", "4")),
+            "max_idle": float(os.environ.get("HOUNDZ_DB_POOL_MAX_IDLE", "60")),
+            "timeout": float(os.environ.get("HOUNDZ_DB_POOL_TIMEOUT", "10")),
+        },
+        **DATABASES["default"].get("OPTIONS", {}),
+    }
+
+# SQLite (the quick-start default) runs through api.sqlite: WAL so readers
+# never block the writer, a busy timeout, and BEGIN IMMEDIATE so concurrent
+# writers queue instead of failing with "database is locked". Set
+# HOUNDZ_SQLITE_TUNED=false for Django's stock backend.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3" and env_bool("HOUNDZ_SQLITE_TUNED", True):
+    DATABASES["default"]["ENGINE"] = "api.sqlite"
+    DATABASES["default"]["OPTIONS"] = {
+        "transaction_mode": "IMMEDIATE",
+        "init_command": ";".join(
+            [
+                "PRAGMA journal_mode=WAL",
+                f"PRAGMA busy_timeout={int(os.environ.get('HOUNDZ_SQLITE_BUSY_TIMEOUT_MS', '5000'))}",
+                # Safe with WAL: a power cut can lose the last commits, never corrupt.
+                "PRAGMA synchronous=NORMAL",
+                f"PRAGMA mmap_size={int(os.environ.get('HOUNDZ_SQLITE_MMAP_MB', '128')) * 1024 * 1024}",
+                # Negative sizes are KiB: per connection, so per worker.
+                f"PRAGMA cache_size=-{int(os.environ.get('HOUNDZ_SQLITE_CACHE_MB', '16')) * 1024}",
+                "PRAGMA temp_store=MEMORY",
+            ]
+        ),
+        **DATABASES["default"].get("OPTIONS", {}),
+    }
+
+# Reference-data cache (api.caching): suite/owner/pet lists and pet/suite
+# lookups, invalidated by model signals. locmem is per worker, so it only
+# caches lists (keyed by their DB version) and lookups always query; point
+# HOUNDZ_CACHE_URL at Redis (needs the `redis` package) to share one cache
+# between workers.
+CACHES = {"default": cache_config(os.environ.get("HOUNDZ_CACHE_URL", "locmem://"))}
+CACHE_SECONDS = int(os.environ.get("HOUNDZ_CACHE_SECONDS", "60"))
+
 AUTH_PASSWORD_VALIDATORS: Iterable[dict[str, str]] = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -130,12 +210,74 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
+    # orjson-backed drop-ins for DRF's JSON renderer and parser (api.fastjson).
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "api.fastjson.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.fastjson.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Opt-in: list endpoints paginate only when ?page_size= or ?cursor= is sent.
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.OptInCursorPagination",
+    "PAGE_SIZE": 100,
 }
 
+# Deletes are kept as tombstones for delta-sync clients; clients whose cursor
+# is older than this get a full snapshot instead.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("HOUNDZ_SYNC_TOMBSTONE_DAYS", "30"))
+
+# `archive_bookings` moves checked-out bookings that ended more than this many
+# days ago into the archive table (api.archive); history stays readable.
+ARCHIVE_AFTER_DAYS = int(os.environ.get("HOUNDZ_ARCHIVE_AFTER_DAYS", "365"))
+
+# Per-suite lock files that serialize booking writes on backends without the
+# PostgreSQL exclusion constraint (SQLite). Defaults to a temp directory.
+BOOKING_LOCK_DIR = os.environ.get("HOUNDZ_BOOKING_LOCK_DIR", "")
+
+# Live change feed (/api/events/). On PostgreSQL events reach every worker via
+# LISTEN/NOTIFY; LocalBroker only reaches streams on the worker that saved.
+CHANGE_FEED_BROKER = os.environ.get(
+    "HOUNDZ_CHANGE_FEED_BROKER",
+    "api.events.PostgresBroker"
+    if DATABASES["default"]["ENGINE"] in {"django.db.backends.postgresql", "api.postgres"}
+    else "api.events.LocalBroker",
+)
+CHANGE_FEED_HEARTBEAT_SECONDS = int(os.environ.get("HOUNDZ_CHANGE_FEED_HEARTBEAT", "15"))
+CHANGE_FEED_MAX_SECONDS = int(os.environ.get("HOUNDZ_CHANGE_FEED_MAX_SECONDS", "300"))
+
+# Seconds to keep /api/bookings/current/ payloads in the cache above (0 disables).
+# Entries are keyed by the ETag's data version, so per-worker caches stay correct.
+CURRENT_BOOKINGS_CACHE_SECONDS = int(os.environ.get("HOUNDZ_CURRENT_CACHE_SECONDS", "0"))
+
+# Serve plain JSON booking lists and /bookings/current/ from async views
+# (api.views.async_reads). Enable with ASGI (uvicorn) workers; under WSGI
+# every request would pay for starting an event loop.
+ASYNC_READ_VIEWS = env_bool("HOUNDZ_ASYNC_VIEWS", False)
+if ASYNC_READ_VIEWS:
+    # WhiteNoise is sync-only: in the middleware chain it would run every
+    # request through a worker thread. Nginx serves /static/ instead.
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+    # ASGI requests each get a fresh thread, so persistent connections would
+    # pile up instead of being reused (on PostgreSQL the pool reuses them).
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+# Per-endpoint request metrics (api.metrics), scraped from METRICS_PATH. Every
+# request is counted; only the sampled share is timed for DB and serializers
+# and logged. Set HOUNDZ_METRICS_TOKEN to require "Authorization: Bearer <token>".
+METRICS_ENABLED = env_bool("HOUNDZ_METRICS", True)
+METRICS_SAMPLE_RATE = float(os.environ.get("HOUNDZ_METRICS_SAMPLE_RATE", "0.1"))
+METRICS_PATH = "/metrics"
+METRICS_TOKEN = os.environ.get("HOUNDZ_METRICS_TOKEN", "")
+
+# Brotli/gzip for JSON, CSV and NDJSON bodies of at least COMPRESS_MIN_BYTES,
+# negotiated from Accept-Encoding (api.compression). Set HOUNDZ_COMPRESSION=false
+# when a proxy in front compresses everything already.
+COMPRESSION_ENABLED = env_bool("HOUNDZ_COMPRESSION", True)
+COMPRESS_MIN_BYTES = int(os.environ.get("HOUNDZ_COMPRESS_MIN_BYTES", "1024"))
+
 LOG_LEVEL = os.environ.get("DJANGO_LOG_LEVEL", "INFO")
 
 LOGGING = {
@@ -3,17 +3,13 @@
 from __future__ import annotations
 
 from django.contrib import admin
-from django.http import HttpResponse
-from django.urls import include, path
+from django.urls import path
 
-
-def healthcheck_view(_: object) -> HttpResponse:
-    return HttpResponse("ok", content_type="text/plain")
+from .urls_api import urlpatterns as api_urlpatterns
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/health/", healthcheck_view, name="healthcheck"),
-    path("api/", include("api.urls")),
+    *api_urlpatterns,
 ]
 
 from django.conf import settings
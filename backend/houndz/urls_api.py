@@ -0,0 +1,19 @@
+"""URL configuration for API-only workers (``houndz.settings.api``)."""
+
+from __future__ import annotations
+
+from django.http import HttpResponse
+from django.urls import include, path
+
+from api.metrics import metrics_view
+
+
+def healthcheck_view(_: object) -> HttpResponse:
+    return HttpResponse("ok", content_type="text/plain")
+
+
+urlpatterns = [
+    path("api/health/", healthcheck_view, name="healthcheck"),
+    path("api/", include("api.urls")),
+    path("metrics", metrics_view, name="metrics"),
+]
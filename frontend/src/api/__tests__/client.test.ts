@@ -0,0 +1,92 @@
+import { describe, expect, it } from "vitest";
+
+import { changeEventToPayload, mergeSyncPayload } from "../client";
+import type { Booking, Owner, Pet, Suite, SyncPayload } from "@/types";
+
+const suite: Suite = { id: 1, label: "Suite 1", notes: "", created_at: "", updated_at: "" };
+const owner: Owner = {
+  id: 1,
+  name: "Jane Doe",
+  phone: "",
+  email: "",
+  created_at: "",
+  updated_at: ""
+};
+const pet: Pet = {
+  id: 1,
+  name: "Buddy",
+  breed: "",
+  weight_kg: null,
+  special_needs: [],
+  owner,
+  created_at: "",
+  updated_at: ""
+};
+const booking: Booking = {
+  id: 1,
+  pet,
+  suite,
+  start_date: "2024-01-01",
+  end_date: "2024-01-05",
+  status: "booked",
+  bathed: false,
+  notes: "",
+  created_at: "",
+  updated_at: ""
+};
+
+const emptyPayload = (overrides: Partial<SyncPayload>): SyncPayload => ({
+  cursor: "2024-01-01T00:00:00+00:00",
+  full: false,
+  suites: [],
+  owners: [],
+  pets: [],
+  bookings: [],
+  deleted: { suites: [], owners: [], pets: [], bookings: [] },
+  ...overrides
+});
+
+describe("mergeSyncPayload", () => {
+  const state = { suites: [suite], owners: [owner], pets: [pet], bookings: [booking] };
+
+  it("leaves state untouched for an empty delta", () => {
+    const merged = mergeSyncPayload(state, emptyPayload({}));
+    expect(merged.bookings).toBe(state.bookings);
+    expect(merged.pets).toBe(state.pets);
+  });
+
+  it("upserts changed rows and drops deleted ones", () => {
+    const later = { ...booking, id: 2, start_date: "2024-02-01", end_date: "2024-02-03" };
+    const merged = mergeSyncPayload(
+      { ...state, bookings: [booking, later] },
+      emptyPayload({
+        bookings: [{ ...booking, bathed: true }],
+        deleted: { suites: [], owners: [], pets: [], bookings: [2] }
+      })
+    );
+    expect(merged.bookings).toHaveLength(1);
+    expect(merged.bookings[0].bathed).toBe(true);
+  });
+
+  it("refreshes nested owners inside pets and bookings", () => {
+    const renamed = { ...owner, name: "Jane Smith" };
+    const merged = mergeSyncPayload(state, emptyPayload({ owners: [renamed] }));
+    expect(merged.pets[0].owner.name).toBe("Jane Smith");
+    expect(merged.bookings[0].pet.owner.name).toBe("Jane Smith");
+  });
+});
+
+describe("changeEventToPayload", () => {
+  it("turns a delete event into a tombstone-only delta", () => {
+    const payload = changeEventToPayload(
+      { op: "delete", collection: "bookings", id: 1 },
+      "2024-01-01T00:00:00+00:00"
+    );
+    const merged = mergeSyncPayload(
+      { suites: [suite], owners: [owner], pets: [pet], bookings: [booking] },
+      payload
+    );
+    expect(merged.bookings).toHaveLength(0);
+    expect(merged.pets).toHaveLength(1);
+  });
+});
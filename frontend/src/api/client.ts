@@ -1,11 +1,22 @@
 import axios from "axios";
 
 import type {
+  Availability,
   Booking,
+  BookingFilters,
+  BulkBookingItem,
+  ChangeEvent,
   CreateBookingPayload,
+  Dashboard,
   Owner,
   Pet,
+  SearchPage,
   Suite,
+  SuiteAssignment,
+  SuiteRequest,
+  SuiteSuggestions,
+  SyncCollections,
+  SyncPayload,
   UpdateBookingPayload
 } from "@/types";
 
@@ -21,6 +32,13 @@ const client = axios.create({
 
 const getData = <T>(response: { data: T }) => response.data;
 
+const toQueryParams = (filters: BookingFilters) =>
+  Object.fromEntries(
+    Object.entries(filters)
+      .filter(([, value]) => value !== undefined && value !== "")
+      .map(([key, value]) => [key, Array.isArray(value) ? value.join(",") : value])
+  );
+
 export const api = {
   // Suites
   listSuites: async (): Promise<Suite[]> => client.get<Suite[]>("/suites/").then(getData),
@@ -54,17 +72,171 @@ export const api = {
   },
 
   // Bookings
-  listBookings: async (): Promise<Booking[]> =>
-    client.get<Booking[]>("/bookings/").then(getData),
+  listBookings: async (filters: BookingFilters = {}): Promise<Booking[]> =>
+    client.get<Booking[]>("/bookings/", { params: toQueryParams(filters) }).then(getData),
   createBooking: async (payload: CreateBookingPayload): Promise<Booking> =>
     client.post<Booking>("/bookings/", payload).then(getData),
   updateBooking: async (id: number, payload: UpdateBookingPayload): Promise<Booking> =>
     client.patch<Booking>(`/bookings/${id}/`, payload).then(getData),
+  // All-or-nothing; a 400 carries one error object per submitted item.
+  bulkSaveBookings: async (items: BulkBookingItem[]): Promise<Booking[]> =>
+    client.post<Booking[]>("/bookings/bulk/", items).then(getData),
   deleteBooking: async (id: number): Promise<void> => {
     await client.delete(`/bookings/${id}/`);
   },
+  // Best-fitting free suites for a stay, best first.
+  suggestSuites: async ({ features, ...request }: SuiteRequest): Promise<SuiteSuggestions> =>
+    client
+      .get<SuiteSuggestions>("/bookings/suggest/", {
+        params: { ...request, features },
+        paramsSerializer: { indexes: null }
+      })
+      .then(getData),
+  // Results align with `requests`; with `save` the stays that fit are booked.
+  assignSuites: async (requests: SuiteRequest[], save = false): Promise<SuiteAssignment[]> =>
+    client
+      .post<{ assignments: SuiteAssignment[] }>("/bookings/assign/", { requests, save })
+      .then((response) => response.data.assignments),
+  // Live and archived stays; needs a pet, owner, suite or date filter.
+  getBookingHistory: async (filters: BookingFilters): Promise<Booking[]> =>
+    client.get<Booking[]>("/bookings/history/", { params: toQueryParams(filters) }).then(getData),
   getCurrentBookings: async (): Promise<Booking[]> =>
-    client.get<Booking[]>("/bookings/current/").then(getData)
+    client.get<Booking[]>("/bookings/current/").then(getData),
+  getAvailability: async (start: string, end: string = start): Promise<Availability> =>
+    client.get<Availability>("/availability/", { params: { start, end } }).then(getData),
+  // Omit `date` for today in the server's time zone.
+  getDashboard: async (date?: string): Promise<Dashboard> =>
+    client.get<Dashboard>("/dashboard/", { params: date ? { date } : undefined }).then(getData),
+  // Typeahead over owners and pets (active stays included); best match first.
+  search: async (q: string, limit = 10, offset = 0): Promise<SearchPage> =>
+    client.get<SearchPage>("/search/", { params: { q, limit, offset } }).then(getData),
+
+  // Delta sync: omit `since` for a full snapshot, then pass back `cursor`.
+  sync: async (since?: string): Promise<SyncPayload> =>
+    client.get<SyncPayload>("/sync/", { params: since ? { since } : undefined }).then(getData)
+};
+
+interface ChangeFeedHandlers {
+  onEvent: (event: ChangeEvent) => void;
+  onOpen: () => void;
+  onError: () => void;
+}
+
+/**
+ * Subscribe to the `/events/` server-sent change feed.
+ *
+ * Returns an unsubscribe function, or `undefined` when the browser has no
+ * EventSource support and callers should keep polling instead.
+ */
+export const subscribeToChanges = ({
+  onEvent,
+  onOpen,
+  onError
+}: ChangeFeedHandlers): (() => void) | undefined => {
+  if (typeof EventSource === "undefined") return undefined;
+  const source = new EventSource(`${API_BASE_URL}/events/`);
+  source.addEventListener("open", onOpen);
+  source.addEventListener("error", onError);
+  source.addEventListener("change", (message) => {
+    onEvent(JSON.parse((message as MessageEvent<string>).data) as ChangeEvent);
+  });
+  return () => source.close();
+};
+
+/** Express a single upsert/delete change event as a delta-sync payload. */
+export const changeEventToPayload = (
+  event: Exclude<ChangeEvent, { op: "resync" }>,
+  cursor: string
+): SyncPayload => {
+  const payload: SyncPayload = {
+    cursor,
+    full: false,
+    suites: [],
+    owners: [],
+    pets: [],
+    bookings: [],
+    deleted: { suites: [], owners: [], pets: [], bookings: [] }
+  };
+  if (event.op === "delete") {
+    payload.deleted[event.collection].push(event.id);
+  } else {
+    (payload[event.collection] as Array<typeof event.data>).push(event.data);
+  }
+  return payload;
+};
+
+const byText =
+  <T>(key: (item: T) => string) =>
+  (left: T & { id: number }, right: T & { id: number }) =>
+    key(left).localeCompare(key(right)) || left.id - right.id;
+
+const collectionOrder = {
+  suites: byText<Suite>((suite) => suite.label),
+  owners: byText<Owner>((owner) => owner.name),
+  pets: byText<Pet>((pet) => pet.name),
+  bookings: byText<Booking>((booking) => booking.start_date)
+};
+
+const mergeRows = <T extends { id: number }>(
+  current: T[],
+  changed: T[],
+  deleted: number[],
+  compare: (left: T, right: T) => number
+): T[] => {
+  if (!changed.length && !deleted.length) return current;
+  const rows = new Map(current.map((row) => [row.id, row]));
+  changed.forEach((row) => rows.set(row.id, row));
+  deleted.forEach((id) => rows.delete(id));
+  return Array.from(rows.values()).sort(compare);
+};
+
+/**
+ * Apply a `/sync/` payload to previously synced collections.
+ *
+ * Pets embed their owner and bookings embed their pet and suite, so nested
+ * copies are re-pointed at the freshest owner/pet/suite rows after merging.
+ */
+export const mergeSyncPayload = (
+  state: SyncCollections,
+  payload: SyncPayload
+): SyncCollections => {
+  if (payload.full) {
+    return {
+      suites: payload.suites,
+      owners: payload.owners,
+      pets: payload.pets,
+      bookings: payload.bookings
+    };
+  }
+
+  const suites = mergeRows(state.suites, payload.suites, payload.deleted.suites, collectionOrder.suites);
+  const owners = mergeRows(state.owners, payload.owners, payload.deleted.owners, collectionOrder.owners);
+  let pets = mergeRows(state.pets, payload.pets, payload.deleted.pets, collectionOrder.pets);
+  let bookings = mergeRows(
+    state.bookings,
+    payload.bookings,
+    payload.deleted.bookings,
+    collectionOrder.bookings
+  );
+
+  if (payload.owners.length) {
+    const ownerById = new Map(owners.map((owner) => [owner.id, owner]));
+    pets = pets.map((pet) => {
+      const owner = ownerById.get(pet.owner.id);
+      return owner && owner !== pet.owner ? { ...pet, owner } : pet;
+    });
+  }
+  if (payload.owners.length || payload.pets.length || payload.suites.length) {
+    const petById = new Map(pets.map((pet) => [pet.id, pet]));
+    const suiteById = new Map(suites.map((suite) => [suite.id, suite]));
+    bookings = bookings.map((booking) => {
+      const pet = petById.get(booking.pet.id) ?? booking.pet;
+      const suite = suiteById.get(booking.suite.id) ?? booking.suite;
+      return pet !== booking.pet || suite !== booking.suite ? { ...booking, pet, suite } : booking;
+    });
+  }
+
+  return { suites, owners, pets, bookings };
 };
 
 export type ApiClient = typeof api;
@@ -1,5 +1,5 @@
 import clsx from "clsx";
-import { useMemo, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 
 import type { Booking, Suite } from "@/types";
 import { formatDisplayDate, getWeekDates, toDate } from "@/utils/date";
@@ -8,6 +8,7 @@ import { statusColors, statusLabels } from "@/utils/status";
 interface WeeklyCalendarProps {
   suites: Suite[];
   bookings: Booking[];
+  onWeekChange?: (week: Date[]) => void;
 }
 
 const startOfWeek = (anchor: Date) => {
@@ -23,11 +24,19 @@ const isSameDay = (left: Date, right: Date) =>
   left.getMonth() === right.getMonth() &&
   left.getDate() === right.getDate();
 
-export const WeeklyCalendar: React.FC<WeeklyCalendarProps> = ({ suites, bookings }) => {
+export const WeeklyCalendar: React.FC<WeeklyCalendarProps> = ({
+  suites,
+  bookings,
+  onWeekChange
+}) => {
   const [anchor, setAnchor] = useState(() => startOfWeek(new Date()));
   const week = useMemo(() => getWeekDates(anchor), [anchor]);
   const today = new Date();
 
+  useEffect(() => {
+    onWeekChange?.(week);
+  }, [week, onWeekChange]);
+
   const bookingLookup = useMemo(() => {
     const map = new Map<number, Booking[]>();
     bookings.forEach((booking) => {
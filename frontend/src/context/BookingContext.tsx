@@ -4,11 +4,17 @@ import {
   useContext,
   useEffect,
   useMemo,
-  useReducer
+  useReducer,
+  useRef
 } from "react";
 import type { ReactNode } from "react";
 
-import { api } from "@/api/client";
+import {
+  api,
+  changeEventToPayload,
+  mergeSyncPayload,
+  subscribeToChanges
+} from "@/api/client";
 import { useToast } from "@/context/ToastContext";
 import type {
   Booking,
@@ -16,8 +22,10 @@ import type {
   Owner,
   Pet,
   Suite,
+  SyncPayload,
   UpdateBookingPayload
 } from "@/types";
+import { toIsoDate } from "@/utils/date";
 
 interface BookingState {
   suites: Suite[];
@@ -28,10 +36,12 @@ interface BookingState {
   loading: boolean;
   error?: string;
   lastSynced?: string;
+  /** When a sync last changed a booking; views that fetch their own bookings refetch on it. */
+  bookingsChanged?: string;
 }
 
 type BookingAction =
-  | { type: "SET_DATA"; payload: Partial<BookingState> }
+  | { type: "APPLY_SYNC"; payload: SyncPayload }
   | { type: "SET_LOADING"; payload: boolean }
   | { type: "SET_ERROR"; payload?: string };
 
@@ -44,19 +54,32 @@ const initialState: BookingState = {
   loading: false
 };
 
+const selectCurrent = (bookings: Booking[]): Booking[] => {
+  const today = toIsoDate(new Date());
+  return bookings.filter(
+    (booking) =>
+      booking.status === "checked-in" && booking.start_date <= today && booking.end_date >= today
+  );
+};
+
 const reducer = (state: BookingState, action: BookingAction): BookingState => {
   switch (action.type) {
     case "SET_LOADING":
       return { ...state, loading: action.payload };
     case "SET_ERROR":
       return { ...state, error: action.payload };
-    case "SET_DATA":
+    case "APPLY_SYNC": {
+      const merged = mergeSyncPayload(state, action.payload);
+      const now = new Date().toISOString();
       return {
         ...state,
-        ...action.payload,
-        lastSynced: new Date().toISOString(),
-        error: action.payload.error ?? state.error
+        ...merged,
+        current: selectCurrent(merged.bookings),
+        lastSynced: now,
+        bookingsChanged: merged.bookings === state.bookings ? state.bookingsChanged : now,
+        error: undefined
       };
+    }
     default:
       return state;
   }
@@ -77,6 +100,8 @@ export interface BookingContextValue extends BookingState {
 export const BookingContext = createContext<BookingContextValue | undefined>(undefined);
 
 const POLL_INTERVAL = Number(import.meta.env.VITE_BOOKING_POLL_MS ?? 30_000);
+// With the change feed connected, only every this-many poll ticks syncs.
+const FEED_POLL_EVERY = 10;
 
 interface BookingProviderProps {
   children: ReactNode;
@@ -85,21 +110,17 @@ interface BookingProviderProps {
 export const BookingProvider = ({ children }: BookingProviderProps) => {
   const [state, dispatch] = useReducer(reducer, initialState);
   const toast = useToast();
+  const syncCursor = useRef<string>();
+  const feedConnected = useRef(false);
 
+  // The first load fetches a full snapshot; later loads only pull rows
+  // changed since the cursor the server handed back last time.
   const loadAll = useCallback(async (silenceErrors = false) => {
     dispatch({ type: "SET_LOADING", payload: true });
     try {
-      const [suites, owners, pets, bookings, current] = await Promise.all([
-        api.listSuites(),
-        api.listOwners(),
-        api.listPets(),
-        api.listBookings(),
-        api.getCurrentBookings()
-      ]);
-      dispatch({
-        type: "SET_DATA",
-        payload: { suites, owners, pets, bookings, current, error: undefined }
-      });
+      const payload = await api.sync(syncCursor.current);
+      syncCursor.current = payload.cursor;
+      dispatch({ type: "APPLY_SYNC", payload });
     } catch (error) {
       console.error("Failed to load booking data", error);
       if (!silenceErrors) {
@@ -271,12 +292,46 @@ export const BookingProvider = ({ children }: BookingProviderProps) => {
   useEffect(() => {
     loadAll();
 
+    // While the change feed is connected, pushed events keep state fresh and
+    // polling slows to every FEED_POLL_EVERY-th tick. That still catches
+    // writes the feed missed, e.g. from another worker without a shared broker.
+    const unsubscribe = subscribeToChanges({
+      onOpen: () => {
+        feedConnected.current = true;
+        if (syncCursor.current) {
+          loadAll(true);
+        }
+      },
+      onError: () => {
+        feedConnected.current = false;
+      },
+      onEvent: (event) => {
+        if (event.op === "resync") {
+          loadAll(true);
+          return;
+        }
+        dispatch({
+          type: "APPLY_SYNC",
+          payload: changeEventToPayload(event, syncCursor.current ?? "")
+        });
+      }
+    });
+
+    let interval: number | undefined;
+    let ticks = 0;
     if (Number.isFinite(POLL_INTERVAL) && POLL_INTERVAL > 0) {
-      const interval = window.setInterval(() => loadAll(true), POLL_INTERVAL);
-      return () => window.clearInterval(interval);
+      interval = window.setInterval(() => {
+        ticks += 1;
+        if (!feedConnected.current || ticks % FEED_POLL_EVERY === 0) {
+          loadAll(true);
+        }
+      }, POLL_INTERVAL);
     }
 
-    return undefined;
+    return () => {
+      unsubscribe?.();
+      window.clearInterval(interval);
+    };
   }, [loadAll]);
 
   const value = useMemo<BookingContextValue>(
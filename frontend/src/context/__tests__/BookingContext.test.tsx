@@ -9,37 +9,21 @@ import { ToastProvider } from "../ToastContext";
 import { ToastViewport } from "../../components/common/ToastViewport";
 import { api } from "@/api/client";
 
-vi.mock("@/api/client", () => ({
+vi.mock("@/api/client", async (importOriginal) => ({
+  ...(await importOriginal<typeof import("@/api/client")>()),
   api: {
-    listSuites: vi.fn().mockResolvedValue([
-      { id: 1, label: "Suite 1", notes: "", created_at: "", updated_at: "" }
-    ]),
-    listOwners: vi.fn().mockResolvedValue([
-      { id: 1, name: "Jane Doe", phone: "", email: "", created_at: "", updated_at: "" }
-    ]),
-    listPets: vi.fn().mockResolvedValue([
-      {
-        id: 1,
-        name: "Buddy",
-        breed: "",
-        weight_kg: null,
-        special_needs: [],
-        owner: {
-          id: 1,
-          name: "Jane Doe",
-          phone: "",
-          email: "",
-          created_at: "",
-          updated_at: ""
-        },
-        created_at: "",
-        updated_at: ""
-      }
-    ]),
-    listBookings: vi.fn().mockResolvedValue([
-      {
-        id: 1,
-        pet: {
+    sync: vi.fn().mockResolvedValue({
+      cursor: "2024-01-01T00:00:00+00:00",
+      full: true,
+      deleted: { suites: [], owners: [], pets: [], bookings: [] },
+      suites: [
+        { id: 1, label: "Suite 1", notes: "", created_at: "", updated_at: "" }
+      ],
+      owners: [
+        { id: 1, name: "Jane Doe", phone: "", email: "", created_at: "", updated_at: "" }
+      ],
+      pets: [
+        {
           id: 1,
           name: "Buddy",
           breed: "",
@@ -55,18 +39,39 @@ vi.mock("@/api/client", () => ({
           },
           created_at: "",
           updated_at: ""
-        },
-        suite: { id: 1, label: "Suite 1", notes: "", created_at: "", updated_at: "" },
-        start_date: "2024-01-01",
-        end_date: "2024-01-05",
-        status: "booked" as const,
-        bathed: false,
-        notes: "",
-        created_at: "",
-        updated_at: ""
-      }
-    ]),
-    getCurrentBookings: vi.fn().mockResolvedValue([]),
+        }
+      ],
+      bookings: [
+        {
+          id: 1,
+          pet: {
+            id: 1,
+            name: "Buddy",
+            breed: "",
+            weight_kg: null,
+            special_needs: [],
+            owner: {
+              id: 1,
+              name: "Jane Doe",
+              phone: "",
+              email: "",
+              created_at: "",
+              updated_at: ""
+            },
+            created_at: "",
+            updated_at: ""
+          },
+          suite: { id: 1, label: "Suite 1", notes: "", created_at: "", updated_at: "" },
+          start_date: "2024-01-01",
+          end_date: "2024-01-05",
+          status: "booked" as const,
+          bathed: false,
+          notes: "",
+          created_at: "",
+          updated_at: ""
+        }
+      ]
+    }),
     createBooking: vi.fn(),
     updateBooking: vi.fn(),
     deleteBooking: vi.fn(),
@@ -1,9 +1,29 @@
+import { useCallback, useMemo, useState } from "react";
+
 import { WeeklyCalendar } from "@/components/calendar/WeeklyCalendar";
 import { Skeleton } from "@/components/common/Skeleton";
 import { useBookingContext } from "@/context/BookingContext";
+import { toIsoDate } from "@/utils/date";
 
 export const CalendarPage: React.FC = () => {
   const { bookings, suites, loading } = useBookingContext();
+  const [range, setRange] = useState<{ from: string; to: string }>();
+
+  const handleWeekChange = useCallback((week: Date[]) => {
+    setRange({ from: toIsoDate(week[0]), to: toIsoDate(week[week.length - 1]) });
+  }, []);
+
+  // Every booking is already synced (and kept current by the change feed),
+  // so the calendar only narrows the store to the visible week.
+  const weekBookings = useMemo(
+    () =>
+      range
+        ? bookings.filter(
+            (booking) => booking.start_date <= range.to && booking.end_date >= range.from
+          )
+        : bookings,
+    [bookings, range]
+  );
 
   return (
     <section className="space-y-6">
@@ -21,7 +41,11 @@ export const CalendarPage: React.FC = () => {
           <Skeleton className="h-64 w-full" />
         </div>
       ) : (
-        <WeeklyCalendar suites={suites} bookings={bookings} />
+        <WeeklyCalendar
+          suites={suites}
+          bookings={weekBookings}
+          onWeekChange={handleWeekChange}
+        />
       )}
     </section>
   );
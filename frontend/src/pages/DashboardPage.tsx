@@ -1,11 +1,12 @@
 import clsx from "clsx";
-import { useMemo, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 
+import { api } from "@/api/client";
 import { Alert } from "@/components/common/Alert";
 import { Skeleton } from "@/components/common/Skeleton";
 import { Spinner } from "@/components/common/Spinner";
 import { useBookingContext } from "@/context/BookingContext";
-import type { Booking } from "@/types";
+import type { Booking, Dashboard } from "@/types";
 import { formatDisplayDate } from "@/utils/date";
 
 type FilterMode = "all" | "checked-in" | "booked" | "vacant";
@@ -35,6 +36,7 @@ export const DashboardPage: React.FC = () => {
   const {
     suites,
     bookings,
+    bookingsChanged,
     loading,
     refreshAll,
     toggleBathed,
@@ -42,6 +44,22 @@ export const DashboardPage: React.FC = () => {
     checkOutBooking
   } = useBookingContext();
   const [filter, setFilter] = useState<FilterMode>("all");
+  const [summary, setSummary] = useState<Dashboard>();
+
+  // Today's counts and the forecast come from the server's summary, which
+  // stays a few queries however long the booking history grows.
+  useEffect(() => {
+    let cancelled = false;
+    api
+      .getDashboard()
+      .then((result) => {
+        if (!cancelled) setSummary(result);
+      })
+      .catch((error) => console.error("Failed to load dashboard summary", error));
+    return () => {
+      cancelled = true;
+    };
+  }, [bookingsChanged]);
 
   const occupancy = useMemo(() => {
     const bySuite = suites.map((suite) => {
@@ -124,6 +142,22 @@ export const DashboardPage: React.FC = () => {
         <StatPill label="Vacant" value={stats.vacant} color="bg-rose-600" />
       </div>
 
+      {summary ? (
+        <div className="space-y-3">
+          <div className="grid gap-4 md:grid-cols-3">
+            <StatPill label="Arrivals today" value={summary.counts.arrivals} color="bg-slate-800" />
+            <StatPill label="Departures today" value={summary.counts.departures} color="bg-slate-800" />
+            <StatPill label="Baths pending" value={summary.counts.bath_pending} color="bg-slate-800" />
+          </div>
+          <p className="text-xs text-slate-400">
+            Free suites:{" "}
+            {summary.forecast
+              .map((night) => `${formatDisplayDate(night.date)} ${night.free}`)
+              .join(" · ")}
+          </p>
+        </div>
+      ) : null}
+
   <div className="flex flex-wrap items-center gap-2">
         <span className="text-xs uppercase tracking-wide text-slate-400">Quick filters:</span>
         {(["all", "checked-in", "booked", "vacant"] as FilterMode[]).map((mode) => (
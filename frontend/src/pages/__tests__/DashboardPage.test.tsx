@@ -1,11 +1,18 @@
 import { act, render, screen } from "@testing-library/react";
 import userEvent from "@testing-library/user-event";
-import { describe, expect, it, vi } from "vitest";
+import { beforeEach, describe, expect, it, vi } from "vitest";
+import type { Mock } from "vitest";
 
+import { api } from "@/api/client";
 import { BookingContext, type BookingContextValue } from "@/context/BookingContext";
 import { ToastProvider } from "@/context/ToastContext";
 import { DashboardPage } from "../DashboardPage";
 
+vi.mock("@/api/client", async (importOriginal) => ({
+  ...(await importOriginal<typeof import("@/api/client")>()),
+  api: { getDashboard: vi.fn() }
+}));
+
 const suites = [{ id: 1, label: "Suite 1", notes: "", created_at: "", updated_at: "" }];
 
 const owner = {
@@ -61,6 +68,26 @@ const renderDashboard = (ctx: Partial<BookingContextValue>) =>
   );
 
 describe("DashboardPage", () => {
+  beforeEach(() => {
+    (api.getDashboard as Mock).mockResolvedValue({
+      date: "2024-05-01",
+      total_suites: 1,
+      counts: { arrivals: 2, departures: 1, in_house: 1, bath_pending: 3 },
+      arrivals: [],
+      departures: [],
+      bath_pending: [],
+      forecast: [{ date: "2024-05-01", occupied: 1, free: 0 }]
+    });
+  });
+
+  it("shows today's counts from the dashboard endpoint", async () => {
+    renderDashboard({});
+
+    expect(await screen.findByText("Baths pending")).toBeInTheDocument();
+    expect(screen.getByText("3")).toBeInTheDocument();
+    expect(api.getDashboard).toHaveBeenCalled();
+  });
+
   it("allows checking in a booked guest", async () => {
     const checkInBooking = vi.fn();
     renderDashboard({
@@ -4,6 +4,8 @@ export interface Suite {
   id: number;
   label: string;
   notes: string;
+  max_weight_kg?: number | null;
+  features?: string[];
   created_at: string;
   updated_at: string;
 }
@@ -53,6 +55,116 @@ export interface CreateBookingPayload {
 
 export interface UpdateBookingPayload extends Partial<CreateBookingPayload> {}
 
+// Items with an `id` update that booking; the rest are created.
+export type BulkBookingItem = CreateBookingPayload | (UpdateBookingPayload & { id: number });
+
+export interface BookingFilters {
+  from?: string;
+  to?: string;
+  status?: BookingStatus[];
+  suite?: number[];
+  pet?: number[];
+  owner?: number[];
+}
+
+export interface SyncCollections {
+  suites: Suite[];
+  owners: Owner[];
+  pets: Pet[];
+  bookings: Booking[];
+}
+
+export interface SyncPayload extends SyncCollections {
+  cursor: string;
+  full: boolean;
+  deleted: Record<keyof SyncCollections, number[]>;
+}
+
+export interface SuiteSummary {
+  id: number;
+  label: string;
+}
+
+export interface Availability {
+  start: string;
+  end: string;
+  total_suites: number;
+  free_suites: SuiteSummary[];
+  first_available: SuiteSummary | null;
+  days: { date: string; occupied: number; free: number }[];
+}
+
+export interface DashboardRow {
+  id: number;
+  pet: { id: number; name: string };
+  owner_name: string;
+  suite: SuiteSummary;
+  start_date: string;
+  end_date: string;
+  status: BookingStatus;
+  bathed: boolean;
+}
+
+export interface Dashboard {
+  date: string;
+  total_suites: number;
+  counts: { arrivals: number; departures: number; in_house: number; bath_pending: number };
+  arrivals: DashboardRow[];
+  departures: DashboardRow[];
+  bath_pending: DashboardRow[];
+  forecast: { date: string; occupied: number; free: number }[];
+}
+
+export type SearchResult =
+  | { type: "owner"; id: number; name: string; phone: string; email: string }
+  | {
+      type: "pet";
+      id: number;
+      name: string;
+      breed: string;
+      owner: { id: number; name: string };
+      bookings: {
+        id: number;
+        suite: SuiteSummary;
+        start_date: string;
+        end_date: string;
+        status: BookingStatus;
+      }[];
+    };
+
+export interface SearchPage {
+  next: string | null;
+  previous: string | null;
+  results: SearchResult[];
+}
+
+export interface SuiteRequest {
+  pet_id: number;
+  start_date: string;
+  end_date: string;
+  features?: string[];
+}
+
+export type SuiteAssignment =
+  | {
+      suite: SuiteSummary;
+      free_nights_before: number | null;
+      free_nights_after: number | null;
+      booking_id?: number;
+    }
+  | { suite: null; reason: string };
+
+export interface SuiteSuggestions {
+  required_features: string[];
+  suggestions: SuiteAssignment[];
+  reason: string;
+}
+
+export type ChangeEvent =
+  | { op: "upsert"; collection: keyof SyncCollections; id: number; data: SyncCollections[keyof SyncCollections][number] }
+  | { op: "delete"; collection: keyof SyncCollections; id: number }
+  | { op: "resync" };
+
 export interface ApiError {
   message: string;
   details?: Record<string, unknown>;
@@ -7,6 +7,13 @@ const formatter = new Intl.DateTimeFormat(undefined, {
 export const toDate = (input: string | Date): Date =>
   input instanceof Date ? input : new Date(input);
 
+export const toIsoDate = (input: Date): string =>
+  [
+    input.getFullYear(),
+    String(input.getMonth() + 1).padStart(2, "0"),
+    String(input.getDate()).padStart(2, "0")
+  ].join("-");
+
 export const formatDisplayDate = (input: string | Date): string => formatter.format(toDate(input));
 
 export const isDateWithinRange = (
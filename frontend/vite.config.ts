@@ -1,12 +1,45 @@
+import { readFileSync, writeFileSync } from "node:fs";
+import { join } from "node:path";
 import { fileURLToPath, URL } from "node:url";
+import { brotliCompressSync, constants, gzipSync } from "node:zlib";
 
 import react from "@vitejs/plugin-react";
-import { defineConfig } from "vite";
+import { defineConfig, type Plugin } from "vite";
 
 const DIST_ROOT = "../backend/staticfiles/frontend";
+const COMPRESSIBLE = /\.(js|css|html|svg|json)$/;
+const MIN_COMPRESS_BYTES = 1024;
+
+/**
+ * Write `.br` and `.gz` copies of every text file in the build, so nginx
+ * (`brotli_static`/`gzip_static`) and WhiteNoise serve them without
+ * compressing on each request.
+ */
+const precompress = (): Plugin => ({
+  name: "houndz-precompress",
+  apply: "build",
+  writeBundle(options, bundle) {
+    for (const fileName of Object.keys(bundle)) {
+      if (!COMPRESSIBLE.test(fileName)) continue;
+      const path = join(options.dir ?? DIST_ROOT, fileName);
+      const source = readFileSync(path);
+      if (source.length < MIN_COMPRESS_BYTES) continue;
+      writeFileSync(`${path}.gz`, gzipSync(source, { level: 9 }));
+      writeFileSync(
+        `${path}.br`,
+        brotliCompressSync(source, {
+          params: {
+            [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+            [constants.BROTLI_PARAM_SIZE_HINT]: source.length
+          }
+        })
+      );
+    }
+  }
+});
 
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompress()],
   resolve: {
     alias: {
       "@": fileURLToPath(new URL("./src", import.meta.url))
@@ -2,14 +2,25 @@
 set -euo pipefail
 
 # Simple PostgreSQL backup script for cron usage.
+#
+# Archived bookings (api_archivedbooking, see `manage.py archive_bookings`)
+# never change once written. Set HOUNDZ_BACKUP_SKIP_ARCHIVE=1 for frequent
+# runs to leave their rows out, and keep a periodic full dump alongside.
 
 TIMESTAMP="$(date +"%Y%m%d-%H%M%S")"
 BACKUP_DIR="${1:-/var/backups/houndz}"
 mkdir -p "$BACKUP_DIR"
 
-docker exec house-of-houndz-db pg_dump -U houndz houndz > "$BACKUP_DIR/houndz-${TIMESTAMP}.sql"
+NAME="houndz"
+EXTRA_ARGS=""
+if [[ "${HOUNDZ_BACKUP_SKIP_ARCHIVE:-0}" == "1" ]]; then
+  NAME="houndz-live"
+  EXTRA_ARGS="--exclude-table-data=api_archivedbooking"
+fi
 
-find "$BACKUP_DIR" -type f -mtime +30 -delete
+# shellcheck disable=SC2086
+docker exec house-of-houndz-db pg_dump -U houndz $EXTRA_ARGS houndz > "$BACKUP_DIR/${NAME}-${TIMESTAMP}.sql"
 
-echo "Backup complete: $BACKUP_DIR/houndz-${TIMESTAMP}.sql"
+find "$BACKUP_DIR" -type f -mtime +30 -delete
 
+echo "Backup complete: $BACKUP_DIR/${NAME}-${TIMESTAMP}.sql"